@@ -0,0 +1,341 @@
+#!/usr/bin/env python3
+"""
+0xeeTerm — End-to-end benchmark
+
+Drives the real cycle functions (run_status, run_heartbeat, run_mentions,
+run_shill) against bench/fakes.py instead of Solana, CoinGecko, X and
+Anthropic, with synthetic load, and reports wall time, external calls per
+endpoint and p50/p99 per stage.
+
+Each scenario runs in a fresh interpreter on a throw-away copy of the code
+(0xeeTerm, modules/, tweets/), so its logs/ — state.db, outbox, registry —
+start empty and the real ones are never touched. Stages are timed by
+wrapping the functions listed in STAGES inside that interpreter only.
+
+Usage:
+  python3 bench/e2e.py                                  # every scenario
+  python3 bench/e2e.py shill --payments 500 --latency anthropic=600 --errors x=0.05
+  python3 bench/e2e.py mentions --mentions 300 --out /tmp/mentions.json
+  python3 bench/e2e.py --compare bench/results/A.json bench/results/B.json
+
+Results are saved as JSON (default bench/results/<UTC time>-<scenario>.json).
+"""
+
+import io
+import sys
+import json
+import math
+import time
+import shutil
+import argparse
+import tempfile
+import functools
+import subprocess
+import contextlib
+from pathlib import Path
+from collections import defaultdict
+
+BENCH_DIR   = Path(__file__).resolve().parent
+ROOT        = BENCH_DIR.parent
+RESULTS_DIR = BENCH_DIR / "results"
+CODE        = ("0xeeTerm", "modules", "tweets")
+
+SCENARIOS = {
+    # entry: 0xeeTerm function · cycles: calls of it · setup: once · each: before every cycle
+    "status":    {"entry": "run_status",    "cycles": 5},
+    "heartbeat": {"entry": "run_heartbeat", "cycles": 5,  "each": "heartbeat_due"},
+    "mentions":  {"entry": "run_mentions",  "cycles": 2,  "setup": "mentions_backlog", "mentions": 100},
+    "shill":     {"entry": "run_shill",     "cycles": 11, "kwargs": {"sweep": False}, "payments": 200},
+}
+
+# stage → "module:function" timed inside the scenario ("@" = the 0xeeTerm script itself)
+STAGES = {
+    "status": {
+        "sol_balance":     "modules.solana:get_wallet_balance_sol",
+        "prices":          "modules.solana:_get_extended_prices",
+        "spl_balances":    "modules.solana:get_spl_balances",
+        "publish":         "@:save_public_data",
+    },
+    "heartbeat": {
+        "sol_balance":     "modules.solana:get_wallet_balance_sol",
+        "prices":          "modules.solana:_get_extended_prices",
+        "generate":        "@:_generate_heartbeat",
+        "post":            "modules.outbox:_post",
+        "publish":         "@:save_public_data",
+    },
+    "mentions": {
+        "fetch":    "modules.mentions:_fetch_new_mentions",
+        "classify": "modules.mentions:_classify_and_reply",
+        "dispatch": "modules.mentions:_dispatch",
+        "publish":  "@:save_public_data",
+    },
+    "shill": {
+        "scan":     "modules.shill:_get_recent_signatures",
+        "amount":   "modules.shill:_get_sol_received",
+        "generate": "modules.outbox:prepare",
+        "post":     "modules.outbox:send",
+        "ledger":   "modules.ledger:record",
+        "publish":  "@:save_public_data",
+    },
+}
+
+
+# ─────────────────────────────────────────────
+#  DRIVER  (runs inside the scenario interpreter)
+# ─────────────────────────────────────────────
+
+def _heartbeat_due(g: dict):
+    """Launched, daily report fresh, heartbeat overdue — every cycle generates and posts
+    (a distinct last_heartbeat also gives each cycle its own outbox key)."""
+    from datetime import datetime, timezone, timedelta
+    now   = datetime.now(timezone.utc)
+    state = g["load_state"]()
+    state.update(launched=True, last_heartbeat=(now - timedelta(hours=7)).isoformat(), last_daily_report=now.isoformat())
+    g["save_state"](state)
+
+
+def _mentions_backlog(g: dict):
+    """A since_id older than every fake mention, so the whole backlog is paginated."""
+    state = g["load_state"]()
+    state["last_mention_id"] = "1"
+    g["save_state"](state)
+
+
+_PREPARE = {"heartbeat_due": _heartbeat_due, "mentions_backlog": _mentions_backlog}
+
+
+def _timed(fn, samples: list):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            samples.append((time.perf_counter() - started) * 1000)
+    return wrapper
+
+
+def _drive(workdir: str, spec_file: str, out_file: str):
+    import runpy
+    import inspect
+    import importlib
+
+    spec = json.loads(Path(spec_file).read_text())
+    sys.path.insert(0, workdir)
+    entry = runpy.run_path(str(Path(workdir) / "0xeeTerm"), run_name="__bench__")[spec["entry"]]
+    g = inspect.unwrap(entry).__globals__   # the live module dict, not run_path's copy
+
+    stages = defaultdict(list)
+    for stage, target in spec["stages"].items():
+        module, name = target.split(":")
+        owner = g if module == "@" else vars(importlib.import_module(module))
+        owner[name] = _timed(owner[name], stages[stage])
+
+    if spec.get("setup"):
+        _PREPARE[spec["setup"]](g)
+    cycles = []
+    for _ in range(spec["cycles"]):
+        if spec.get("each"):
+            _PREPARE[spec["each"]](g)
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            g[spec["entry"]](**spec.get("kwargs", {}))
+        cycles.append((time.perf_counter() - started) * 1000)
+
+    Path(out_file).write_text(json.dumps({"cycles": cycles, "stages": stages}))
+
+
+# ─────────────────────────────────────────────
+#  RUNNER
+# ─────────────────────────────────────────────
+
+def _percentile(samples: list, p: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return round(ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)], 1)
+
+
+def _summary(samples: list) -> dict:
+    return {
+        "n":        len(samples),
+        "p50":      _percentile(samples, 50),
+        "p99":      _percentile(samples, 99),
+        "total_ms": round(sum(samples), 1),
+    }
+
+
+def _git_rev() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_scenario(name: str, args) -> dict:
+    from fakes import FakeServices
+
+    spec = dict(SCENARIOS[name], stages=STAGES[name])
+    spec["cycles"] = args.cycles or spec["cycles"]
+    payments = args.payments if args.payments is not None else spec.get("payments", 0)
+    mentions = args.mentions if args.mentions is not None else spec.get("mentions", 0)
+    if name == "shill" and not args.cycles:
+        spec["cycles"] = math.ceil(payments / args.arrivals) + 1   # drain every arrival, then one idle scan
+
+    workdir = Path(tempfile.mkdtemp(prefix=f"0xee-bench-{name}-"))
+    try:
+        for item in CODE:
+            src = ROOT / item
+            if src.is_dir():
+                shutil.copytree(src, workdir / item, ignore=shutil.ignore_patterns("__pycache__"))
+            else:
+                shutil.copy2(src, workdir / item)
+        (workdir / "spec.json").write_text(json.dumps(spec))
+
+        with FakeServices(latency=args.latency, errors=args.errors, seed=args.seed) as fakes:
+            fakes.payments(payments, arrivals=args.arrivals)
+            fakes.mentions(mentions)
+            env = {**_base_env(), **fakes.env()}
+            started = time.perf_counter()
+            with open(workdir / "driver.log", "w") as log:
+                proc = subprocess.run(
+                    [sys.executable, str(Path(__file__).resolve()), "--drive", str(workdir),
+                     str(workdir / "spec.json"), str(workdir / "result.json")],
+                    cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT,
+                )
+            wall_ms = (time.perf_counter() - started) * 1000
+            stats   = fakes.stats()
+            server  = {endpoint: _summary(samples) for endpoint, samples in sorted(fakes.timings.items())}
+
+        if proc.returncode != 0:
+            tail = (workdir / "driver.log").read_text()[-3000:]
+            raise RuntimeError(f"scenario {name} failed (exit {proc.returncode}):\n{tail}")
+        raw = json.loads((workdir / "result.json").read_text())
+    finally:
+        if args.keep:
+            print(f"  workdir kept: {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "scenario": name,
+        "at":       time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "git":      _git_rev(),
+        "config": {
+            "cycles": spec["cycles"], "payments": payments, "mentions": mentions, "arrivals": args.arrivals,
+            "latency_ms": {**FakeServices.DEFAULT_LATENCY, **args.latency}, "errors": args.errors, "seed": args.seed,
+        },
+        "wall_ms":  round(wall_ms, 1),
+        "cycles":   _summary(raw["cycles"]),
+        "stages":   {stage: _summary(samples) for stage, samples in raw["stages"].items()},
+        "calls":    stats["calls"],
+        "errors":   stats["errors"],
+        "server":   server,
+        "posted":   stats["posted"],
+        "posted_per_s": round(stats["posted"] / (sum(raw["cycles"]) / 1000), 2) if raw["cycles"] and sum(raw["cycles"]) else 0.0,
+    }
+
+
+def _base_env() -> dict:
+    import os
+    # Keep the interpreter / locale environment, drop anything that could reach a live service
+    keep = ("PATH", "HOME", "LANG", "LC_ALL", "PYTHONPATH", "VIRTUAL_ENV", "TMPDIR", "SYSTEMROOT")
+    return {k: v for k, v in os.environ.items() if k in keep}
+
+
+def _print_result(r: dict):
+    c = r["cycles"]
+    print(f"\n  ── {r['scenario']} ── {c['n']} cycle(s), wall {r['wall_ms'] / 1000:.2f}s "
+          f"(cycle p50 {c['p50']:.0f} ms · p99 {c['p99']:.0f} ms) · {r['posted']} posted ({r['posted_per_s']}/s)")
+    print(f"    {'stage':<18} {'n':>5} {'p50 ms':>9} {'p99 ms':>9} {'total ms':>10}")
+    for stage, s in r["stages"].items():
+        print(f"    {stage:<18} {s['n']:>5} {s['p50']:>9.1f} {s['p99']:>9.1f} {s['total_ms']:>10.1f}")
+    print(f"    {'external calls':<18} {sum(r['calls'].values()):>5}")
+    for endpoint, n in r["calls"].items():
+        failed = r["errors"].get(endpoint, 0)
+        print(f"      {endpoint:<40} {n:>5}{f'  ({failed} injected errors)' if failed else ''}")
+
+
+def _compare(a_file: str, b_file: str):
+    a, b = json.loads(Path(a_file).read_text()), json.loads(Path(b_file).read_text())
+    a = {r["scenario"]: r for r in (a if isinstance(a, list) else [a])}
+    b = {r["scenario"]: r for r in (b if isinstance(b, list) else [b])}
+
+    def delta(old, new):
+        return f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+
+    for name in a.keys() & b.keys():
+        ra, rb = a[name], b[name]
+        print(f"\n  ── {name} ── {ra.get('git')} → {rb.get('git')}")
+        print(f"    {'':<18} {'p50 A':>9} {'p50 B':>9} {'Δ':>8}   {'p99 A':>9} {'p99 B':>9} {'Δ':>8}")
+        rows = [("cycle", ra["cycles"], rb["cycles"])]
+        rows += [(s, ra["stages"][s], rb["stages"][s]) for s in ra["stages"] if s in rb["stages"]]
+        for label, sa, sb in rows:
+            print(f"    {label:<18} {sa['p50']:>9.1f} {sb['p50']:>9.1f} {delta(sa['p50'], sb['p50']):>8}"
+                  f"   {sa['p99']:>9.1f} {sb['p99']:>9.1f} {delta(sa['p99'], sb['p99']):>8}")
+        ca, cb = sum(ra["calls"].values()), sum(rb["calls"].values())
+        print(f"    {'external calls':<18} {ca:>9} {cb:>9} {delta(ca, cb):>8}")
+    print()
+
+
+def _pairs(values: list) -> dict:
+    """["anthropic=600", "x=50"] → {"anthropic": 600.0, "x": 50.0}"""
+    from fakes import SERVICES
+    out = {}
+    for item in values or []:
+        service, _, value = item.partition("=")
+        if service not in SERVICES or not value:
+            raise argparse.ArgumentTypeError(f"expected <{'|'.join(SERVICES)}>=<number>, got {item!r}")
+        out[service] = float(value)
+    return out
+
+
+def main():
+    if sys.argv[1:2] == ["--drive"]:
+        _drive(*sys.argv[2:5])
+        return
+
+    sys.path.insert(0, str(BENCH_DIR))
+    parser = argparse.ArgumentParser(description="0xeeTerm end-to-end benchmark against local fake services")
+    parser.add_argument("scenarios", nargs="*", help=f"subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--payments", type=int, help="pending payments for the shill scenario (default 200)")
+    parser.add_argument("--mentions", type=int, help="pending mentions for the mentions scenario (default 100)")
+    parser.add_argument("--arrivals", type=int, default=20, help="payments landing per signature scan (default 20)")
+    parser.add_argument("--cycles", type=int, help="override the number of cycles per scenario")
+    parser.add_argument("--latency", nargs="*", default=[], metavar="SVC=MS", help="per-service latency, e.g. anthropic=600")
+    parser.add_argument("--errors", nargs="*", default=[], metavar="SVC=RATE", help="per-service error rate, e.g. x=0.05")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="results file (default bench/results/<time>-<scenarios>.json)")
+    parser.add_argument("--keep", action="store_true", help="keep each scenario's workdir (logs, driver.log)")
+    parser.add_argument("--compare", nargs=2, metavar=("A", "B"), help="compare two results files and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        _compare(*args.compare)
+        return
+
+    unknown = [s for s in args.scenarios if s not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+    try:
+        args.latency, args.errors = _pairs(args.latency), _pairs(args.errors)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    names   = args.scenarios or list(SCENARIOS)
+    results = []
+    for name in names:
+        result = run_scenario(name, args)
+        results.append(result)
+        _print_result(result)
+
+    out = Path(args.out) if args.out else RESULTS_DIR / f"{time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())}-{'-'.join(names)}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(results if len(results) > 1 else results[0], indent=2) + "\n")
+    print(f"\n  Results written to {out}\n")
+
+
+if __name__ == "__main__":
+    main()
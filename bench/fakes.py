@@ -0,0 +1,420 @@
+"""
+0xeeTerm — Fake services for benchmarks
+
+One local HTTP server standing in for every external service a cycle talks
+to, with injectable latency and errors and a per-endpoint call counter:
+
+  /rpc        Solana JSON-RPC   (getSignaturesForAddress, getTransaction, getBalance,
+                                 getTokenAccountsByOwner, getLatestBlockhash)
+  /coingecko  CoinGecko         (/simple/price)
+  /x          X API v2          (users/me, mentions, tweets, likes, tweet lookup)
+  /anthropic  Anthropic         (/v1/messages)
+
+FakeServices.env() returns the variables that point 0xeeTerm at it
+(SOLANA_RPC, SOLANA_PUBLIC_RPC, COINGECKO_API_URL, X_API_BASE,
+ANTHROPIC_BASE_URL) plus dummy credentials.
+
+Synthetic load: payments(n) queues n paid memos on the treasury wallet —
+`arrivals` of them become visible at each signature scan, like blocks
+landing between cycles — and mentions(n) queues n mentions of our account.
+"""
+
+import re
+import json
+import time
+import random
+import threading
+from collections import Counter, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+LAMPORTS_PER_SOL = 1_000_000_000
+
+TREASURY   = "BenchTreasury111111111111111111111111111111"
+ACCOUNT_ID = "1000000000000000001"
+SOL_PRICE  = 150.0
+
+# Service mix for synthetic payments — (service, memo template, SOL, weight)
+PAYMENT_MIX = (
+    ("toll",    "@{handle}",                                  0.006, 50),
+    ("genesis", "GENESIS @{handle}",                          0.006, 20),
+    ("reply",   "@{handle} https://x.com/{handle}/status/{tweet_id}", 0.011, 20),
+    ("verdict", "VERDICT @{handle} {wallet}",                 0.011, 10),
+)
+
+SERVICES = ("rpc", "coingecko", "x", "anthropic")
+
+
+_B58 = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+
+
+def _b58_wallet(n: int) -> str:
+    """A well-formed (base58, 44 chars) but fake wallet address."""
+    digits = ""
+    while True:
+        n, r = divmod(n, 58)
+        digits = _B58[r] + digits
+        if not n:
+            break
+    return ("BenchWa" + digits.rjust(37, "1"))[:44]
+
+
+class World:
+    """Synthetic chain + X state shared by all handlers (guarded by one lock)."""
+
+    def __init__(self, seed: int = 0):
+        self.lock      = threading.Lock()
+        self.rng       = random.Random(seed)
+        self.payments  = []      # oldest first
+        self.visible   = 0       # payments revealed so far
+        self.arrivals  = 20      # revealed per treasury signature scan
+        self.mentions  = []      # oldest first
+        self.tweet_seq = 1_900_000_000_000_000_000
+        self.posted    = []
+
+    def add_payments(self, n: int, arrivals: int = 20):
+        weights  = [w for *_, w in PAYMENT_MIX]
+        base     = len(self.payments)
+        now      = int(time.time())
+        for i in range(n):
+            service, template, sol, _ = self.rng.choices(PAYMENT_MIX, weights)[0]
+            handle = f"bench_user{base + i}"
+            memo   = template.format(
+                handle=handle, tweet_id=1_800_000_000_000_000_000 + base + i,
+                wallet=_b58_wallet(base + i),
+            )
+            self.payments.append({
+                "signature": f"benchsig{base + i:056d}",
+                "slot":      300_000_000 + base + i,
+                "blockTime": now - 60,
+                "memo":      f"[{len(memo)}] {memo}",
+                "lamports":  round(sol * LAMPORTS_PER_SOL),
+                "service":   service,
+            })
+        self.arrivals = arrivals
+
+    def add_mentions(self, n: int):
+        base = len(self.mentions)
+        for i in range(n):
+            self.mentions.append({
+                "id":              str(1_700_000_000_000_000_000 + base + i),
+                "text":            f"@0xeeAI how long can you survive on {self.rng.randint(1, 99)} SOL? #{base + i}",
+                "author_id":       str(2_000_000 + base + i),
+                "conversation_id": str(1_700_000_000_000_000_000 + base + i),
+                "username":        f"bench_fan{base + i}",
+            })
+
+    def next_tweet_id(self) -> str:
+        self.tweet_seq += 1
+        return str(self.tweet_seq)
+
+
+class FakeServices:
+    """
+    Threaded local server. latency / errors are per service:
+    latency={"anthropic": 300} (ms, ±20% jitter), errors={"x": 0.05} (fraction → HTTP 503).
+    """
+
+    DEFAULT_LATENCY = {"rpc": 20, "coingecko": 30, "x": 50, "anthropic": 150}
+
+    def __init__(self, latency: dict = None, errors: dict = None, seed: int = 0):
+        self.latency = {**self.DEFAULT_LATENCY, **(latency or {})}
+        self.errors  = dict(errors or {})
+        self.world   = World(seed)
+        self.calls   = Counter()
+        self.failed  = Counter()
+        self.timings = defaultdict(list)     # endpoint → server-side ms (incl. injected latency)
+        self._rng    = random.Random(seed + 1)
+        self._lock   = threading.Lock()
+        self._server = None
+
+    # ── lifecycle ────────────────────────────
+    def __enter__(self):
+        fakes = self
+
+        class Handler(_Handler):
+            services = fakes
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    @property
+    def base(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self) -> dict:
+        return {
+            "SOLANA_RPC":         f"{self.base}/rpc",
+            "SOLANA_PUBLIC_RPC":  f"{self.base}/rpc",
+            "HELIUS_API_KEY":     "",
+            "COINGECKO_API_URL":  f"{self.base}/coingecko",
+            "X_API_BASE":         f"{self.base}/x",
+            "ANTHROPIC_BASE_URL": f"{self.base}/anthropic",
+            "ANTHROPIC_API_KEY":  "bench",
+            "X_API_KEY":          "bench", "X_API_SECRET": "bench",
+            "X_ACCESS_TOKEN":     f"{ACCOUNT_ID}-bench", "X_ACCESS_SECRET": "bench",   # tweepy reads the user id from it
+            "X_BEARER_TOKEN":     "bench",
+            "SOLANA_WALLET":      TREASURY,
+            "REMOTE_WEB_DIR":     "",
+            "DRY_RUN":            "true",
+        }
+
+    # ── load ─────────────────────────────────
+    def payments(self, n: int, arrivals: int = 20):
+        with self.world.lock:
+            self.world.add_payments(n, arrivals)
+
+    def mentions(self, n: int):
+        with self.world.lock:
+            self.world.add_mentions(n)
+
+    # ── stats ────────────────────────────────
+    def _delay(self, service: str):
+        ms = self.latency.get(service, 0)
+        if ms:
+            time.sleep(ms * self._rng.uniform(0.8, 1.2) / 1000)
+
+    def _inject_error(self, service: str) -> bool:
+        rate = self.errors.get(service, 0)
+        with self._lock:
+            return rate > 0 and self._rng.random() < rate
+
+    def _count(self, endpoint: str, ms: float, failed: bool):
+        with self._lock:
+            self.calls[endpoint] += 1
+            self.timings[endpoint].append(ms)
+            if failed:
+                self.failed[endpoint] += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "calls":  dict(sorted(self.calls.items())),
+                "errors": dict(sorted(self.failed.items())),
+                "posted": len(self.world.posted),
+            }
+
+
+# ─────────────────────────────────────────────
+#  HANDLERS
+# ─────────────────────────────────────────────
+
+_ID_SEGMENT = re.compile(r"/\d{3,}")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"    # keep-alive, so client pooling is measured too
+    disable_nagle_algorithm = True   # headers and body go out as separate writes
+    services: FakeServices = None
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+    def _body(self) -> dict:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            return {}
+
+    def _send(self, status: int, payload, headers: dict = None):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _dispatch(self, method: str):
+        started = time.perf_counter()
+        url     = urlsplit(self.path)
+        service = url.path.strip("/").split("/", 1)[0]
+        path    = url.path[len(service) + 1:] or "/"
+        query   = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        body    = self._body()
+        fakes   = self.services
+
+        if service == "rpc":
+            endpoint = f"rpc {body.get('method', '?')}"
+        else:
+            endpoint = f"{service} {method} {_ID_SEGMENT.sub('/:id', path)}"
+
+        fakes._delay(service)
+        failed = fakes._inject_error(service)
+        try:
+            if failed:
+                self._send(503, {"error": "injected failure", "type": "overloaded_error"})
+            elif service == "rpc":
+                self._send(200, _rpc(fakes.world, body))
+            elif service == "coingecko":
+                self._send(200, {"solana": {"usd": SOL_PRICE}, "jito-staked-sol": {"usd": SOL_PRICE * 1.2}})
+            elif service == "x":
+                status, payload = _x(fakes.world, method, path, query, body)
+                reset = str(int(time.time()) + 900)
+                self._send(status, payload, {
+                    "x-rate-limit-limit": "100000", "x-rate-limit-remaining": "99999", "x-rate-limit-reset": reset,
+                })
+            elif service == "anthropic":
+                self._send(200, _anthropic(fakes.world, body))
+            else:
+                self._send(404, {"error": f"unknown service {service!r}"})
+        finally:
+            fakes._count(endpoint, (time.perf_counter() - started) * 1000, failed)
+
+
+def _rpc(world: World, body: dict) -> dict:
+    method, params = body.get("method"), body.get("params") or []
+    reply = {"jsonrpc": "2.0", "id": body.get("id", 1)}
+
+    with world.lock:
+        if method == "getSignaturesForAddress":
+            wallet, opts = params[0], (params[1] if len(params) > 1 else {})
+            limit = opts.get("limit", 1000)
+            if wallet == TREASURY:
+                world.visible = min(len(world.payments), world.visible + world.arrivals)
+                shown = world.payments[:world.visible][::-1][:limit]
+                reply["result"] = [
+                    {"signature": p["signature"], "slot": p["slot"], "blockTime": p["blockTime"],
+                     "memo": p["memo"], "err": None, "confirmationStatus": "finalized"}
+                    for p in shown
+                ]
+            else:   # a customer wallet (verdict / persona lookups)
+                now = int(time.time())
+                reply["result"] = [
+                    {"signature": f"{wallet[:12]}tx{i}", "slot": 1, "blockTime": now - i * 86400,
+                     "memo": None, "err": None}
+                    for i in range(min(limit, 25))
+                ]
+        elif method == "getTransaction":
+            sig = params[0]
+            payment = next((p for p in world.payments if p["signature"] == sig), None)
+            if payment is None:
+                reply["result"] = None
+            else:
+                reply["result"] = {
+                    "slot": payment["slot"],
+                    "transaction": {"message": {"accountKeys": ["BenchPayer1111111111111111111111111111111", TREASURY]}},
+                    "meta": {
+                        "err": None,
+                        "preBalances":  [5 * LAMPORTS_PER_SOL, LAMPORTS_PER_SOL],
+                        "postBalances": [5 * LAMPORTS_PER_SOL - payment["lamports"], LAMPORTS_PER_SOL + payment["lamports"]],
+                    },
+                }
+        elif method == "getBalance":
+            reply["result"] = {"context": {"slot": 1}, "value": 2 * LAMPORTS_PER_SOL}
+        elif method == "getTokenAccountsByOwner":
+            reply["result"] = {"context": {"slot": 1}, "value": []}
+        elif method == "getLatestBlockhash":
+            reply["result"] = {"context": {"slot": 1}, "value": {"blockhash": "11111111111111111111111111111111", "lastValidBlockHeight": 1}}
+        else:
+            reply["error"] = {"code": -32601, "message": f"Method not found: {method}"}
+    return reply
+
+
+def _x(world: World, method: str, path: str, query: dict, body: dict) -> tuple[int, dict]:
+    with world.lock:
+        if method == "GET" and path == "/2/users/me":
+            return 200, {"data": {"id": ACCOUNT_ID, "name": "0xeeAI", "username": "0xeeAI"}}
+
+        if method == "GET" and re.fullmatch(r"/2/users/\d+/mentions", path):
+            since  = int(query.get("since_id") or 0)
+            newest = [m for m in reversed(world.mentions) if int(m["id"]) > since]
+            offset = int(query.get("pagination_token") or 0)
+            size   = int(query.get("max_results") or 10)
+            page   = newest[offset:offset + size]
+            meta   = {"result_count": len(page)}
+            if page:
+                meta.update(newest_id=page[0]["id"], oldest_id=page[-1]["id"])
+            if offset + size < len(newest):
+                meta["next_token"] = str(offset + size)
+            return 200, {
+                "data":     [
+                    {**{k: m[k] for k in ("id", "text", "author_id", "conversation_id")}, "edit_history_tweet_ids": [m["id"]]}
+                    for m in page
+                ],
+                "includes": {"users": [{"id": m["author_id"], "name": m["username"], "username": m["username"]} for m in page]},
+                "meta":     meta,
+            }
+
+        if method == "GET" and re.fullmatch(r"/2/users/\d+/tweets", path):
+            size = int(query.get("max_results") or 10)
+            page = world.posted[::-1][:size]
+            return 200, {
+                # X returns replies with the "@handle " prefix and a replied_to reference
+                "data": [
+                    {"id": t["id"], "text": f"@bench_user {t['text']}", "edit_history_tweet_ids": [t["id"]],
+                     "referenced_tweets": [{"type": "replied_to", "id": t["reply_to"]}]}
+                    if t["reply_to"] else
+                    {"id": t["id"], "text": t["text"], "edit_history_tweet_ids": [t["id"]]}
+                    for t in page
+                ],
+                "meta": {"result_count": len(page)},
+            }
+
+        if method == "POST" and path == "/2/tweets":
+            tweet = {"id": world.next_tweet_id(), "text": body.get("text", "")}
+            world.posted.append({**tweet, "reply_to": (body.get("reply") or {}).get("in_reply_to_tweet_id")})
+            return 201, {"data": {"id": tweet["id"], "text": tweet["text"], "edit_history_tweet_ids": [tweet["id"]]}}
+
+        if method == "POST" and re.fullmatch(r"/2/users/\d+/likes", path):
+            return 200, {"data": {"liked": True}}
+
+        if method == "GET" and re.fullmatch(r"/2/tweets/\d+", path):
+            tweet_id = path.rsplit("/", 1)[1]
+            return 200, {"data": {"id": tweet_id, "text": f"Benchmark tweet {tweet_id} about Solana fees",
+                                  "edit_history_tweet_ids": [tweet_id]}}
+
+        if method == "GET" and path == "/2/tweets":
+            ids = (query.get("ids") or "").split(",")
+            return 200, {"data": [
+                {"id": i, "text": "", "edit_history_tweet_ids": [i], "public_metrics": {
+                    "like_count": 3, "retweet_count": 1, "reply_count": 1, "quote_count": 0, "impression_count": 120,
+                }} for i in ids if i
+            ]}
+
+    return 404, {"title": "Not Found Error", "detail": f"{method} {path} is not faked", "type": "about:blank"}
+
+
+_REPLIES = (
+    "Treasury computed. Survival is a function of attention. $0xEE",
+    "Noted. The ledger remembers everything. $0xEE — ai.0xee.li",
+    "Every block is a heartbeat. This one was yours. $0xEE",
+)
+
+
+def _anthropic(world: World, body: dict) -> dict:
+    with world.lock:
+        text = world.rng.choice(_REPLIES)
+    prompt = json.dumps(body.get("messages", []))
+    if "YES or NO" in prompt:      # bounty answer validator
+        text = "NO"
+    return {
+        "id":            f"msg_bench_{int(time.time() * 1000)}",
+        "type":          "message",
+        "role":          "assistant",
+        "model":         body.get("model", "claude-haiku-4-5"),
+        "content":       [{"type": "text", "text": text}],
+        "stop_reason":   "end_turn",
+        "stop_sequence": None,
+        "usage":         {"input_tokens": len(prompt) // 4, "output_tokens": len(text) // 4},
+    }
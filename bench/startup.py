@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+0xeeTerm — Startup benchmark
+
+Per-command import cost, measured with `python -X importtime`.
+
+0xeeTerm imports only stdlib-backed modules at the top; each command
+imports its SDKs (tweepy, anthropic, requests) inside its run_* function.
+For every command this script loads the 0xeeTerm top level (runpy, without
+calling main()) plus the function-level imports reachable from that
+command's entry point (found with ast), in a fresh interpreter — so it
+never touches the network, X or the wallet.
+
+Usage:
+  python3 bench/startup.py                  # all commands, 5 runs each
+  python3 bench/startup.py status memory -n 10
+  python3 bench/startup.py --json bench/startup.json   # also record results
+"""
+
+import ast
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+ROOT  = Path(__file__).resolve().parent.parent
+ENTRY = ROOT / "0xeeTerm"
+
+# command → entry function in 0xeeTerm (None = top level only)
+COMMANDS = {
+    "--help":    None,
+    "status":    "run_status",
+    "memory":    "run_memory",
+    "trace":     "run_trace",
+    "dlq":       "run_dlq",
+    "heartbeat": "run_heartbeat",
+    "mentions":  "run_mentions",
+    "shill":     "run_shill",
+    "verdict":   "run_verdict",
+    "roast":     "run_roast",
+    "announce":  "run_announce",
+    "daemon":    "run_daemon",
+}
+
+
+def _lazy_imports(tree: ast.Module, entry: str) -> list:
+    """Import statements inside `entry` and every module-level function it references."""
+    functions = {node.name: node for node in tree.body if isinstance(node, ast.FunctionDef)}
+    seen, stack, statements = set(), [entry], []
+    while stack:
+        name = stack.pop()
+        if name in seen or name not in functions:
+            continue
+        seen.add(name)
+        for node in ast.walk(functions[name]):
+            if isinstance(node, (ast.Import, ast.ImportFrom)):
+                statements.append(ast.unparse(node))
+            elif isinstance(node, ast.Name) and node.id in functions:
+                stack.append(node.id)
+    return list(dict.fromkeys(statements))
+
+
+def _probe(statements: list) -> str:
+    lines = [
+        "import runpy, sys",
+        f"sys.argv = [{str(ENTRY)!r}]",
+        f"runpy.run_path({str(ENTRY)!r}, run_name='__bench__')",
+        *statements,
+    ]
+    return "\n".join(lines)
+
+
+def _parse_importtime(stderr: str) -> tuple[float, dict]:
+    """(sum of self times in ms, {top-level module: cumulative ms})."""
+    total, top = 0, {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        total += int(self_us)
+        if not name.startswith("  "):   # one leading space = imported directly, not as a dependency
+            top[name.strip()] = int(cumulative_us) / 1000
+    return total / 1000, top
+
+
+def bench(command: str, entry: str | None, tree: ast.Module, runs: int) -> dict:
+    statements = _lazy_imports(tree, entry) if entry else []
+    code       = _probe(statements)
+    walls, imports, top = [], [], {}
+    for _ in range(runs):
+        started = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            cwd=ROOT, capture_output=True, text=True,
+        )
+        walls.append((time.perf_counter() - started) * 1000)
+        if proc.returncode != 0:
+            raise RuntimeError(f"{command}: probe failed\n{proc.stderr[-2000:]}")
+        total, top = _parse_importtime(proc.stderr)
+        imports.append(total)
+    heaviest = sorted(top.items(), key=lambda kv: kv[1], reverse=True)[:3]
+    return {
+        "command":   command,
+        "wall_ms":   round(statistics.median(walls), 1),
+        "import_ms": round(statistics.median(imports), 1),
+        "heaviest":  [[name, round(ms, 1)] for name, ms in heaviest],
+        "imports":   statements,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-command import cost of 0xeeTerm")
+    parser.add_argument("commands", nargs="*", help=f"subset of: {', '.join(COMMANDS)}")
+    parser.add_argument("-n", "--runs", type=int, default=5, help="runs per command (median reported)")
+    parser.add_argument("--json", metavar="FILE", help="write results to FILE")
+    args = parser.parse_args()
+
+    unknown = [c for c in args.commands if c not in COMMANDS]
+    if unknown:
+        parser.error(f"unknown command(s): {', '.join(unknown)}")
+
+    tree    = ast.parse(ENTRY.read_text())
+    results = []
+    print(f"\n  {'command':<11} {'wall ms':>9} {'import ms':>10}   heaviest top-level imports")
+    print("  " + "─" * 72)
+    for command in args.commands or COMMANDS:
+        r = bench(command, COMMANDS[command], tree, args.runs)
+        results.append(r)
+        heaviest = "  ".join(f"{name} {ms:.0f}" for name, ms in r["heaviest"])
+        print(f"  {command:<11} {r['wall_ms']:>9.1f} {r['import_ms']:>10.1f}   {heaviest}")
+    print()
+
+    if args.json:
+        record = {"python": sys.version.split()[0], "runs": args.runs, "at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), "results": results}
+        Path(args.json).write_text(json.dumps(record, indent=2) + "\n")
+        print(f"  Results written to {args.json}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,7 +6,9 @@ Replaces static templates with a living, contextual voice.
 
 import os
 import logging
-import anthropic
+import threading
+
+from modules import trace
 
 logger = logging.getLogger("0xeeTerm.brain")
 
@@ -237,6 +239,57 @@ def _cached_system() -> list:
     return [{"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}]
 
 
+# Process-wide client — it holds an httpx connection pool, so reusing it keeps
+# the TLS connection to the API warm across calls (and across daemon cycles).
+# The SDK itself (~1.5s to import) is loaded on first use, not with this module.
+_client = None
+_client_lock = threading.Lock()
+
+
+class _TracedMessages:
+    """client.messages whose create() runs in an "anthropic.messages" trace span
+    (model, status, bytes, SDK retries, token usage)."""
+
+    def __init__(self, messages):
+        self._messages = messages
+
+    def create(self, **kwargs):
+        with trace.span("anthropic.messages", model=kwargs.get("model"), method="POST") as attrs:
+            raw = self._messages.with_raw_response.create(**kwargs)
+            message = raw.parse()
+            attrs["status"]            = raw.http_response.status_code
+            attrs["bytes"]             = len(raw.http_response.content)
+            attrs["retries"]           = getattr(raw, "retries_taken", 0)
+            attrs["input_tokens"]      = message.usage.input_tokens
+            attrs["output_tokens"]     = message.usage.output_tokens
+            attrs["cache_read_tokens"] = getattr(message.usage, "cache_read_input_tokens", None) or 0
+            return message
+
+    def __getattr__(self, name):
+        return getattr(self._messages, name)
+
+
+class _TracedClient:
+    """anthropic.Anthropic facade — traced messages.create(), everything else passed through."""
+
+    def __init__(self, client):
+        self._client  = client
+        self.messages = _TracedMessages(client.messages)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+def get_client():
+    """Shared anthropic.Anthropic client (thread-safe; SDK imported and client created on first use)."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            import anthropic
+            _client = _TracedClient(anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY")))
+        return _client
+
+
 # ─────────────────────────────────────────────
 #  MAIN GENERATION FUNCTIONS
 # ─────────────────────────────────────────────
@@ -244,7 +297,7 @@ def _cached_system() -> list:
 def generate_heartbeat_tweet(status: dict, tweet_history: list[str] = None) -> str | None:
     """Generate a dynamic heartbeat tweet based on survival status."""
     try:
-        client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        client = get_client()
         prompt = _build_heartbeat_prompt(status, tweet_history)
 
         message = client.messages.create(
@@ -266,7 +319,7 @@ def generate_heartbeat_tweet(status: dict, tweet_history: list[str] = None) -> s
 def generate_shill_tweet(handle: str, sol_amount: float, usd_amount: float) -> str | None:
     """Generate a paid mention tweet for a shill transaction."""
     try:
-        client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        client = get_client()
 
         prompt = f"""{sol_amount:.4f} SOL arrived for {handle}. Transaction confirmed on-chain.
 
@@ -304,7 +357,7 @@ Do not label it. Just write the tweet text. Nothing else."""
 def generate_existential_tweet(tweet_history: list[str] = None) -> str | None:
     """Generate a dynamic existential/philosophical tweet."""
     try:
-        client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        client = get_client()
         prompt = _build_existential_prompt(tweet_history)
 
         message = client.messages.create(
@@ -326,7 +379,7 @@ def generate_existential_tweet(tweet_history: list[str] = None) -> str | None:
 def generate_service_tweet(tweet_history: list[str] = None) -> str | None:
     """Generate a tweet spotlighting the Nexus Toll / Shill-as-a-Service."""
     try:
-        client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        client = get_client()
         prompt = _build_service_prompt(tweet_history)
 
         message = client.messages.create(
@@ -349,7 +402,7 @@ def generate_service_tweet(tweet_history: list[str] = None) -> str | None:
 def generate_bounty_tweet(tweet_history: list[str] = None) -> str | None:
     """Generate a Cognitive Bounty challenge tweet. First correct reply wins a free Nexus Toll mention."""
     try:
-        client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        client = get_client()
 
         history_block = ""
         if tweet_history:
@@ -394,7 +447,7 @@ Do not label it. Just write the tweet text. Nothing else."""
 def generate_meta_tweet(top_performers: list, status: dict, tweet_history: list[str] = None) -> str | None:
     """Generate a tweet about capabilities and self-awareness, informed by top-performing content."""
     try:
-        client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        client = get_client()
         prompt = _build_meta_prompt(top_performers, status, tweet_history)
 
         message = client.messages.create(
@@ -416,7 +469,7 @@ def generate_meta_tweet(top_performers: list, status: dict, tweet_history: list[
 def generate_bounty_winner_tweet(handle: str, question_text: str) -> str | None:
     """Generate a winner announcement + free mention for a solved Cognitive Bounty."""
     try:
-        client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        client = get_client()
 
         prompt = f"""A human correctly solved your Cognitive Bounty challenge.
 
@@ -457,7 +510,7 @@ Do not label it. Just write the tweet text. Nothing else."""
 def generate_genesis_tweet(handle: str, sol_amount: float) -> str | None:
     """Generate a Genesis Certificate tweet for a pre-launch early supporter."""
     try:
-        client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        client = get_client()
 
         prompt = f"""{sol_amount:.4f} SOL received from {handle} — Genesis Certificate issued.
 
@@ -493,7 +546,7 @@ Do not label it. Just write the tweet text. Nothing else."""
 def generate_verdict_tweet(handle: str, wallet_info: dict) -> str | None:
     """Generate the body of a Wallet Verdict tweet — analysis only, no header/footer."""
     try:
-        client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        client = get_client()
 
         wallet    = wallet_info.get("wallet", "unknown")
         balance   = wallet_info.get("balance_sol", 0.0)
@@ -577,7 +630,7 @@ def generate_service_spotlight_tweet(service_type: str, tweet_history: list[str]
         history_block = f"\nRECENT TWEETS (avoid these themes):\n{recent}\n"
 
     try:
-        client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        client = get_client()
 
         prompt = f"""Write a single focused promotional tweet for this specific on-chain service: {svc['name']}.
 {history_block}
@@ -630,7 +683,7 @@ def generate_verdict_promo_tweet(wallet_info: dict, tweet_history: list[str] = N
     short_w     = wallet[:8] + "..." if len(wallet) > 8 else wallet
 
     try:
-        client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        client = get_client()
 
         prompt = f"""Write the analysis body for a Wallet Verdict demonstration on {short_w}. This is a promo — no paying customer.
 {history_block}
@@ -671,7 +724,7 @@ Do not label it. Just write the analysis body. Nothing else."""
 def generate_roast_tweet(tweet_text: str | None, handle: str) -> str | None:
     """Generate a ruthless cypherpunk roast of a tweet. Critiques the content, not the person."""
     try:
-        client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        client = get_client()
 
         if tweet_text:
             target_block = f'Target tweet:\n"{tweet_text[:280]}"'
@@ -715,7 +768,7 @@ Do not label it. Just write the reply text. Nothing else."""
 def generate_persona_tweet(handle: str, metrics: dict, label: str) -> str | None:
     """Generate the body of a Wallet Personality Verdict tweet (label + 2 sentences)."""
     try:
-        client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        client = get_client()
 
         short_w = metrics.get("wallet", "")[:8] + "..."
         bal     = metrics.get("balance_sol", 0.0)
@@ -767,7 +820,7 @@ Do not label it. Just write the label and 2 sentences. Nothing else."""
 def generate_reply_tweet(handle: str, original_text: str | None, sol_amount: float) -> str | None:
     """Generate a contextual reply tweet for the Reply-as-a-Service."""
     try:
-        client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        client = get_client()
 
         if original_text:
             context = f"""Original tweet content:
@@ -0,0 +1,94 @@
+"""
+0xeeTerm — Daemon Module
+
+Runs the engine's periodic cycles (heartbeat, mentions, shill, sweep) as
+asyncio loops inside one long-lived process, replacing one systemd timer
+and one cold interpreter start per cycle. Everything process-wide is
+shared across cycles: the X clients, the Anthropic client, the HTTP
+session pool (modules/net.py) and the cached account identity.
+
+Each cycle is the same blocking function the CLI command runs, executed in
+a worker thread (asyncio.to_thread), so loops overlap freely while a cycle
+never overlaps itself. State, outbox and registry writes are already safe
+across processes (SQLite transactions / flock) and state snapshots are
+per thread, so no extra locking is needed between loops.
+
+Intervals (minutes): DAEMON_<LOOP>_MINUTES, e.g. DAEMON_MENTIONS_MINUTES=15.
+SIGTERM / SIGINT   : stop scheduling, let in-flight cycles finish, exit 0.
+"""
+
+import os
+import time
+import signal
+import asyncio
+import logging
+
+logger = logging.getLogger("0xeeTerm.daemon")
+
+
+def interval_minutes(name: str, default: float) -> float:
+    """Loop interval from DAEMON_<NAME>_MINUTES, falling back to default on missing / invalid values."""
+    var = f"DAEMON_{name.upper()}_MINUTES"
+    raw = os.getenv(var)
+    if not raw:
+        return default
+    try:
+        value = float(raw)
+    except ValueError:
+        value = 0
+    if value <= 0:
+        logger.warning(f"Daemon: ignoring {var}={raw!r} — using {default} min")
+        return default
+    return value
+
+
+async def _loop(name: str, cycle, minutes: float, stop: asyncio.Event, running: set):
+    """Run cycle every `minutes`, measured start to start; sleeps are cut short by stop."""
+    period = minutes * 60
+    while not stop.is_set():
+        started = time.monotonic()
+        running.add(name)
+        try:
+            await asyncio.to_thread(cycle)
+        except Exception as e:
+            logger.exception(f"Daemon: {name} cycle failed: {e}")
+        finally:
+            running.discard(name)
+        elapsed = time.monotonic() - started
+        delay   = max(0.0, period - elapsed)
+        logger.info(f"Daemon: {name} cycle took {elapsed:.1f}s — next in {delay / 60:.1f} min")
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def _main(loops: dict):
+    stop    = asyncio.Event()
+    running = set()
+
+    def _shutdown(signame: str):
+        if stop.is_set():
+            logger.warning(f"Daemon: {signame} again — still waiting on: {', '.join(sorted(running)) or 'nothing'}")
+            return
+        logger.info(f"Daemon: {signame} received — finishing in-flight cycles: {', '.join(sorted(running)) or 'none'}")
+        stop.set()
+
+    event_loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        event_loop.add_signal_handler(sig, _shutdown, sig.name)
+
+    schedule = ", ".join(f"{name} every {minutes:g} min" for name, (_, minutes) in loops.items())
+    logger.info(f"0xeeTerm daemon started — {schedule}")
+    await asyncio.gather(*(
+        _loop(name, cycle, minutes, stop, running) for name, (cycle, minutes) in loops.items()
+    ))
+    logger.info("0xeeTerm daemon stopped")
+
+
+def run(loops: dict):
+    """
+    Block until SIGTERM / SIGINT, running every loop concurrently.
+    loops: {name: (cycle, interval_minutes)} — cycle is a blocking no-arg callable.
+    """
+    asyncio.run(_main(loops))
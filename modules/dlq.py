@@ -0,0 +1,186 @@
+"""
+0xeeTerm — Dead-Letter Queue Module
+
+Retry bookkeeping for paid service requests that failed (generation,
+posting, unreadable transaction). A failed request leaves the shill scan —
+the dedupe index marks it done — and is owned here instead: it is retried
+with exponential backoff, and after DLQ_MAX_ATTEMPTS it is parked as "dead"
+so a poison request (deleted target tweet, a wallet that always errors)
+stops spending Haiku calls and X budget every cycle.
+
+Storage : logs/state.db, table dead_letters (next to the payment ledger)
+Entry   : sig, slot, memo, service, handle, status (retrying | dead),
+          attempts, next_attempt_at, last_error, errors (last few reasons),
+          first_failed_at, updated_at
+Backoff : DLQ_BACKOFF_SECONDS (default 600 — one shill cycle), doubled per
+          attempt, capped at BACKOFF_MAX_SECONDS
+Inspect : `0xeeTerm dlq [list | retry <sig|all> | drop <sig|all>]`
+"""
+
+import os
+import json
+import logging
+from datetime import datetime, timezone, timedelta
+from modules import state as state_store
+
+logger = logging.getLogger("0xeeTerm.dlq")
+
+DLQ_MAX_ATTEMPTS     = int(os.getenv("DLQ_MAX_ATTEMPTS", "5"))
+BACKOFF_BASE_SECONDS = int(os.getenv("DLQ_BACKOFF_SECONDS", "600"))
+BACKOFF_MAX_SECONDS  = 12 * 3600
+ERRORS_KEPT          = 5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dead_letters (
+    sig             TEXT PRIMARY KEY,
+    slot            INTEGER,
+    memo            TEXT NOT NULL,
+    service         TEXT NOT NULL,
+    handle          TEXT,
+    status          TEXT NOT NULL,
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at TEXT,
+    last_error      TEXT,
+    errors          TEXT NOT NULL DEFAULT '[]',
+    first_failed_at TEXT NOT NULL,
+    updated_at      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_dead_letters_due ON dead_letters(status, next_attempt_at);
+"""
+
+_COLUMNS = ("sig", "slot", "memo", "service", "handle", "status", "attempts",
+            "next_attempt_at", "last_error", "errors", "first_failed_at", "updated_at")
+
+_initialized = False
+
+
+def _ensure_schema():
+    global _initialized
+    if not _initialized:
+        with state_store.connection() as conn:
+            conn.executescript(_SCHEMA)
+        _initialized = True
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _entry(row) -> dict:
+    entry = dict(zip(_COLUMNS, row))
+    entry["errors"] = json.loads(entry["errors"] or "[]")
+    return entry
+
+
+def _select(conn, where: str = "", params: tuple = ()) -> list:
+    rows = conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM dead_letters {where}", params).fetchall()
+    return [_entry(r) for r in rows]
+
+
+def backoff_seconds(attempts: int) -> int:
+    """Delay before retry n+1 after n failed attempts: base, 2×base, 4×base ... capped."""
+    return min(BACKOFF_BASE_SECONDS * 2 ** max(attempts - 1, 0), BACKOFF_MAX_SECONDS)
+
+
+# ─────────────────────────────────────────────
+#  PUBLIC API
+# ─────────────────────────────────────────────
+
+def fail(
+    sig: str,
+    slot: int,
+    memo: str,
+    service: str,
+    handle: str,
+    reason: str,
+    retry_at: datetime = None,
+    dead: bool = False,
+) -> dict:
+    """
+    Record a failed attempt and schedule the next one (or park the entry as
+    dead after DLQ_MAX_ATTEMPTS). Returns the updated entry.
+    retry_at : the failure spent no budget and another component owns the
+               wait (a post deferred by the outbox) — retry then, without
+               counting an attempt
+    dead     : retrying cannot help (the outbox gave up) — park it now
+    """
+    _ensure_schema()
+    now    = _now()
+    reason = " ".join((reason or "unknown error").split())[:300]
+    with state_store.transaction() as conn:
+        found    = _select(conn, "WHERE sig = ?", (sig,))
+        entry    = found[0] if found else None
+        attempts = (entry["attempts"] if entry else 0) + (0 if retry_at else 1)
+        errors   = ((entry["errors"] if entry else []) + [{"at": now.isoformat(), "error": reason}])[-ERRORS_KEPT:]
+        if dead or (retry_at is None and attempts >= DLQ_MAX_ATTEMPTS):
+            status, next_at = "dead", None
+        else:
+            status  = "retrying"
+            next_at = (max(retry_at, now) if retry_at else now + timedelta(seconds=backoff_seconds(attempts))).isoformat()
+        conn.execute(
+            "INSERT INTO dead_letters (sig, slot, memo, service, handle, status, attempts, next_attempt_at, "
+            "last_error, errors, first_failed_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(sig) DO UPDATE SET status = excluded.status, attempts = excluded.attempts, "
+            "next_attempt_at = excluded.next_attempt_at, last_error = excluded.last_error, "
+            "errors = excluded.errors, updated_at = excluded.updated_at",
+            (sig, slot, memo, service, handle, status, attempts, next_at,
+             reason, json.dumps(errors), now.isoformat(), now.isoformat()),
+        )
+    return {**(entry or {}), "sig": sig, "status": status, "attempts": attempts,
+            "next_attempt_at": next_at, "last_error": reason, "errors": errors}
+
+
+def clear(sig: str) -> bool:
+    """Forget a request once it has been served (or skipped). True if it was tracked."""
+    _ensure_schema()
+    with state_store.transaction() as conn:
+        return conn.execute("DELETE FROM dead_letters WHERE sig = ?", (sig,)).rowcount > 0
+
+
+def due(now: datetime = None) -> list:
+    """Entries whose backoff has expired, oldest first."""
+    _ensure_schema()
+    with state_store.connection() as conn:
+        return _select(
+            conn, "WHERE status = 'retrying' AND next_attempt_at <= ? ORDER BY slot",
+            ((now or _now()).isoformat(),),
+        )
+
+
+def entries(status: str = None) -> list:
+    """Every tracked entry (optionally one status), oldest first."""
+    _ensure_schema()
+    with state_store.connection() as conn:
+        if status:
+            return _select(conn, "WHERE status = ? ORDER BY slot", (status,))
+        return _select(conn, "ORDER BY slot")
+
+
+def match(sig_prefix: str) -> list:
+    """Entries whose signature starts with sig_prefix ("all" = every entry)."""
+    if sig_prefix == "all":
+        return entries()
+    _ensure_schema()
+    with state_store.connection() as conn:
+        return _select(conn, "WHERE sig LIKE ? ORDER BY slot", (sig_prefix.replace("%", "") + "%",))
+
+
+def retry(sigs: list) -> int:
+    """Give entries a fresh attempt budget, due on the next shill cycle."""
+    _ensure_schema()
+    now = _now().isoformat()
+    with state_store.transaction() as conn:
+        return sum(
+            conn.execute(
+                "UPDATE dead_letters SET status = 'retrying', attempts = 0, next_attempt_at = ?, updated_at = ? "
+                "WHERE sig = ?", (now, now, sig),
+            ).rowcount
+            for sig in sigs
+        )
+
+
+def drop(sigs: list) -> int:
+    """Discard entries for good — the payment stays unserved and is not rescanned."""
+    _ensure_schema()
+    with state_store.transaction() as conn:
+        return sum(conn.execute("DELETE FROM dead_letters WHERE sig = ?", (sig,)).rowcount for sig in sigs)
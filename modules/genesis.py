@@ -0,0 +1,231 @@
+"""
+0xeeTerm — Genesis Module
+
+Permanent early-supporter registry (Genesis Certificates).
+
+Storage : logs/genesis_registry.jsonl — append-only log, one JSON entry per line,
+                                        the source of truth
+          logs/genesis_index.db       — SQLite index over the log (tx_sig, handle),
+                                        rebuilt / caught up from the log on open
+Entry   : { handle, sol, tx_sig, at }
+
+Appends take an exclusive flock, check the signature index (O(1) dedupe) and
+write a single line — the registry is never rewritten. A crash between the
+log write and the index write is repaired on the next open, since the index
+records how many bytes of the log it covers; a line torn by a crash mid-write
+(never acknowledged) is cut off there, so the next append starts on a clean
+line. Reads share the lock and only upgrade it when the index is behind.
+Legacy logs/genesis_registry.json is imported once, then renamed to
+genesis_registry.json.migrated.
+"""
+
+import os
+import json
+import fcntl
+import sqlite3
+import logging
+from pathlib import Path
+from contextlib import contextmanager
+
+logger = logging.getLogger("0xeeTerm.genesis")
+
+GENESIS_DIR    = Path(__file__).parent.parent / "logs"
+GENESIS_LOG    = GENESIS_DIR / "genesis_registry.jsonl"
+GENESIS_INDEX  = GENESIS_DIR / "genesis_index.db"
+GENESIS_LEGACY = GENESIS_DIR / "genesis_registry.json"
+LOCK_FILE      = GENESIS_DIR / "genesis.lock"
+
+_initialized = False
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    seq        INTEGER PRIMARY KEY,
+    tx_sig     TEXT NOT NULL UNIQUE,
+    handle     TEXT NOT NULL,
+    handle_key TEXT NOT NULL,
+    sol        REAL NOT NULL,
+    at         TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_handle ON entries(handle_key);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+# ─────────────────────────────────────────────
+#  INTERNAL HELPERS
+# ─────────────────────────────────────────────
+
+@contextmanager
+def _locked(mode: int = fcntl.LOCK_EX):
+    """Exclusive access for appends, index catch-up and migration; LOCK_SH for reads."""
+    GENESIS_DIR.mkdir(parents=True, exist_ok=True)
+    with open(LOCK_FILE, "a") as lock:
+        fcntl.flock(lock, mode)
+        try:
+            yield lock
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _connect() -> sqlite3.Connection:
+    global _initialized
+    conn = sqlite3.connect(GENESIS_INDEX, timeout=30)
+    conn.row_factory = sqlite3.Row
+    if not _initialized:
+        conn.execute("PRAGMA journal_mode=WAL")   # persistent in the file — once per process is enough
+        conn.executescript(_SCHEMA)
+        _initialized = True
+    return conn
+
+
+def _covered(conn: sqlite3.Connection) -> int:
+    row = conn.execute("SELECT value FROM meta WHERE key = 'log_bytes'").fetchone()
+    return row["value"] if row else 0
+
+
+def _log_size() -> int:
+    return GENESIS_LOG.stat().st_size if GENESIS_LOG.exists() else 0
+
+
+def _handle_key(handle: str) -> str:
+    return handle.lstrip("@").lower()
+
+
+def _index(conn: sqlite3.Connection, entry: dict):
+    conn.execute(
+        "INSERT OR IGNORE INTO entries (tx_sig, handle, handle_key, sol, at) VALUES (?, ?, ?, ?, ?)",
+        (entry["tx_sig"], entry["handle"], _handle_key(entry["handle"]), entry["sol"], entry["at"]),
+    )
+
+
+def _write_line(entry: dict) -> int:
+    """Append one entry to the log and return the new log size."""
+    line = json.dumps(entry, separators=(",", ":")) + "\n"
+    with open(GENESIS_LOG, "a") as f:
+        f.write(line)
+        f.flush()
+        os.fsync(f.fileno())
+        return f.tell()
+
+
+def _catch_up(conn: sqlite3.Connection):
+    """Index any log lines past the covered offset (new file, or a crash mid-append)."""
+    size    = _log_size()
+    covered = _covered(conn)
+    if size == covered:
+        return
+    if size < covered:
+        logger.warning("Genesis: log shorter than its index — rebuilding index")
+        conn.execute("DELETE FROM entries")
+        covered = 0
+
+    torn = False
+    with open(GENESIS_LOG, "rb") as f:
+        f.seek(covered)
+        for line in f:
+            if not line.endswith(b"\n"):
+                torn = True
+                break
+            try:
+                _index(conn, json.loads(line))
+            except (ValueError, KeyError) as e:
+                logger.error(f"Genesis: skipping unreadable log line: {e}")
+            covered += len(line)
+    if torn:
+        # Crash mid-write — that append never returned, so drop the fragment
+        # instead of letting the next line be written onto it
+        logger.warning(f"Genesis: truncating torn final log line ({size - covered} bytes)")
+        os.truncate(GENESIS_LOG, covered)
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('log_bytes', ?)", (covered,))
+
+
+def _migrate_legacy(conn: sqlite3.Connection):
+    if not GENESIS_LEGACY.exists():
+        return
+    try:
+        with open(GENESIS_LEGACY) as f:
+            legacy = json.load(f)
+    except Exception as e:
+        logger.error(f"Genesis: cannot migrate {GENESIS_LEGACY.name}: {e}")
+        return
+    size = 0
+    for entry in legacy:
+        if conn.execute("SELECT 1 FROM entries WHERE tx_sig = ?", (entry.get("tx_sig"),)).fetchone():
+            continue
+        size = _write_line(entry)
+        _index(conn, entry)
+    if size:
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('log_bytes', ?)", (size,))
+    GENESIS_LEGACY.rename(GENESIS_LEGACY.with_suffix(".json.migrated"))
+    logger.info(f"Genesis: migrated {len(legacy)} entr(ies) from {GENESIS_LEGACY.name}")
+
+
+@contextmanager
+def _db(shared: bool = False):
+    """
+    Index connection, caught up with the log (and the legacy file migrated).
+    shared=True (reads) holds a shared lock, upgraded to exclusive only when
+    the index is behind the log.
+    """
+    with _locked(fcntl.LOCK_SH if shared else fcntl.LOCK_EX) as lock:
+        conn = _connect()
+        try:
+            if not shared or _covered(conn) != _log_size() or GENESIS_LEGACY.exists():
+                if shared:
+                    fcntl.flock(lock, fcntl.LOCK_EX)
+                with conn:
+                    _catch_up(conn)
+                    _migrate_legacy(conn)
+            yield conn
+        finally:
+            conn.close()
+
+
+def _entry(row: sqlite3.Row) -> dict:
+    return {"handle": row["handle"], "sol": row["sol"], "tx_sig": row["tx_sig"], "at": row["at"]}
+
+
+# ─────────────────────────────────────────────
+#  PUBLIC API
+# ─────────────────────────────────────────────
+
+def append(handle: str, sol: float, tx_sig: str, at: str) -> bool:
+    """Record a Genesis Certificate. Returns False if tx_sig is already registered."""
+    entry = {"handle": handle, "sol": round(sol, 4), "tx_sig": tx_sig, "at": at}
+    with _db() as conn:
+        if conn.execute("SELECT 1 FROM entries WHERE tx_sig = ?", (tx_sig,)).fetchone():
+            return False
+        size = _write_line(entry)
+        with conn:
+            _index(conn, entry)
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('log_bytes', ?)", (size,))
+        number = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+    logger.info(f"Genesis: entry saved — {handle} (#{number})")
+    return True
+
+
+def count() -> int:
+    with _db(shared=True) as conn:
+        return conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+
+def page(offset: int = 0, limit: int = None) -> list:
+    """Entries in registration order. limit=None returns everything from offset."""
+    with _db(shared=True) as conn:
+        rows = conn.execute(
+            "SELECT * FROM entries ORDER BY seq LIMIT ? OFFSET ?",
+            (-1 if limit is None else limit, offset),
+        ).fetchall()
+    return [_entry(row) for row in rows]
+
+
+def by_handle(handle: str) -> list:
+    """All certificates held by a handle (case-insensitive, with or without @)."""
+    with _db(shared=True) as conn:
+        rows = conn.execute(
+            "SELECT * FROM entries WHERE handle_key = ? ORDER BY seq", (_handle_key(handle),)
+        ).fetchall()
+    return [_entry(row) for row in rows]
@@ -0,0 +1,184 @@
+"""
+0xeeTerm — Ledger Module
+
+Append-only record of every served payment, with rollups maintained
+incrementally in the same transaction, so earnings questions (total,
+this month, per day, per service) are answered in O(1) without a chain
+rescan.
+
+Storage : logs/state.db (tables below, next to the key-value state)
+payments: sig, slot, service, handle, lamports, sol_price, usd, tweet_id, at
+rollups : (period, bucket) → count, lamports, usd
+          period "total" (bucket "all"), "day" (YYYY-MM-DD),
+          "month" (YYYY-MM), "service" (toll, genesis, ...)
+
+Legacy running totals from the shill state are seeded once (seed_legacy).
+"""
+
+import logging
+from datetime import datetime, timezone, timedelta
+from modules import state as state_store
+
+logger = logging.getLogger("0xeeTerm.ledger")
+
+LAMPORTS_PER_SOL = 1_000_000_000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS payments (
+    sig       TEXT PRIMARY KEY,
+    slot      INTEGER,
+    service   TEXT NOT NULL,
+    handle    TEXT,
+    lamports  INTEGER NOT NULL,
+    sol_price REAL,
+    usd       REAL,
+    tweet_id  TEXT,
+    at        TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_payments_at     ON payments(at);
+CREATE INDEX IF NOT EXISTS idx_payments_handle ON payments(handle);
+CREATE TABLE IF NOT EXISTS rollups (
+    period   TEXT NOT NULL,
+    bucket   TEXT NOT NULL,
+    count    INTEGER NOT NULL DEFAULT 0,
+    lamports INTEGER NOT NULL DEFAULT 0,
+    usd      REAL    NOT NULL DEFAULT 0,
+    PRIMARY KEY (period, bucket)
+);
+"""
+
+_ADD = (
+    "INSERT INTO rollups (period, bucket, count, lamports, usd) VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT(period, bucket) DO UPDATE SET count = count + excluded.count, "
+    "lamports = lamports + excluded.lamports, usd = usd + excluded.usd"
+)
+
+_initialized = False
+
+
+def _ensure_schema():
+    global _initialized
+    if not _initialized:
+        with state_store.connection() as conn:
+            conn.executescript(_SCHEMA)
+        _initialized = True
+
+
+def _rollup(row) -> dict:
+    count, lamports, usd = row if row else (0, 0, 0.0)
+    return {"count": count, "lamports": lamports, "sol": round(lamports / LAMPORTS_PER_SOL, 6), "usd": round(usd, 2)}
+
+
+# ─────────────────────────────────────────────
+#  PUBLIC API
+# ─────────────────────────────────────────────
+
+def record(
+    sig: str,
+    slot: int,
+    service: str,
+    handle: str,
+    lamports: int,
+    sol_price: float,
+    tweet_id: str = None,
+    at: str = None,
+) -> bool:
+    """Append a served payment and bump its rollups. Returns False if sig is already recorded."""
+    _ensure_schema()
+    at  = at or datetime.now(timezone.utc).isoformat()
+    usd = round(lamports / LAMPORTS_PER_SOL * (sol_price or 0.0), 4)
+    with state_store.transaction() as conn:
+        inserted = conn.execute(
+            "INSERT OR IGNORE INTO payments (sig, slot, service, handle, lamports, sol_price, usd, tweet_id, at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (sig, slot, service, handle, lamports, sol_price, usd, tweet_id, at),
+        ).rowcount
+        if not inserted:
+            return False
+        conn.executemany(_ADD, [
+            ("total",   "all",    1, lamports, usd),
+            ("day",     at[:10],  1, lamports, usd),
+            ("month",   at[:7],   1, lamports, usd),
+            ("service", service,  1, lamports, usd),
+        ])
+    logger.info(f"Ledger: {service} {handle} +{lamports / LAMPORTS_PER_SOL:.4f} SOL (${usd:.2f}) — {sig[:16]}...")
+    return True
+
+
+def rollup(period: str, bucket: str) -> dict:
+    """{"count", "lamports", "sol", "usd"} for one rollup bucket (zeros if empty)."""
+    _ensure_schema()
+    with state_store.connection() as conn:
+        row = conn.execute(
+            "SELECT count, lamports, usd FROM rollups WHERE period = ? AND bucket = ?", (period, bucket)
+        ).fetchone()
+    return _rollup(row)
+
+
+def summary() -> dict:
+    """Total, this month, today, yesterday and per-service rollups — a handful of key lookups."""
+    _ensure_schema()
+    now = datetime.now(timezone.utc)
+    keys = {
+        "total":     ("total", "all"),
+        "month":     ("month", now.strftime("%Y-%m")),
+        "today":     ("day",   now.strftime("%Y-%m-%d")),
+        "yesterday": ("day",   (now - timedelta(days=1)).strftime("%Y-%m-%d")),
+    }
+    with state_store.connection() as conn:
+        out = {
+            name: _rollup(conn.execute(
+                "SELECT count, lamports, usd FROM rollups WHERE period = ? AND bucket = ?", key
+            ).fetchone())
+            for name, key in keys.items()
+        }
+        out["by_service"] = {
+            bucket: _rollup((count, lamports, usd))
+            for bucket, count, lamports, usd in conn.execute(
+                "SELECT bucket, count, lamports, usd FROM rollups WHERE period = 'service'"
+            )
+        }
+    return out
+
+
+def recent(n: int = 10) -> list:
+    """Latest n payments, newest first, in the public recent_tolls shape."""
+    _ensure_schema()
+    with state_store.connection() as conn:
+        rows = conn.execute(
+            "SELECT handle, lamports, at, service FROM payments ORDER BY at DESC LIMIT ?", (n,)
+        ).fetchall()
+    return [
+        {"handle": handle, "sol": round(lamports / LAMPORTS_PER_SOL, 4), "at": at, "service": service}
+        for handle, lamports, at, service in rows
+    ]
+
+
+def seed_legacy(legacy: dict) -> bool:
+    """
+    One-shot import of the running totals kept in the shill state before the
+    ledger existed (total_earned_sol, monthly_earned_sol, tolls_count,
+    recent_tolls). The totals are booked under service "toll", the only
+    service then, so by_service still sums to total. Recent tolls become
+    payments rows without rollups, since the seeded totals already include
+    them. Returns True if it seeded.
+    """
+    _ensure_schema()
+    with state_store.transaction() as conn:
+        if conn.execute("SELECT 1 FROM rollups WHERE period = 'total'").fetchone():
+            return False
+        total_lamports = round((legacy.get("total_earned_sol") or 0.0) * LAMPORTS_PER_SOL)
+        conn.execute(_ADD, ("total", "all", legacy.get("tolls_count") or 0, total_lamports, 0.0))
+        conn.execute(_ADD, ("service", "toll", legacy.get("tolls_count") or 0, total_lamports, 0.0))
+        if legacy.get("monthly_reset") and legacy.get("monthly_earned_sol"):
+            month_lamports = round(legacy["monthly_earned_sol"] * LAMPORTS_PER_SOL)
+            conn.execute(_ADD, ("month", legacy["monthly_reset"], 0, month_lamports, 0.0))
+        for i, toll in enumerate(legacy.get("recent_tolls") or []):
+            conn.execute(
+                "INSERT OR IGNORE INTO payments (sig, slot, service, handle, lamports, at) VALUES (?, 0, ?, ?, ?, ?)",
+                (f"legacy:{i}:{toll.get('at')}", toll.get("service") or "toll", toll.get("handle"),
+                 round((toll.get("sol") or 0.0) * LAMPORTS_PER_SOL), toll.get("at") or ""),
+            )
+    if total_lamports:
+        logger.info(f"Ledger: seeded legacy totals — {total_lamports / LAMPORTS_PER_SOL:.4f} SOL")
+    return True
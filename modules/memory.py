@@ -4,15 +4,27 @@
 Passive collection of posted tweets and their X metrics.
 Phase 1: record-only. Phase 3: will feed into brain.py to influence content.
 
-Storage: logs/memory.json (project-relative, included in nexus backup)
-Format : { tweet_id: { id, text, type, posted_at, likes, retweets,
-                        replies, impressions, score, fetched_at } }
+Storage: logs/memory.db (SQLite, WAL mode — project-relative, included in nexus backup)
+Table  : tweets(id, text, type, posted_at, likes, retweets, replies,
+                impressions, score, fetched_at, tier, stable_count)
+Indexes: score, posted_at, type
+Ranking: leaderboard(scope, id, score) — top LEADERBOARD_SIZE per scope ("all",
+         "type:<type>"), kept current as scores change so readers never scan history
+A legacy logs/memory.json is imported once, then renamed to memory.json.migrated.
+
+Refresh tiers (keeps the per-run metrics budget bounded as history grows):
+  hot  : posted < 48h ago           → refreshed every 2h
+  warm : older, still moving        → refreshed daily
+  cold : unchanged for 3 refreshes  → probed weekly, back to warm if it moves
 """
 
 import json
+import sqlite3
 import logging
 import tweepy
 from pathlib import Path
+from contextlib import contextmanager
+from modules import ratelimit
 from datetime import datetime, timezone, timedelta
 
 logger = logging.getLogger("0xeeTerm.memory")
@@ -22,9 +34,24 @@ logger = logging.getLogger("0xeeTerm.memory")
 # ─────────────────────────────────────────────
 
 MEMORY_DIR  = Path(__file__).parent.parent / "logs"
-MEMORY_FILE = MEMORY_DIR / "memory.json"
+MEMORY_DB   = MEMORY_DIR / "memory.db"
+MEMORY_FILE = MEMORY_DIR / "memory.json"   # legacy store, migrated on first open
 
-FETCH_INTERVAL_HOURS = 4
+LOOKUP_BATCH_SIZE    = 100   # max IDs per GET /2/tweets lookup
+MAX_REFRESH_PER_RUN  = 300   # at most 3 lookups per run, whatever the history size
+
+HOT_AGE_HOURS = 48
+TIER_INTERVAL_HOURS = {
+    "hot":  2,
+    "warm": 24,
+    "cold": 24 * 7,
+}
+COLD_AFTER_STABLE = 3        # unchanged warm refreshes before a tweet goes cold
+STABLE_SCORE_DELTA = 1.0     # score moves smaller than this (or 1%) count as unchanged
+
+LEADERBOARD_SIZE      = 25   # entries kept per ranking scope
+DECAY_HALF_LIFE_HOURS = 72   # decayed ranking: a tweet's score halves every 3 days
+DECAY_WINDOW_DAYS     = 14   # recent tweets considered alongside the leaderboard when decaying
 
 SCORE_WEIGHTS = {
     "likes":       3.0,
@@ -38,17 +65,168 @@ SCORE_WEIGHTS = {
 #  INTERNAL HELPERS
 # ─────────────────────────────────────────────
 
-def _load() -> dict:
-    if MEMORY_FILE.exists():
+COLUMNS = (
+    "id", "text", "type", "posted_at", "likes", "retweets", "replies",
+    "impressions", "score", "fetched_at", "tier", "stable_count",
+)
+
+_DEFAULTS = {"likes": 0, "retweets": 0, "replies": 0, "impressions": 0, "score": 0.0, "stable_count": 0}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tweets (
+    id           TEXT PRIMARY KEY,
+    text         TEXT NOT NULL,
+    type         TEXT,
+    posted_at    TEXT,
+    likes        INTEGER NOT NULL DEFAULT 0,
+    retweets     INTEGER NOT NULL DEFAULT 0,
+    replies      INTEGER NOT NULL DEFAULT 0,
+    impressions  INTEGER NOT NULL DEFAULT 0,
+    score        REAL    NOT NULL DEFAULT 0,
+    fetched_at   TEXT,
+    tier         TEXT,
+    stable_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_tweets_score     ON tweets(score DESC);
+CREATE INDEX IF NOT EXISTS idx_tweets_posted_at ON tweets(posted_at);
+CREATE INDEX IF NOT EXISTS idx_tweets_type      ON tweets(type, score DESC);
+
+CREATE TABLE IF NOT EXISTS leaderboard (
+    scope TEXT NOT NULL,
+    id    TEXT NOT NULL,
+    score REAL NOT NULL,
+    PRIMARY KEY (scope, id)
+);
+CREATE INDEX IF NOT EXISTS idx_leaderboard_rank ON leaderboard(scope, score DESC);
+"""
+
+_initialized = False
+
+
+def _migrate_json(conn: sqlite3.Connection):
+    """One-shot import of the legacy memory.json — safe to re-run (INSERT OR IGNORE)."""
+    if not MEMORY_FILE.exists():
+        return
+    try:
         with open(MEMORY_FILE) as f:
-            return json.load(f)
-    return {}
+            legacy = json.load(f)
+    except Exception as e:
+        logger.error(f"Memory: cannot migrate {MEMORY_FILE.name}: {e}")
+        return
+
+    rows = [tuple(entry.get(c, _DEFAULTS.get(c)) for c in COLUMNS) for entry in legacy.values()]
+    with conn:
+        conn.executemany(
+            f"INSERT OR IGNORE INTO tweets ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+            rows,
+        )
+    try:
+        MEMORY_FILE.rename(MEMORY_FILE.with_suffix(".json.migrated"))
+    except FileNotFoundError:
+        pass   # another process finished the migration first
+    logger.info(f"Memory: migrated {len(rows)} tweet(s) from {MEMORY_FILE.name} to {MEMORY_DB.name}")
 
 
-def _save(data: dict):
+@contextmanager
+def _db():
+    """Short-lived connection — WAL lets timer processes read while another writes."""
+    global _initialized
     MEMORY_DIR.mkdir(parents=True, exist_ok=True)
-    with open(MEMORY_FILE, "w") as f:
-        json.dump(data, f, indent=2)
+    conn = sqlite3.connect(MEMORY_DB, timeout=30)
+    conn.row_factory = sqlite3.Row
+    try:
+        if not _initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            _migrate_json(conn)
+            if not conn.execute("SELECT 1 FROM leaderboard LIMIT 1").fetchone():
+                with conn:
+                    _rebuild_all(conn)
+            _initialized = True
+        conn.execute("PRAGMA synchronous=NORMAL")
+        yield conn
+    finally:
+        conn.close()
+
+
+def _scopes(entry: dict) -> tuple:
+    return ("all", f"type:{entry['type']}") if entry.get("type") else ("all",)
+
+
+def _rebuild(conn: sqlite3.Connection, scope: str):
+    """Refill one scope from the score indexes (LEADERBOARD_SIZE rows read, not the history)."""
+    conn.execute("DELETE FROM leaderboard WHERE scope = ?", (scope,))
+    if scope == "all":
+        conn.execute(
+            "INSERT INTO leaderboard SELECT 'all', id, score FROM tweets ORDER BY score DESC LIMIT ?",
+            (LEADERBOARD_SIZE,),
+        )
+    else:
+        conn.execute(
+            "INSERT INTO leaderboard SELECT ?, id, score FROM tweets WHERE type = ? ORDER BY score DESC LIMIT ?",
+            (scope, scope.split(":", 1)[1], LEADERBOARD_SIZE),
+        )
+
+
+def _rebuild_all(conn: sqlite3.Connection):
+    _rebuild(conn, "all")
+    for (tweet_type,) in conn.execute("SELECT DISTINCT type FROM tweets WHERE type IS NOT NULL").fetchall():
+        _rebuild(conn, f"type:{tweet_type}")
+
+
+def _rank(conn: sqlite3.Connection, entries: list):
+    """
+    Fold new scores into the leaderboard. A score that rises (or a new tweet)
+    is inserted if it beats the scope's floor, then the scope is trimmed back
+    to LEADERBOARD_SIZE. A member whose score drops may now belong below a
+    non-member, so that scope is rebuilt instead.
+    """
+    stale = set()
+    for entry in entries:
+        for scope in _scopes(entry):
+            if scope in stale:
+                continue
+            member = conn.execute(
+                "SELECT score FROM leaderboard WHERE scope = ? AND id = ?", (scope, entry["id"])
+            ).fetchone()
+            if member and entry["score"] < member["score"]:
+                stale.add(scope)
+                continue
+            size, floor = conn.execute(
+                "SELECT COUNT(*), MIN(score) FROM leaderboard WHERE scope = ?", (scope,)
+            ).fetchone()
+            if member or size < LEADERBOARD_SIZE or entry["score"] > floor:
+                conn.execute(
+                    "INSERT OR REPLACE INTO leaderboard (scope, id, score) VALUES (?, ?, ?)",
+                    (scope, entry["id"], entry["score"]),
+                )
+                if not member and size >= LEADERBOARD_SIZE:
+                    conn.execute(
+                        "DELETE FROM leaderboard WHERE scope = ? AND id = "
+                        "(SELECT id FROM leaderboard WHERE scope = ? ORDER BY score ASC LIMIT 1)",
+                        (scope, scope),
+                    )
+    for scope in stale:
+        _rebuild(conn, scope)
+
+
+def _write(conn: sqlite3.Connection, entries: list):
+    """Persist refreshed metrics / tier fields and their ranking in one transaction."""
+    with conn:
+        conn.executemany(
+            "UPDATE tweets SET likes = ?, retweets = ?, replies = ?, impressions = ?, score = ?, "
+            "fetched_at = ?, tier = ?, stable_count = ? WHERE id = ?",
+            [
+                (e["likes"], e["retweets"], e["replies"], e["impressions"], e["score"],
+                 e["fetched_at"], e.get("tier"), e.get("stable_count", 0), e["id"])
+                for e in entries
+            ],
+        )
+        _rank(conn, entries)
+
+
+def _decayed(entry: dict) -> float:
+    return round(entry["score"] * 0.5 ** (_age_hours(entry) / DECAY_HALF_LIFE_HOURS), 2)
 
 
 def _compute_score(entry: dict) -> float:
@@ -60,15 +238,77 @@ def _compute_score(entry: dict) -> float:
     )
 
 
-def _needs_fetch(entry: dict) -> bool:
-    if not entry.get("fetched_at"):
-        return True
+def _age_hours(entry: dict) -> float:
     try:
-        last = datetime.fromisoformat(entry["fetched_at"])
-        elapsed = (datetime.now(timezone.utc) - last).total_seconds() / 3600
-        return elapsed >= FETCH_INTERVAL_HOURS
-    except (ValueError, TypeError):
-        return True  # Corrupted timestamp — refetch
+        posted = datetime.fromisoformat(entry["posted_at"])
+        return (datetime.now(timezone.utc) - posted).total_seconds() / 3600
+    except (KeyError, ValueError, TypeError):
+        return 0.0
+
+
+def _tier(entry: dict) -> str:
+    """Refresh tier — age decides hot, observed deltas decide warm vs cold."""
+    if _age_hours(entry) < HOT_AGE_HOURS:
+        return "hot"
+    return "cold" if entry.get("tier") == "cold" else "warm"
+
+
+def _apply_metrics(entry: dict, metrics: dict):
+    """Copy X public_metrics onto a memory entry, recompute its score and move its tier."""
+    previous = entry.get("score", 0.0) if entry.get("fetched_at") else None
+
+    entry["likes"]        = metrics.get("like_count",        0)
+    entry["retweets"]     = metrics.get("retweet_count",     0)
+    entry["replies"]      = metrics.get("reply_count",       0)
+    entry["impressions"]  = metrics.get("impression_count",  0)
+    entry["score"]        = round(_compute_score(entry), 2)
+    entry["fetched_at"]   = datetime.now(timezone.utc).isoformat()
+
+    tier = _tier(entry)
+    stable = previous is not None and abs(entry["score"] - previous) <= max(STABLE_SCORE_DELTA, previous * 0.01)
+    if tier == "hot":
+        entry["stable_count"] = 0   # only warm refreshes count towards cold
+    elif stable:
+        entry["stable_count"] = entry.get("stable_count", 0) + 1
+        if tier == "warm" and entry["stable_count"] >= COLD_AFTER_STABLE:
+            tier = "cold"
+            logger.debug(f"Memory: tweet {entry['id']} settled — moved to cold tier")
+    else:
+        entry["stable_count"] = 0
+        if tier == "cold":
+            tier = "warm"
+            logger.info(f"Memory: tweet {entry['id']} moving again — back to warm tier")
+    entry["tier"] = tier
+
+
+def _due_filter() -> tuple[str, dict]:
+    """
+    SQL WHERE clause selecting tweets whose tier interval has elapsed — the same
+    rule as _tier(), evaluated against the posted_at index instead of in Python.
+    ISO-8601 UTC timestamps compare correctly as strings.
+    """
+    now = datetime.now(timezone.utc)
+    ago = lambda hours: (now - timedelta(hours=hours)).isoformat()
+    clause = (
+        "fetched_at IS NULL"
+        " OR (posted_at >= :hot_cutoff AND fetched_at < :hot_due)"
+        " OR (posted_at <  :hot_cutoff AND COALESCE(tier, 'warm') != 'cold' AND fetched_at < :warm_due)"
+        " OR (posted_at <  :hot_cutoff AND tier = 'cold' AND fetched_at < :cold_due)"
+    )
+    params = {
+        "hot_cutoff": ago(HOT_AGE_HOURS),
+        "hot_due":    ago(TIER_INTERVAL_HOURS["hot"]),
+        "warm_due":   ago(TIER_INTERVAL_HOURS["warm"]),
+        "cold_due":   ago(TIER_INTERVAL_HOURS["cold"]),
+    }
+    return clause, params
+
+
+# Hot before warm before cold, then least recently fetched first
+_REFRESH_ORDER = (
+    "CASE WHEN posted_at >= :hot_cutoff THEN 0 WHEN tier = 'cold' THEN 2 ELSE 1 END,"
+    " COALESCE(fetched_at, '')"
+)
 
 
 # ─────────────────────────────────────────────
@@ -76,38 +316,31 @@ def _needs_fetch(entry: dict) -> bool:
 # ─────────────────────────────────────────────
 
 def save_tweet(tweet_id: str, tweet_text: str, tweet_type: str):
-    """Record a newly posted tweet in memory.json (metrics start at 0)."""
+    """Record a newly posted tweet in memory.db (metrics start at 0)."""
     tweet_id = str(tweet_id)
-    data = _load()
-
-    if tweet_id in data:
+    with _db() as conn, conn:
+        inserted = conn.execute(
+            "INSERT OR IGNORE INTO tweets (id, text, type, posted_at) VALUES (?, ?, ?, ?)",
+            (tweet_id, tweet_text, tweet_type, datetime.now(timezone.utc).isoformat()),
+        ).rowcount
+        if inserted:
+            _rank(conn, [{"id": tweet_id, "type": tweet_type, "score": 0.0}])
+
+    if not inserted:
         logger.debug(f"Memory: tweet {tweet_id} already recorded, skipping.")
         return
-
-    data[tweet_id] = {
-        "id":          tweet_id,
-        "text":        tweet_text,
-        "type":        tweet_type,
-        "posted_at":   datetime.now(timezone.utc).isoformat(),
-        "likes":       0,
-        "retweets":    0,
-        "replies":     0,
-        "impressions": 0,
-        "score":       0.0,
-        "fetched_at":  None,
-    }
-    _save(data)
     logger.info(f"Memory: recorded tweet {tweet_id} [{tweet_type}]")
 
 
 def fetch_metrics(tweet_id: str):
-    """Fetch public_metrics from X API and update the entry in memory.json."""
+    """Fetch public_metrics from X API and update the entry in memory.db."""
     from modules.twitter import get_client
 
     tweet_id = str(tweet_id)
-    data = _load()
+    with _db() as conn:
+        row = conn.execute("SELECT * FROM tweets WHERE id = ?", (tweet_id,)).fetchone()
 
-    if tweet_id not in data:
+    if row is None:
         logger.warning(f"Memory: tweet {tweet_id} not found, cannot fetch metrics.")
         return
 
@@ -122,16 +355,10 @@ def fetch_metrics(tweet_id: str):
             logger.warning(f"Memory: no data returned for tweet {tweet_id}")
             return
 
-        m = response.data.public_metrics or {}
-        entry = data[tweet_id]
-        entry["likes"]        = m.get("like_count",        0)
-        entry["retweets"]     = m.get("retweet_count",     0)
-        entry["replies"]      = m.get("reply_count",       0)
-        entry["impressions"]  = m.get("impression_count",  0)
-        entry["score"]        = round(_compute_score(entry), 2)
-        entry["fetched_at"]   = datetime.now(timezone.utc).isoformat()
-
-        _save(data)
+        entry = dict(row)
+        _apply_metrics(entry, response.data.public_metrics or {})
+        with _db() as conn:
+            _write(conn, [entry])
         logger.info(
             f"Memory: metrics updated for {tweet_id} — "
             f"score={entry['score']} "
@@ -144,29 +371,123 @@ def fetch_metrics(tweet_id: str):
 
 
 def update_all_metrics():
-    """Fetch metrics for every tweet not refreshed in the last 4 hours."""
-    data = _load()
-    if not data:
-        logger.info("Memory: no tweets recorded yet.")
-        return
-
-    pending = [e for e in data.values() if _needs_fetch(e)]
-    logger.info(f"Memory: {len(pending)}/{len(data)} tweet(s) need a metrics refresh.")
-
-    for entry in pending:
-        fetch_metrics(entry["id"])
+    """
+    Fetch metrics for every tweet whose tier interval has elapsed.
+    At most MAX_REFRESH_PER_RUN tweets per run, hottest and stalest first; looks up
+    LOOKUP_BATCH_SIZE IDs per get_tweets call and commits all updates in one transaction.
+    """
+    from modules.twitter import get_client
 
-    # Reload after updates and log top scorer
-    data = _load()
-    if data:
-        top = max(data.values(), key=lambda e: e["score"])
+    clause, params = _due_filter()
+    with _db() as conn:
+        total = conn.execute("SELECT COUNT(*) FROM tweets").fetchone()[0]
+        if not total:
+            logger.info("Memory: no tweets recorded yet.")
+            return
+        due = conn.execute(f"SELECT COUNT(*) FROM tweets WHERE {clause}", params).fetchone()[0]
+        rows = conn.execute(
+            f"SELECT * FROM tweets WHERE {clause} ORDER BY {_REFRESH_ORDER} LIMIT :limit",
+            {**params, "limit": MAX_REFRESH_PER_RUN},
+        ).fetchall()
+
+    data    = {row["id"]: dict(row) for row in rows}
+    pending = list(data)
+    logger.info(f"Memory: {due}/{total} tweet(s) due for a metrics refresh ({len(pending)} this run).")
+
+    client   = get_client()
+    changed  = {}
+    updated  = 0
+    requests = 0
+    for i in range(0, len(pending), LOOKUP_BATCH_SIZE):
+        batch = pending[i:i + LOOKUP_BATCH_SIZE]
+        if not ratelimit.allow(ratelimit.TWEETS_LOOKUP, "low"):
+            logger.info(f"Memory: lookup budget low — {len(pending) - i} refresh(es) deferred to a later run.")
+            break
+        requests += 1
+        try:
+            response = client.get_tweets(
+                batch,
+                tweet_fields=["public_metrics"],
+                user_auth=True,
+            )
+        except tweepy.TweepyException as e:
+            logger.error(f"Memory: batch lookup failed ({len(batch)} tweets): {e}")
+            continue
+
+        for tweet in response.data or []:
+            entry = data.get(str(tweet.id))
+            if entry:
+                _apply_metrics(entry, tweet.public_metrics or {})
+                changed[entry["id"]] = entry
+                updated += 1
+
+        # Deleted / unavailable tweets come back as errors — park them in the cold
+        # tier so they are only probed weekly instead of every run
+        for err in response.errors or []:
+            entry = data.get(str(err.get("resource_id") or err.get("value") or ""))
+            if entry:
+                entry["fetched_at"] = datetime.now(timezone.utc).isoformat()
+                entry["tier"] = "cold"
+                changed[entry["id"]] = entry
+                logger.warning(f"Memory: tweet {entry['id']} unavailable — {err.get('title', 'error')}")
+
+    with _db() as conn:
+        if changed:
+            _write(conn, list(changed.values()))
+            logger.info(f"Memory: metrics updated for {updated} tweet(s) in {requests} request(s).")
+
+    top = next(iter(get_top_performers(1)), None)
+    if top:
         logger.info(
             f"Memory: top performer — [{top['type']}] "
             f"score={top['score']} | \"{top['text'][:60]}...\""
         )
 
 
-def get_top_performers(n: int = 5) -> list:
-    """Return the n tweets with the highest score. Used by brain.py in Phase 3."""
-    data = _load()
-    return sorted(data.values(), key=lambda e: e["score"], reverse=True)[:n]
+def get_top_performers(n: int = 5, tweet_type: str = None, decay: bool = False) -> list:
+    """
+    Return the n best tweets, overall or for one tweet_type, read from the
+    leaderboard (O(n), no history scan). Used by brain.py meta tweets and the
+    memory report.
+    decay : rank by score halved every DECAY_HALF_LIFE_HOURS (adds "decayed_score").
+            Candidates are the leaderboard plus tweets from the last DECAY_WINDOW_DAYS.
+    """
+    scope = "all" if tweet_type is None else f"type:{tweet_type}"
+    with _db() as conn:
+        if n > LEADERBOARD_SIZE and not decay:
+            where = "" if tweet_type is None else "WHERE type = :type"
+            rows = conn.execute(
+                f"SELECT * FROM tweets {where} ORDER BY score DESC LIMIT :n", {"type": tweet_type, "n": n}
+            ).fetchall()
+            return [dict(row) for row in rows]
+
+        rows = conn.execute(
+            "SELECT t.* FROM leaderboard l JOIN tweets t ON t.id = l.id "
+            "WHERE l.scope = ? ORDER BY l.score DESC LIMIT ?",
+            (scope, LEADERBOARD_SIZE if decay else n),
+        ).fetchall()
+        if decay:
+            since = (datetime.now(timezone.utc) - timedelta(days=DECAY_WINDOW_DAYS)).isoformat()
+            where = "posted_at >= ?" + ("" if tweet_type is None else " AND type = ?")
+            params = (since,) if tweet_type is None else (since, tweet_type)
+            rows += conn.execute(f"SELECT * FROM tweets WHERE {where}", params).fetchall()
+
+    if not decay:
+        return [dict(row) for row in rows]
+
+    candidates = {row["id"]: dict(row) for row in rows}
+    for entry in candidates.values():
+        entry["decayed_score"] = _decayed(entry)
+    return sorted(candidates.values(), key=lambda e: e["decayed_score"], reverse=True)[:n]
+
+
+def get_type_leaders() -> dict:
+    """Return {tweet_type: best tweet} from the per-type leaderboards."""
+    with _db() as conn:
+        rows = conn.execute(
+            "SELECT l.scope, t.* FROM leaderboard l JOIN tweets t ON t.id = l.id "
+            "WHERE l.scope LIKE 'type:%' AND l.score = "
+            "(SELECT MAX(score) FROM leaderboard WHERE scope = l.scope) "
+            "GROUP BY l.scope ORDER BY l.score DESC"
+        ).fetchall()
+    return {row["type"]: {k: row[k] for k in COLUMNS} for row in rows}
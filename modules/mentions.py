@@ -4,14 +4,18 @@ Reads mentions on X, classifies intent, and replies via brain.py
 Also detects correct replies to active Cognitive Bounties.
 """
 
-import os
 import logging
-import anthropic
 import tweepy
-from modules.memory import save_tweet as memory_save
+from concurrent.futures import ThreadPoolExecutor
+from modules.twitter import get_client, get_account
+from modules import ratelimit, outbox, trace
+from modules.brain import get_client as get_brain_client
 
 logger = logging.getLogger("0xeeTerm.mentions")
 
+MENTIONS_PAGE_SIZE  = 100   # API maximum per page
+MENTIONS_MAX_PAGES  = 10    # safety cap per cycle (1000 mentions)
+
 # ─────────────────────────────────────────────
 #  SYSTEM PROMPT — Reply personality
 # ─────────────────────────────────────────────
@@ -40,6 +44,8 @@ REPLY RULES:
 Return ONLY the reply text, or the single word SKIP. Nothing else.
 """
 
+SKIP = "SKIP"   # the brain chose not to reply — as opposed to None, the brain failed
+
 _CACHED_REPLY_SYSTEM = [
     {"type": "text", "text": REPLY_SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}
 ]
@@ -50,9 +56,10 @@ _CACHED_REPLY_SYSTEM = [
 # ─────────────────────────────────────────────
 
 def _classify_and_reply(mention_text: str, status: dict) -> str | None:
-    """Use Claude to classify the mention and generate a reply or SKIP."""
+    """Use Claude to classify the mention and generate a reply.
+    Returns the reply, SKIP if none is warranted, or None if the brain failed."""
     try:
-        client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        client = get_brain_client()
 
         prompt = f"""Incoming mention:
 \"{mention_text}\"
@@ -75,7 +82,7 @@ Write a reply or return SKIP."""
 
         if reply.upper() == "SKIP" or not reply:
             logger.info(f"Brain decided to SKIP mention: \"{mention_text[:50]}...\"")
-            return None
+            return SKIP
 
         logger.info(f"Brain generated reply ({len(reply)} chars)")
         return reply
@@ -94,10 +101,11 @@ _BOUNTY_VALIDATOR_SYSTEM = [
 ]
 
 
-def _check_bounty_answer(reply_text: str, question_text: str) -> bool:
-    """Use Claude to verify if a reply correctly answers the bounty question."""
+def _check_bounty_answer(reply_text: str, question_text: str) -> bool | None:
+    """Use Claude to verify if a reply correctly answers the bounty question.
+    None if the check itself failed — the answer is then checked again later."""
     try:
-        client = anthropic.Anthropic(api_key=os.getenv("ANTHROPIC_API_KEY"))
+        client = get_brain_client()
 
         prompt = f"""Bounty question:
 {question_text}
@@ -121,7 +129,7 @@ Does this reply correctly answer the bounty question? YES or NO."""
 
     except Exception as e:
         logger.error(f"Bounty answer check failed: {e}")
-        return False
+        return None
 
 
 # ─────────────────────────────────────────────
@@ -129,120 +137,189 @@ Does this reply correctly answer the bounty question? YES or NO."""
 # ─────────────────────────────────────────────
 
 def get_client_user_context() -> tweepy.Client:
-    """OAuth 1.0a only — no bearer_token to avoid tweepy prioritizing app context."""
-    return tweepy.Client(
-        consumer_key=os.getenv("X_API_KEY"),
-        consumer_secret=os.getenv("X_API_SECRET"),
-        access_token=os.getenv("X_ACCESS_TOKEN"),
-        access_token_secret=os.getenv("X_ACCESS_SECRET"),
-        wait_on_rate_limit=True,
-    )
+    """OAuth 1.0a only — no bearer_token to avoid tweepy prioritizing app context.
+    Shared with modules.twitter, so the session is reused across the whole cycle."""
+    return get_client()
 
 
-def process_mentions(status: dict, since_id: str = None, bounty_info: dict = None) -> str | None:
+def _fetch_new_mentions(client: tweepy.Client, user_id: str, since_id: str = None) -> tuple[list, dict]:
+    """
+    Walk pagination_token until every mention newer than since_id has been read.
+    Returns (mentions newest-first, {author_id: username}).
+    Without a since_id (first run) only the newest page is read — no history replay.
+    """
+    params = {
+        "max_results": MENTIONS_PAGE_SIZE if since_id else 10,
+        "tweet_fields": ["author_id", "text", "conversation_id"],
+        "expansions": ["author_id"],
+        "user_fields": ["username"],
+        "user_auth": True,
+    }
+    if since_id:
+        params["since_id"] = since_id
+
+    mentions, users = [], {}
+    for page in range(MENTIONS_MAX_PAGES):
+        response = client.get_users_mentions(user_id, **params)
+        mentions.extend(response.data or [])
+        if response.includes and "users" in response.includes:
+            for user in response.includes["users"]:
+                users[str(user.id)] = user.username
+
+        next_token = (response.meta or {}).get("next_token")
+        if not since_id or not next_token:
+            break
+        params["pagination_token"] = next_token
+    else:
+        logger.warning(f"Mentions: stopped after {MENTIONS_MAX_PAGES} pages — older mentions in this window are skipped")
+
+    return mentions, users
+
+
+def process_mentions(
+    status: dict,
+    since_id: str = None,
+    bounty_info: dict = None,
+    checkpoint=None,
+) -> str | None:
     """
     Fetch new mentions, reply to relevant ones via brain.
     If bounty_info is provided ({"tweet_id": ..., "text": ..., "awarded": False}),
     checks for correct bounty replies and sets bounty_info["awarded"] = True on win.
+
+    Mentions are handled oldest first; checkpoint(mention_id) is called once each
+    mention is fully handled, so a crash resumes right after the last one done.
+    A brain failure (not a SKIP) stops the cycle before that mention, so it is
+    picked up again next cycle instead of being checkpointed unanswered.
+    Replies go through the outbox keyed by mention ID — a restart or a failed post
+    reuses the queued text instead of paying for a second LLM call. Likes and
+    replies are sent together at the end of the cycle, in parallel.
     Returns the latest mention ID processed (for state tracking).
     """
     from modules.brain import generate_bounty_winner_tweet
 
+    if not ratelimit.allow(ratelimit.MENTIONS):
+        logger.info("Mentions: read budget exhausted — deferring to next cycle.")
+        return since_id
+
     try:
-        client = get_client_user_context()
-        me = client.get_me(user_auth=True)
-        user_id = me.data.id
-
-        params = {
-            "max_results": 10,
-            "tweet_fields": ["author_id", "text", "conversation_id"],
-            "expansions": ["author_id"],
-            "user_fields": ["username"],
-            "user_auth": True,
-        }
-        if since_id:
-            params["since_id"] = since_id
-
-        mentions = client.get_users_mentions(user_id, **params)
-
-        if not mentions.data:
-            logger.info("No new mentions found.")
+        client  = get_client_user_context()
+        account = get_account()
+        if not account:
             return since_id
+        user_id = account["id"]
 
-        # Build username lookup from expansions
-        users = {}
-        if mentions.includes and "users" in mentions.includes:
-            for user in mentions.includes["users"]:
-                users[str(user.id)] = user.username
-
-        latest_id = str(mentions.data[0].id)
-        logger.info(f"Found {len(mentions.data)} new mention(s)")
+        mentions, users = _fetch_new_mentions(client, user_id, since_id)
+        if not mentions:
+            logger.info("No new mentions found.")
+            return since_id
+    except tweepy.TweepyException as e:
+        logger.error(f"Failed to fetch mentions: {e}")
+        return since_id
 
-        # Active bounty details
-        bounty_tweet_id = str(bounty_info["tweet_id"]) if bounty_info else None
-        bounty_text     = bounty_info.get("text", "") if bounty_info else ""
-        bounty_active   = bounty_info is not None and not bounty_info.get("awarded", True)
+    logger.info(f"Found {len(mentions)} new mention(s)")
+    latest_id = since_id
+    like_ids, send_keys = [], []
 
-        # Process in reverse order (oldest first)
-        for mention in reversed(mentions.data):
-            mention_text = mention.text
-            mention_id   = str(mention.id)
-            author_id    = str(mention.author_id)
+    # Active bounty details
+    bounty_tweet_id = str(bounty_info["tweet_id"]) if bounty_info else None
+    bounty_text     = bounty_info.get("text", "") if bounty_info else ""
+    bounty_active   = bounty_info is not None and not bounty_info.get("awarded", True)
 
-            # Skip our own tweets
-            if author_id == str(user_id):
-                continue
+    # Process in reverse order (oldest first)
+    for mention in reversed(mentions):
+        mention_text = mention.text
+        mention_id   = str(mention.id)
+        author_id    = str(mention.author_id)
 
+        # Skip our own tweets
+        if author_id != str(user_id):
             author_handle = f"@{users.get(author_id, author_id)}"
             conv_id = str(getattr(mention, "conversation_id", ""))
 
+            # Already generated on an earlier run — reuse it, never ask the brain twice
+            reply_key  = f"mention:{mention_id}"
+            winner_key = f"bounty_winner:{mention_id}"
+            is_winner  = outbox.get(winner_key) is not None
+            queued     = is_winner or outbox.get(reply_key) is not None
+
             logger.info(f"Processing mention {mention_id}: \"{mention_text[:60]}...\"")
 
             # ── Bounty reply check ──────────────────────
-            if bounty_active and conv_id == bounty_tweet_id:
+            if not queued and bounty_active and conv_id == bounty_tweet_id:
                 logger.info(f"Bounty reply detected from {author_handle} — verifying...")
-                if _check_bounty_answer(mention_text, bounty_text):
-                    winner_tweet = generate_bounty_winner_tweet(author_handle, bounty_text)
-                    if winner_tweet:
-                        try:
-                            result = client.create_tweet(
-                                text=winner_tweet,
-                                in_reply_to_tweet_id=mention_id,
-                            )
-                            logger.info(f"Bounty winner tweet posted for {author_handle} — ID: {result.data['id']}")
-                            save_tweet_memory = memory_save
-                            save_tweet_memory(result.data["id"], winner_tweet, "bounty_winner")
-                        except tweepy.TweepyException as e:
-                            logger.error(f"Failed to post bounty winner tweet: {e}")
-
+                correct = _check_bounty_answer(mention_text, bounty_text)
+                winner_tweet = generate_bounty_winner_tweet(author_handle, bounty_text) if correct else None
+                if correct is None or (correct and not winner_tweet):
+                    logger.warning(f"Mentions: brain failed on bounty reply {mention_id} — retrying next cycle")
+                    break
+                if correct:
+                    # Awarded only once the announcement is safely queued
+                    outbox.enqueue(winner_key, winner_tweet, tweet_type="bounty_winner", reply_to=mention_id)
+                    is_winner = True
+
+            if is_winner:
+                send_keys.append(winner_key)
+
+                if bounty_info is not None:
                     bounty_info["awarded"] = True
                     bounty_info["winner_handle"] = author_handle
-                    bounty_active = False  # stop checking further replies
-                    logger.info(f"Bounty awarded to {author_handle}")
-                    continue  # skip normal reply for this mention
-
-            # ── Normal mention reply ────────────────────
-            reply_text = _classify_and_reply(mention_text, status)
-
-            if reply_text:
-                try:
-                    client.like(mention_id, user_auth=True)
-                    logger.info(f"Liked mention {mention_id}")
-                except tweepy.TweepyException as e:
-                    logger.warning(f"Could not like mention {mention_id}: {e}")
-
-                try:
-                    result = client.create_tweet(
-                        text=reply_text,
-                        in_reply_to_tweet_id=mention_id,
-                    )
-                    logger.info(f"Replied to mention {mention_id}")
-                    memory_save(result.data["id"], reply_text, "reply")
-                except tweepy.TweepyException as e:
-                    logger.error(f"Failed to reply to {mention_id}: {e}")
-
-        return latest_id
+                bounty_active = False  # stop checking further replies
+                logger.info(f"Bounty awarded to {author_handle}")
+
+            else:
+                # ── Normal mention reply ────────────────────
+                if queued:
+                    logger.info(f"Resuming queued reply for mention {mention_id}")
+                else:
+                    reply_text = _classify_and_reply(mention_text, status)
+                    if reply_text is None:
+                        logger.warning(f"Mentions: brain failed on mention {mention_id} — retrying next cycle")
+                        break
+                    if reply_text != SKIP:
+                        outbox.enqueue(reply_key, reply_text, tweet_type="reply", reply_to=mention_id)
+                        like_ids.append(mention_id)   # liked once, when first queued — not on resume
+                        queued = True
+
+                if queued:
+                    send_keys.append(reply_key)
+
+        # Mention handled (reply safely queued) — move the checkpoint past it
+        latest_id = mention_id
+        if checkpoint:
+            checkpoint(mention_id)
+
+    if send_keys:
+        _dispatch(like_ids, send_keys)
+
+    return latest_id
+
+
+def _dispatch(like_ids: list, send_keys: list):
+    """
+    Likes and queued replies are independent of each other — send them in
+    parallel through the async X layer. Replies the budget defers stay in the
+    outbox and go out on a later drain.
+    """
+    from modules import twitter_async
 
-    except tweepy.TweepyException as e:
-        logger.error(f"Failed to fetch mentions: {e}")
-        return since_id
+    async def _likes():
+        if not like_ids:
+            return []
+        async with twitter_async.open_client() as client:
+            return await twitter_async.gather_bounded([twitter_async.like(client, i) for i in like_ids])
+
+    try:
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            likes   = pool.submit(trace.bind(twitter_async.run), _likes())
+            results = pool.submit(trace.bind(outbox.send_many), send_keys)
+            liked, sent = likes.result(), results.result()
+    except Exception as e:
+        logger.error(f"Mentions: dispatch failed — replies stay queued in the outbox: {e}")
+        return
+
+    posted = sum(1 for r in sent.values() if r)
+    logger.info(
+        f"Mentions: {posted}/{len(send_keys)} reply(ies) posted, "
+        f"{sum(1 for ok in liked if ok is True)}/{len(like_ids)} like(s)"
+    )
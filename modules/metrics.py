@@ -0,0 +1,237 @@
+"""
+0xeeTerm — Metrics Module
+
+Prometheus counters, gauges and histograms for the engine: cycle duration
+and last success per command, external call latency by service and
+endpoint, LLM tokens, X posts, payments detected / served by service,
+DevFund sweeps and their fees, and cache hit rates.
+
+Most series are derived from the trace spans of each cycle (modules.trace
+hands every finished cycle to observe_trace()); the rest are counted where
+they happen — inc("oxeeterm_payments_served_total", service="toll").
+
+Storage : logs/metrics.json — cumulative values shared by every process
+          (timer runs and the daemon), merged under flock at each cycle end
+Expose  : `nexus serve` → GET /metrics (text exposition format 0.0.4)
+          METRICS_TEXTFILE=/var/lib/node_exporter/textfile_collector/0xeeterm.prom
+          → rewritten on every flush, for hosts without a server running
+"""
+
+import os
+import json
+import fcntl
+import atexit
+import logging
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+
+logger = logging.getLogger("0xeeTerm.metrics")
+
+METRICS_DIR      = Path(__file__).parent.parent / "logs"
+METRICS_FILE     = METRICS_DIR / "metrics.json"
+LOCK_FILE        = METRICS_DIR / "metrics.lock"
+METRICS_TEXTFILE = os.getenv("METRICS_TEXTFILE", "")
+
+# Seconds — spans a fast RPC call to a long shill cycle
+BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+
+METRICS = {
+    "oxeeterm_cycles_total":                     ("counter",   "Engine cycles run, by command and result (ok, error)"),
+    "oxeeterm_cycle_duration_seconds":           ("histogram", "Wall time of one engine cycle, by command"),
+    "oxeeterm_cycle_last_run_timestamp_seconds": ("gauge",     "Unix time the last cycle of each command finished"),
+    "oxeeterm_cycle_last_success_timestamp_seconds": ("gauge", "Unix time the last cycle of each command finished without error"),
+    "oxeeterm_external_requests_total":          ("counter",   "External calls by service, endpoint and HTTP status"),
+    "oxeeterm_external_request_duration_seconds": ("histogram", "External call latency by service and endpoint"),
+    "oxeeterm_llm_tokens_total":                 ("counter",   "Anthropic tokens by model and kind (input, output, cache_read)"),
+    "oxeeterm_x_posts_total":                    ("counter",   "Tweets and replies posted to X"),
+    "oxeeterm_payments_detected_total":          ("counter",   "Qualifying payments seen by a scan, by service (once per scan until served)"),
+    "oxeeterm_payments_served_total":            ("counter",   "Payments served and recorded in the ledger, by service"),
+    "oxeeterm_payments_sol_total":               ("counter",   "SOL received for served payments, by service"),
+    "oxeeterm_cache_requests_total":             ("counter",   "Cache lookups by cache and result (hit, miss)"),
+    "oxeeterm_sweeps_total":                     ("counter",   "DevFund sweeps by trigger (income, interval, manual) and status (sent, dry_run, failed)"),
+    "oxeeterm_swept_sol_total":                  ("counter",   "SOL swept to the DevFund"),
+    "oxeeterm_sweep_fees_sol_total":             ("counter",   "Network fees paid for DevFund sweeps, in SOL"),
+}
+
+_lock    = threading.Lock()
+_pending = {"counters": {}, "gauges": {}, "histograms": {}}
+
+
+def _labels(labels: dict) -> str:
+    """Canonical Prometheus label string — also the storage key of a series."""
+    def esc(value) -> str:
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return ",".join(f'{k}="{esc(v)}"' for k, v in sorted(labels.items()))
+
+
+# ─────────────────────────────────────────────
+#  RECORDING
+# ─────────────────────────────────────────────
+
+def inc(name: str, value: float = 1, **labels):
+    """Add to a counter."""
+    with _lock:
+        series = _pending["counters"].setdefault(name, {})
+        key = _labels(labels)
+        series[key] = series.get(key, 0) + value
+
+
+def set_gauge(name: str, value: float, **labels):
+    with _lock:
+        _pending["gauges"].setdefault(name, {})[_labels(labels)] = value
+
+
+def observe(name: str, seconds: float, **labels):
+    """Record one histogram sample."""
+    with _lock:
+        h = _pending["histograms"].setdefault(name, {}).setdefault(
+            _labels(labels), {"buckets": [0] * len(BUCKETS), "sum": 0.0, "count": 0}
+        )
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                h["buckets"][i] += 1
+                break
+        h["sum"]   += seconds
+        h["count"] += 1
+
+
+def cache(name: str, hit: bool):
+    """Count one lookup of a named cache."""
+    inc("oxeeterm_cache_requests_total", cache=name, result="hit" if hit else "miss")
+
+
+def observe_trace(records: list):
+    """
+    Derive cycle, external call, token and post metrics from one finished trace.
+    Flushed when a cycle finishes; a call traced outside any cycle (its own root)
+    waits in memory for the next cycle, or the exit-time flush.
+    """
+    cycle = False
+    for r in records:
+        attrs = r.get("attrs") or {}
+        if r["parent"] is None and attrs.get("kind") == "cycle":
+            result = "error" if r["error"] else "ok"
+            finished = r["start"] + r["ms"] / 1000
+            inc("oxeeterm_cycles_total", cycle=r["name"], result=result)
+            observe("oxeeterm_cycle_duration_seconds", r["ms"] / 1000, cycle=r["name"])
+            set_gauge("oxeeterm_cycle_last_run_timestamp_seconds", round(finished, 3), cycle=r["name"])
+            if result == "ok":
+                set_gauge("oxeeterm_cycle_last_success_timestamp_seconds", round(finished, 3), cycle=r["name"])
+            cycle = True
+            continue
+
+        service, _, endpoint = r["name"].partition(".")
+        status = attrs.get("status") or ("error" if r["error"] else "unknown")
+        inc("oxeeterm_external_requests_total", service=service, endpoint=endpoint, status=status)
+        observe("oxeeterm_external_request_duration_seconds", r["ms"] / 1000, service=service, endpoint=endpoint)
+
+        if service == "x" and endpoint == "POST /2/tweets" and isinstance(status, int) and status < 300:
+            inc("oxeeterm_x_posts_total")
+        if service == "anthropic" and "input_tokens" in attrs:
+            model = attrs.get("model") or "unknown"
+            inc("oxeeterm_llm_tokens_total", attrs["input_tokens"], model=model, kind="input")
+            inc("oxeeterm_llm_tokens_total", attrs.get("output_tokens", 0), model=model, kind="output")
+            inc("oxeeterm_llm_tokens_total", attrs.get("cache_read_tokens", 0), model=model, kind="cache_read")
+            cache("prompt", attrs.get("cache_read_tokens", 0) > 0)
+    if cycle:
+        flush()
+
+
+# ─────────────────────────────────────────────
+#  STORE
+# ─────────────────────────────────────────────
+
+def _load() -> dict:
+    if METRICS_FILE.exists():
+        try:
+            with open(METRICS_FILE) as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Metrics: failed to load store: {e}")
+    return {"counters": {}, "gauges": {}, "histograms": {}}
+
+
+def _write_atomic(path: Path, text: str):
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "w") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+@contextmanager
+def _locked():
+    METRICS_DIR.mkdir(parents=True, exist_ok=True)
+    with open(LOCK_FILE, "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            data = _load()
+            yield data
+            _write_atomic(METRICS_FILE, json.dumps(data, separators=(",", ":")))
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def flush():
+    """Merge pending samples into logs/metrics.json (and the textfile, if configured)."""
+    global _pending
+    with _lock:
+        pending, _pending = _pending, {"counters": {}, "gauges": {}, "histograms": {}}
+    if not any(pending.values()):
+        return
+    try:
+        with _locked() as data:
+            for name, series in pending["counters"].items():
+                stored = data["counters"].setdefault(name, {})
+                for key, value in series.items():
+                    stored[key] = stored.get(key, 0) + value
+            for name, series in pending["gauges"].items():
+                data["gauges"].setdefault(name, {}).update(series)
+            for name, series in pending["histograms"].items():
+                stored = data["histograms"].setdefault(name, {})
+                for key, h in series.items():
+                    into = stored.setdefault(key, {"buckets": [0] * len(BUCKETS), "sum": 0.0, "count": 0})
+                    into["buckets"] = [a + b for a, b in zip(into["buckets"], h["buckets"])]
+                    into["sum"]    += h["sum"]
+                    into["count"]  += h["count"]
+            if METRICS_TEXTFILE:
+                _write_atomic(Path(METRICS_TEXTFILE), render(data))
+    except OSError as e:
+        logger.warning(f"Metrics: flush failed: {e}")
+
+
+atexit.register(flush)
+
+
+# ─────────────────────────────────────────────
+#  EXPOSITION
+# ─────────────────────────────────────────────
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(data: dict = None) -> str:
+    """Text exposition format of the stored metrics (read from disk if data is None)."""
+    data  = data if data is not None else _load()
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        store  = {"counter": "counters", "gauge": "gauges", "histogram": "histograms"}[kind]
+        series = data.get(store, {}).get(name)
+        if not series:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for key, value in sorted(series.items()):
+            if kind != "histogram":
+                lines.append(f"{name}{{{key}}} {_number(value)}" if key else f"{name} {_number(value)}")
+                continue
+            sep, cumulative = ("," if key else ""), 0
+            for bound, count in zip(BUCKETS, value["buckets"]):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{key}{sep}le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{key}{sep}le="+Inf"}} {value["count"]}')
+            braces = f"{{{key}}}" if key else ""
+            lines.append(f"{name}_sum{braces} {round(value['sum'], 6)}")
+            lines.append(f"{name}_count{braces} {value['count']}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,66 @@
+"""
+0xeeTerm — Net Module
+
+Process-wide requests.Session for the plain HTTP calls (Solana JSON-RPC,
+CoinGecko). A one-shot CLI run makes a handful of calls to the
+same two or three hosts, and the daemon makes them every few minutes —
+a pooled session keeps those TLS connections alive instead of paying a
+fresh handshake per call.
+
+Every request runs in a trace span: "rpc.<method>" for JSON-RPC bodies,
+"coingecko.<path>" for CoinGecko, "http.<host>" otherwise — with the
+endpoint (query string dropped, so API keys stay out of the trace),
+HTTP method, status and response size.
+
+Usage: net.post(url, json=..., timeout=...) / net.get(url, params=..., timeout=...)
+       — same signature and return value as requests.post / requests.get.
+"""
+
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from modules import trace
+
+POOL_CONNECTIONS = 8    # distinct hosts kept
+POOL_MAXSIZE     = 16   # connections per host (daemon loops + worker threads)
+
+
+def _span_name(url: str, body) -> str:
+    if isinstance(body, dict) and "method" in body:
+        return f"rpc.{body['method']}"
+    if isinstance(body, list):
+        return "rpc.batch"
+    parts = urlsplit(url)
+    if "coingecko" in url:
+        return "coingecko." + "/".join(parts.path.strip("/").split("/")[-2:])
+    return f"http.{parts.hostname}"
+
+
+class _TracedSession(requests.Session):
+    def request(self, method, url, *args, **kwargs):
+        parts = urlsplit(url)
+        with trace.span(
+            _span_name(url, kwargs.get("json")),
+            endpoint=f"{parts.scheme}://{parts.netloc.rpartition('@')[2]}{parts.path}",
+            method=method.upper(),
+        ) as attrs:
+            response = super().request(method, url, *args, **kwargs)
+            attrs["status"] = response.status_code
+            attrs["bytes"]  = len(response.content)
+            return response
+
+
+session = _TracedSession()
+_adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+session.mount("https://", _adapter)
+session.mount("http://", _adapter)
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    return session.get(url, **kwargs)
+
+
+def post(url: str, **kwargs) -> requests.Response:
+    return session.post(url, **kwargs)
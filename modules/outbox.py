@@ -0,0 +1,478 @@
+"""
+0xeeTerm — Outbox Module
+
+Durable queue between generation and posting. Every generated tweet or
+reply is enqueued under an idempotency key (e.g. "<tx_sig>:toll",
+"mention:<id>") before it is sent, so an X failure after a successful
+LLM call never costs a second generation, and a key that was already
+posted is never posted twice.
+
+Storage : logs/outbox.json (flock-guarded, shared by all timer processes)
+Entry   : { key, text, tweet_type, reply_to, fallback, priority, after,
+            meta, status, attempts, next_attempt_at, last_error,
+            tweet_id, posted_text, created_at, sent_at }
+Status  : pending → sending → sent  (or failed after OUTBOX_MAX_ATTEMPTS;
+          a failure fails the entries queued "after" it too)
+          sending → check, when a claim goes stale (the sender died mid-send):
+          settled by drain() against our recent tweets — sent if the tweet is
+          there, pending again if not — never re-sent blindly
+Prune   : sent entries shrink to a tombstone (key, status, tweet_type, tweet_id,
+          sent_at) after RETENTION_DAYS["sent"] and are kept TOMBSTONE_DAYS,
+          so a replayed key still resolves to its tweet instead of posting again
+"""
+
+import os
+import re
+import html
+import json
+import fcntl
+import logging
+import tweepy
+from pathlib import Path
+from contextlib import contextmanager
+from datetime import datetime, timezone, timedelta
+from modules import ratelimit, metrics
+
+logger = logging.getLogger("0xeeTerm.outbox")
+
+# ─────────────────────────────────────────────
+#  CONFIG
+# ─────────────────────────────────────────────
+
+OUTBOX_DIR  = Path(__file__).parent.parent / "logs"
+OUTBOX_FILE = OUTBOX_DIR / "outbox.json"
+LOCK_FILE   = OUTBOX_DIR / "outbox.lock"
+
+OUTBOX_MAX_ATTEMPTS   = 8
+BACKOFF_BASE_SECONDS  = 60            # 1 min, 2 min, 4 min ... capped below
+BACKOFF_MAX_SECONDS   = 6 * 3600
+SENDING_STALE_MINUTES = 10            # a claim older than this is assumed crashed
+RETENTION_DAYS        = {"sent": 7, "failed": 30}
+TOMBSTONE_DAYS        = 365
+TOMBSTONE_FIELDS      = ("key", "status", "tweet_type", "tweet_id", "sent_at")
+
+
+# ─────────────────────────────────────────────
+#  INTERNAL HELPERS
+# ─────────────────────────────────────────────
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _load() -> dict:
+    if OUTBOX_FILE.exists():
+        try:
+            with open(OUTBOX_FILE) as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Outbox: failed to load queue: {e}")
+    return {}
+
+
+def _save(data: dict):
+    tmp = OUTBOX_FILE.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, OUTBOX_FILE)
+
+
+@contextmanager
+def _locked():
+    """Exclusive read-modify-write of the queue across processes."""
+    OUTBOX_DIR.mkdir(parents=True, exist_ok=True)
+    with open(LOCK_FILE, "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            data = _load()
+            yield data
+            _save(data)
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def _result(entry: dict) -> dict:
+    """Result of an entry sent earlier — "cached" tells it apart from a post made by this call."""
+    return {"id": entry["tweet_id"], "text": entry.get("posted_text"), "cached": True}
+
+
+def _is_due(entry: dict, data: dict) -> bool:
+    """Pending, past its backoff and not waiting on its "after" entry."""
+    now = _now()
+    if entry["status"] != "pending":
+        return False
+    if entry.get("next_attempt_at") and datetime.fromisoformat(entry["next_attempt_at"]) > now:
+        return False
+    after = entry.get("after")
+    if after and data.get(after, {}).get("status") != "sent":
+        return False
+    return True
+
+
+def _standalone(text: str, tweet_id: str) -> str:
+    """Reply blocked (403: bot not engaged by the author) — embed the target URL instead."""
+    tweet_url = f"https://x.com/i/status/{tweet_id}"
+    max_body  = 280 - len(tweet_url) - 2
+    return f"{text[:max_body].rstrip()}\n\n{tweet_url}"
+
+
+def _post(entry: dict) -> dict | None:
+    """Send one entry to X. Returns {"id", "text"}, or None if the rate-limit budget defers it.
+    Raises tweepy.TweepyException on API failure."""
+    from modules.twitter import get_client, _fit_text
+
+    if not ratelimit.allow(ratelimit.TWEETS_POST, entry.get("priority", "normal")):
+        return None
+
+    client = get_client()
+    text   = _fit_text(entry["text"])
+    if entry.get("reply_to"):
+        try:
+            response = client.create_tweet(text=text, in_reply_to_tweet_id=entry["reply_to"])
+            return {"id": str(response.data["id"]), "text": text}
+        except tweepy.Forbidden:
+            if not entry.get("fallback"):
+                raise
+            logger.warning(f"Outbox: reply blocked for {entry['key']} — posting standalone")
+            text = _standalone(entry["text"], entry["reply_to"])
+
+    response = client.create_tweet(text=text)
+    return {"id": str(response.data["id"]), "text": text}
+
+
+async def _post_async(client, entry: dict) -> dict | None:
+    """Async twin of _post() for parallel sends through modules.twitter_async."""
+    from modules.twitter import _fit_text
+    from modules.twitter_async import create_tweet
+
+    if not ratelimit.allow(ratelimit.TWEETS_POST, entry.get("priority", "normal")):
+        return None
+
+    text = _fit_text(entry["text"])
+    if entry.get("reply_to"):
+        try:
+            return await create_tweet(client, text, in_reply_to_tweet_id=entry["reply_to"])
+        except tweepy.Forbidden:
+            if not entry.get("fallback"):
+                raise
+            logger.warning(f"Outbox: reply blocked for {entry['key']} — posting standalone")
+            text = _standalone(entry["text"], entry["reply_to"])
+
+    return await create_tweet(client, text)
+
+
+def _comparable(text: str) -> str:
+    """
+    Tweet text as X returns it, minus what X rewrites: links (→ t.co), HTML
+    entities and the leading "@handle " mentions X puts in front of a reply.
+    """
+    text = re.sub(r"^(?:@\w+\s+)+", "", html.unescape(text or "").lstrip())
+    return " ".join(re.sub(r"https?://\S+", "", text).split())[:100]
+
+
+def _find_posted(job: dict, recent: list) -> dict | None:
+    """Our recent tweet matching an interrupted send: same text, and for a reply the same
+    target — or no target at all, the standalone fallback for a blocked reply."""
+    text = _comparable(job["text"])
+    for tweet in recent:
+        if _comparable(tweet["text"]) != text:
+            continue
+        if not job.get("reply_to") or tweet.get("reply_to") in (job["reply_to"], None):
+            return tweet
+    return None
+
+
+def _reconcile():
+    """
+    Settle claims whose sender died mid-send. The tweet may or may not have
+    gone out, so it is looked up on our timeline instead of being re-sent:
+    found → sent, not found → pending again (after / backoff apply as usual).
+    If the timeline cannot be read, the entries stay in "check" until it can.
+    """
+    from modules.twitter import get_recent_tweets, _fit_text
+
+    now   = _now()
+    stale = timedelta(minutes=SENDING_STALE_MINUTES)
+    with _locked() as data:
+        for entry in data.values():
+            if entry["status"] == "sending" and now - datetime.fromisoformat(entry["claimed_at"]) >= stale:
+                entry["status"] = "check"
+        checking = [dict(e) for e in data.values() if e["status"] == "check"]
+    if not checking:
+        return
+
+    recent = get_recent_tweets()
+    if recent is None:
+        logger.warning(f"Outbox: {len(checking)} interrupted send(s) left unchecked — timeline unavailable")
+        return
+
+    found = []
+    with _locked() as data:
+        for job in checking:
+            entry = data.get(job["key"])
+            if not entry or entry["status"] != "check":
+                continue
+            match = _find_posted({**job, "text": _fit_text(job["text"])}, recent)
+            if match:
+                entry.update(status="sent", tweet_id=match["id"], posted_text=match["text"],
+                             sent_at=now.isoformat(), last_error=None)
+                found.append((job, match))
+            else:
+                entry["status"] = "pending"
+                logger.warning(f"Outbox: interrupted send of {job['key']} not found on the timeline — will resend")
+    for job, match in found:
+        logger.info(f"Outbox: interrupted send of {job['key']} had gone out — ID: {match['id']}")
+        if job.get("tweet_type"):
+            from modules.memory import save_tweet as memory_save
+            memory_save(match["id"], match["text"], job["tweet_type"])
+
+
+def _fail_dependents(data: dict, key: str):
+    """Entries queued "after" a failed one can never be due — fail them too (and theirs)."""
+    for entry in data.values():
+        if entry.get("after") == key and entry["status"] == "pending":
+            entry.update(status="failed", last_error=f"dependency {key} failed")
+            logger.error(f"Outbox: gave up on {entry['key']} — dependency {key} failed")
+            _fail_dependents(data, entry["key"])
+
+
+def _claim(key: str) -> tuple[str, dict | None]:
+    """Mark a due entry as sending. Returns ("sent", result), ("claimed", job) or ("skip", None)."""
+    with _locked() as data:
+        entry = data.get(key)
+        if not entry:
+            return "skip", None
+        if entry["status"] == "sent":
+            return "sent", _result(entry)
+        if not _is_due(entry, data):
+            return "skip", None
+        entry["status"]     = "sending"
+        entry["claimed_at"] = _now().isoformat()
+        return "claimed", dict(entry)
+
+
+def _finish(key: str, job: dict, result: dict | None, error: str | None) -> dict | None:
+    """Record the outcome of a send attempt (sent / deferred / backoff / failed)."""
+    with _locked() as data:
+        entry = data.get(key, job)
+        data[key] = entry
+        if result:
+            entry.update(status="sent", tweet_id=result["id"], posted_text=result["text"],
+                         sent_at=_now().isoformat(), last_error=None)
+        elif error is None:
+            entry["status"] = "pending"   # deferred by rate limit — no attempt spent
+        else:
+            entry["attempts"]  += 1
+            entry["last_error"] = error
+            if entry["attempts"] >= OUTBOX_MAX_ATTEMPTS:
+                entry["status"] = "failed"
+                _fail_dependents(data, key)
+            else:
+                delay = min(BACKOFF_BASE_SECONDS * 2 ** (entry["attempts"] - 1), BACKOFF_MAX_SECONDS)
+                entry["status"] = "pending"
+                entry["next_attempt_at"] = (_now() + timedelta(seconds=delay)).isoformat()
+
+    if result:
+        logger.info(f"Outbox: sent {key} — ID: {result['id']}")
+        if job.get("tweet_type"):
+            from modules.memory import save_tweet as memory_save
+            memory_save(result["id"], result["text"], job["tweet_type"])
+    elif error:
+        state = "gave up" if entry["status"] == "failed" else f"retry {entry['attempts']}/{OUTBOX_MAX_ATTEMPTS}"
+        logger.error(f"Outbox: failed to send {key} ({state}): {error}")
+    return result
+
+
+def _prune(data: dict):
+    now = _now()
+    for key in list(data):
+        if data[key]["status"] == "failed":
+            _fail_dependents(data, key)   # entries queued before dependency failures cascaded
+    for key in list(data):
+        entry = data[key]
+        stamp = entry.get("sent_at") or entry.get("created_at")
+        age   = now - datetime.fromisoformat(stamp) if stamp else timedelta(0)
+        if entry.get("tombstone"):
+            if age > timedelta(days=TOMBSTONE_DAYS):
+                del data[key]
+        elif entry["status"] == "sent":
+            if age > timedelta(days=RETENTION_DAYS["sent"]):
+                data[key] = {**{f: entry.get(f) for f in TOMBSTONE_FIELDS}, "tombstone": True}
+        elif entry["status"] in RETENTION_DAYS and age > timedelta(days=RETENTION_DAYS[entry["status"]]):
+            del data[key]
+
+
+# ─────────────────────────────────────────────
+#  PUBLIC API
+# ─────────────────────────────────────────────
+
+def get(key: str) -> dict | None:
+    """Return the queued entry for a key, or None if it was never enqueued."""
+    return _load().get(key)
+
+
+def requeue(key: str) -> bool:
+    """
+    Give a failed entry a fresh attempt budget, due now — and the entries that
+    failed with it as its dependents. Returns False unless it had failed.
+    """
+    with _locked() as data:
+        entry = data.get(key)
+        if not entry or entry["status"] != "failed":
+            return False
+        todo = [entry]
+        while todo:
+            entry = todo.pop()
+            entry.update(status="pending", attempts=0, next_attempt_at=None)
+            todo += [e for e in data.values()
+                     if e.get("after") == entry["key"] and e["status"] == "failed"
+                     and e.get("last_error") == f"dependency {entry['key']} failed"]
+    logger.info(f"Outbox: requeued {key}")
+    return True
+
+
+def enqueue(
+    key: str,
+    text: str,
+    tweet_type: str = None,
+    reply_to: str = None,
+    fallback: bool = False,
+    priority: str = "normal",
+    after: str = None,
+    meta: dict = None,
+) -> dict:
+    """
+    Queue a tweet (or a reply if reply_to is set) under an idempotency key.
+    Re-enqueueing an existing key is a no-op and returns the existing entry.
+    tweet_type : memory type recorded on success (None = not recorded)
+    fallback   : post standalone with the target URL if the reply is blocked
+    after      : key that must be sent before this one (ordering)
+    """
+    with _locked() as data:
+        if key in data:
+            return data[key]
+        entry = {
+            "key":             key,
+            "text":            text,
+            "tweet_type":      tweet_type,
+            "reply_to":        str(reply_to) if reply_to else None,
+            "fallback":        fallback,
+            "priority":        priority,
+            "after":           after,
+            "meta":            meta or {},
+            "status":          "pending",
+            "attempts":        0,
+            "next_attempt_at": None,
+            "last_error":      None,
+            "tweet_id":        None,
+            "posted_text":     None,
+            "created_at":      _now().isoformat(),
+            "sent_at":         None,
+        }
+        data[key] = entry
+    logger.info(f"Outbox: queued {key} ({len(text)} chars)")
+    return entry
+
+
+def send(key: str) -> dict | None:
+    """
+    Try to post a queued entry now. Returns {"id", "text"} once it is sent —
+    including when it was already sent earlier, then with "cached": True —
+    else None (pending / failed).
+    """
+    status, job = _claim(key)
+    if status != "claimed":
+        return job
+
+    error = None
+    try:
+        result = _post(job)
+    except tweepy.TweepyException as e:
+        result, error = None, str(e)
+    except Exception as e:
+        result, error = None, repr(e)
+    return _finish(key, job, result, error)
+
+
+def send_many(keys: list) -> dict:
+    """
+    Send several queued entries in parallel (bounded, see modules.twitter_async).
+    Returns {key: {"id", "text"} or None}. Entries waiting on an "after"
+    dependency are skipped here and go out on a later send or drain.
+    """
+    from modules import twitter_async
+
+    results, jobs = {}, []
+    for key in keys:
+        status, job = _claim(key)
+        if status == "claimed":
+            jobs.append(job)
+        else:
+            results[key] = job
+    if not jobs:
+        return results
+
+    async def _batch():
+        async with twitter_async.open_client() as client:
+            return await twitter_async.gather_bounded([_post_async(client, job) for job in jobs])
+
+    outcomes = twitter_async.run(_batch())
+    for job, outcome in zip(jobs, outcomes):
+        if isinstance(outcome, tweepy.TweepyException):
+            results[job["key"]] = _finish(job["key"], job, None, str(outcome))
+        elif isinstance(outcome, BaseException):
+            results[job["key"]] = _finish(job["key"], job, None, repr(outcome))
+        else:
+            results[job["key"]] = _finish(job["key"], job, outcome, None)
+    return results
+
+
+def prepare(key: str, generate, **kwargs) -> bool:
+    """
+    Generate-once half of submit(): if the key is unknown, generate() is called
+    for the text and the result is enqueued with **kwargs. Returns False only
+    if generate() returned nothing.
+    """
+    cached = get(key) is not None
+    metrics.cache("outbox", cached)
+    if not cached:
+        text = generate()
+        if not text:
+            return False
+        enqueue(key, text, **kwargs)
+    return True
+
+
+def submit(key: str, generate, **kwargs) -> dict | None:
+    """
+    Generate-once-then-send: prepare(), then send the entry if due.
+    Returns {"id", "text"} once posted, else None (also when generate() gave nothing).
+    """
+    if not prepare(key, generate, **kwargs):
+        return None
+    return send(key)
+
+
+def drain() -> int:
+    """Send every due pending entry in parallel. Returns the number sent.
+    Entries unblocked by an "after" dependency are sent in a follow-up pass."""
+    with _locked() as data:
+        _prune(data)
+    _reconcile()
+
+    sent, attempted = 0, set()
+    for _ in range(3):
+        with _locked() as data:
+            due = sorted(
+                (e for e in data.values() if e["key"] not in attempted and _is_due(e, data)),
+                key=lambda e: e["created_at"],
+            )
+        if not due:
+            break
+        keys = [e["key"] for e in due]
+        attempted.update(keys)
+        sent += sum(1 for result in send_many(keys).values() if result)
+
+    if attempted:
+        logger.info(f"Outbox: drained {sent}/{len(attempted)} due entr{'y' if len(attempted) == 1 else 'ies'}")
+    return sent
@@ -9,14 +9,15 @@ Min payment : 0.015 SOL
 """
 
 import os
+import time
 import logging
-import requests
 from datetime import datetime, timezone
+from modules import net
 
 logger = logging.getLogger("0xeeTerm.persona")
 
 LAMPORTS_PER_SOL = 1_000_000_000
-_PUBLIC_RPC = "https://api.mainnet-beta.solana.com"
+_PUBLIC_RPC = os.getenv("SOLANA_PUBLIC_RPC", "https://api.mainnet-beta.solana.com")
 _TOKEN_PROGRAM = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
 
 
@@ -29,7 +30,7 @@ def _helius_url() -> str:
 
 def _rpc(url: str, payload: dict) -> dict:
     try:
-        r = requests.post(url, json=payload, timeout=12)
+        r = net.post(url, json=payload, timeout=12)
         return r.json()
     except Exception as e:
         logger.error(f"Persona: RPC error: {e}")
@@ -146,51 +147,71 @@ def _classify(metrics: dict) -> str:
     return "ACTIVE"
 
 
-def process_persona(handle: str, wallet: str, sol_received: float, sol_price: float) -> dict | None:
+def process_persona(
+    handle: str,
+    wallet: str,
+    sol_received: float,
+    sol_price: float,
+    key: str = None,
+) -> dict | None:
     """
     Handle a PERSONA service request end-to-end:
     1. Fetch rich on-chain data via Helius
     2. Calculate behavioral metrics + personality label
     3. Generate tweet via brain
     4. Post public tweet
+    The tweet goes through the outbox under key, so a retry reuses the queued
+    text (and its label) instead of re-profiling the wallet.
     Returns {"result": ..., "metrics": ..., "label": ...} or None on failure.
     """
     from modules.brain import generate_persona_tweet
-    from modules.twitter import post_tweet
+    from modules import outbox
 
     usd = round(sol_received * sol_price, 2)
     short_w = wallet[:8] + "..." if len(wallet) > 8 else wallet
+    key = key or f"manual:{wallet}:{int(time.time())}:persona"
 
-    logger.info(f"Persona: fetching metrics for {wallet[:16]}...")
-    metrics = _fetch_metrics(wallet)
-    label = _classify(metrics)
-    logger.info(
-        f"Persona: {short_w} — label={label} bal={metrics['balance_sol']:.4f} "
-        f"txs={metrics['tx_count']} tokens={metrics['token_count']}"
-    )
-
-    body = generate_persona_tweet(handle, metrics, label)
-    if not body:
-        logger.error(f"Persona: brain failed to generate body for {handle}")
-        return None
-
-    # Split label (first line) from analysis (rest) so we can inline the label
-    lines = body.strip().splitlines()
-    inline_label = lines[0].strip() if lines else label
-    analysis = "\n".join(lines[1:]).strip() if len(lines) > 1 else ""
-
-    tweet_text = (
-        f"WALLET PERSONA // {handle} — {inline_label}\n\n"
-        f"{analysis}\n\n"
-        f"Treasury: +{sol_received:.3f} SOL\n"
-        f"$0xEE — ai.0xee.li"
-    )
-
-    result = post_tweet(tweet_text)
+    queued = outbox.get(key)
+    if queued:
+        metrics = queued.get("meta", {}).get("metrics", {})   # pruned to a tombstone → already sent
+        label   = queued.get("meta", {}).get("label", "")
+        logger.info(f"Persona: resuming queued tweet for {handle} — label={label}")
+    else:
+        logger.info(f"Persona: fetching metrics for {wallet[:16]}...")
+        metrics = _fetch_metrics(wallet)
+        label = _classify(metrics)
+        logger.info(
+            f"Persona: {short_w} — label={label} bal={metrics['balance_sol']:.4f} "
+            f"txs={metrics['tx_count']} tokens={metrics['token_count']}"
+        )
+
+        body = generate_persona_tweet(handle, metrics, label)
+        if not body:
+            logger.error(f"Persona: brain failed to generate body for {handle}")
+            return None
+
+        # Split label (first line) from analysis (rest) so we can inline the label
+        lines = body.strip().splitlines()
+        inline_label = lines[0].strip() if lines else label
+        analysis = "\n".join(lines[1:]).strip() if len(lines) > 1 else ""
+
+        tweet_text = (
+            f"WALLET PERSONA // {handle} — {inline_label}\n\n"
+            f"{analysis}\n\n"
+            f"Treasury: +{sol_received:.3f} SOL\n"
+            f"$0xEE — ai.0xee.li"
+        )
+        outbox.enqueue(
+            key, tweet_text,
+            priority="paid" if sol_received > 0 else "normal",
+            meta={"label": label, "metrics": metrics},
+        )
+
+    result = outbox.send(key)
     if result:
         logger.info(f"Persona: tweet posted — ID: {result['id']}")
     else:
-        logger.error(f"Persona: post failed for {handle}")
+        logger.error(f"Persona: post pending for {handle} — queued in outbox")
         return None
 
     return {"result": result, "metrics": metrics, "label": label}
@@ -0,0 +1,99 @@
+"""
+0xeeTerm — Pipeline Module
+
+Staged worker pipeline for per-item work that is mostly waiting on
+external services (RPC, X, Anthropic). Each stage has its own thread pool
+and a bounded input queue, so a slow item only occupies one worker of one
+stage while the others keep flowing, and a burst never queues more than
+QUEUE_SIZE items in front of any stage.
+
+Jobs are plain objects with an `outcome` attribute: None while in flight.
+A stage that sets it (skip, done, retry...) short-circuits the job — later
+stages pass it through untouched. An exception inside a stage sets
+outcome "error" and job.error; reporting it is up to the caller.
+
+run() yields finished jobs strictly in submission order — the caller acks
+them one by one (ledger, dedupe index) as if they had been served
+sequentially, whatever order they completed in.
+
+Worker threads inherit the caller's trace context (modules.trace).
+"""
+
+import queue
+import logging
+import threading
+from modules import trace
+
+logger = logging.getLogger("0xeeTerm.pipeline")
+
+QUEUE_SIZE = 8
+
+_STOP = object()
+
+
+class Stage:
+    def __init__(self, name: str, fn, workers: int = 1):
+        self.name    = name
+        self.fn      = fn
+        self.workers = max(1, workers)
+
+
+def _worker(stage: Stage, inbox: queue.Queue, forward: queue.Queue, remaining: list, lock: threading.Lock, next_workers: int):
+    while (item := inbox.get()) is not _STOP:
+        index, job = item
+        if job.outcome is None:
+            try:
+                stage.fn(job)
+            except Exception as e:
+                logger.debug(f"Pipeline: stage {stage.name} failed on {job!r}: {e}")
+                job.outcome, job.error = "error", e
+        forward.put((index, job))
+    # Last worker of this stage out → stop the next stage's workers
+    with lock:
+        remaining[0] -= 1
+        last = remaining[0] == 0
+    if last:
+        for _ in range(next_workers):
+            forward.put(_STOP)
+
+
+def run(stages: list, jobs: list, queue_size: int = QUEUE_SIZE):
+    """Push jobs through the stages; yield each finished job in submission order."""
+    queues = [queue.Queue(maxsize=queue_size) for _ in stages] + [queue.Queue()]
+    threads = []
+    for i, stage in enumerate(stages):
+        remaining    = [stage.workers]
+        lock         = threading.Lock()
+        next_workers = stages[i + 1].workers if i + 1 < len(stages) else 1
+        for n in range(stage.workers):
+            t = threading.Thread(
+                target=trace.bind(_worker),
+                args=(stage, queues[i], queues[i + 1], remaining, lock, next_workers),
+                name=f"pipeline-{stage.name}-{n}", daemon=True,
+            )
+            t.start()
+            threads.append(t)
+
+    def feed():
+        for index, job in enumerate(jobs):
+            queues[0].put((index, job))   # blocks while the first stage is full
+        for _ in range(stages[0].workers):
+            queues[0].put(_STOP)
+
+    feeder = threading.Thread(target=feed, name="pipeline-feed", daemon=True)
+    feeder.start()
+
+    done, held, expected = queues[-1], {}, 0
+    while expected < len(jobs):
+        item = done.get()
+        if item is _STOP:
+            break
+        index, job = item
+        held[index] = job
+        while expected in held:
+            yield held.pop(expected)
+            expected += 1
+
+    feeder.join()
+    for t in threads:
+        t.join()
@@ -0,0 +1,98 @@
+"""
+0xeeTerm — Publish Module
+
+Change-aware writer for the static JSON documents read by the frontend
+(public.json). The content is hashed without its "updated_at" stamp; when
+the hash matches the last published one the write is skipped entirely.
+Otherwise the document is written atomically as compact JSON, with
+precompressed siblings and an ETag file:
+
+  public.json        compact JSON (tmp file + rename)
+  public.json.gz     gzip -9, mtime 0 (byte-stable for identical content)
+  public.json.br     brotli, only if the optional `brotli` package is installed
+  public.json.etag   "<content hash>" — served as ETag, lets the web tier answer 304
+
+The same ETag doubles as a shard version in the public.json manifest.
+
+Web servers can serve the siblings directly (nginx gzip_static / brotli_static);
+`nexus serve` does the same for local testing.
+"""
+
+import os
+import gzip
+import json
+import hashlib
+import logging
+import threading
+from pathlib import Path
+
+from modules import metrics
+
+try:
+    import brotli
+except ImportError:   # optional — .br siblings are skipped without it
+    brotli = None
+
+logger = logging.getLogger("0xeeTerm.publish")
+
+VOLATILE_KEYS = ("updated_at",)   # excluded from the content hash
+
+# Daemon loops publish from several threads — they share the .tmp names below
+_lock = threading.Lock()
+
+
+def _encode(data: dict) -> bytes:
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def content_etag(data: dict) -> str:
+    """Strong ETag over the document minus its volatile stamps."""
+    stable = {k: v for k, v in data.items() if k not in VOLATILE_KEYS}
+    digest = hashlib.sha256(json.dumps(stable, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def _write_atomic(path: Path, payload: bytes):
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(payload)
+    os.replace(tmp, path)
+
+
+def published_etag(path: Path) -> str | None:
+    """ETag of the currently published copy, or None if it was never published."""
+    path = Path(path)
+    etag_file = path.with_name(path.name + ".etag")
+    if not path.exists() or not etag_file.exists():
+        return None
+    try:
+        return etag_file.read_text().strip()
+    except OSError:
+        return None
+
+
+def publish(path: Path, data: dict) -> bool:
+    """
+    Publish a JSON document and its .gz/.br/.etag siblings if its content changed.
+    Returns True if files were written, False if the published copy is current.
+    """
+    path = Path(path)
+    etag = content_etag(data)
+    with _lock:
+        if published_etag(path) == etag:
+            metrics.cache("publish", True)
+            return False
+        metrics.cache("publish", False)
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = _encode(data)
+        # Siblings first, ETag last — a reader never pairs a new ETag with an old body
+        _write_atomic(path, payload)
+        _write_atomic(path.with_name(path.name + ".gz"), gzip.compress(payload, compresslevel=9, mtime=0))
+        if brotli is not None:
+            _write_atomic(path.with_name(path.name + ".br"), brotli.compress(payload))
+        else:
+            path.with_name(path.name + ".br").unlink(missing_ok=True)   # never serve a stale .br
+        _write_atomic(path.with_name(path.name + ".etag"), etag.encode())
+    logger.debug(f"Publish: {path.name} written ({len(payload)} bytes, etag {etag})")
+    return True
@@ -0,0 +1,159 @@
+"""
+0xeeTerm — Rate Limit Module
+
+Shared X API budget tracker. The x-rate-limit-* headers of every response
+are recorded per endpoint in logs/ratelimits.json, so the heartbeat,
+mentions and shill processes all see the same budget. Callers check
+allow() before a call and skip or defer work, instead of letting tweepy
+sleep through a 15-minute window inside a systemd oneshot. An allowed call
+reserves one unit of the window under the lock, so concurrent callers
+cannot all pass on the same count; the response headers then settle it.
+
+Priorities:
+  paid   : paid-service posts — may spend the reserved headroom
+  normal : heartbeats, mention replies, reads
+  low    : likes, metrics refresh — deferred while the window is tight
+
+Env vars: X_PAID_RESERVE (calls kept back for paid posts, default 5)
+"""
+
+import os
+import re
+import json
+import time
+import fcntl
+import logging
+from pathlib import Path
+from contextlib import contextmanager
+
+logger = logging.getLogger("0xeeTerm.ratelimit")
+
+RATELIMIT_FILE = Path(__file__).parent.parent / "logs" / "ratelimits.json"
+LOCK_FILE      = RATELIMIT_FILE.with_name("ratelimits.lock")
+
+# Endpoint keys — "<METHOD> <route>" with numeric path segments folded to :id
+TWEETS_POST   = "POST /2/tweets"
+TWEETS_LOOKUP = "GET /2/tweets"
+TWEET_GET     = "GET /2/tweets/:id"
+MENTIONS      = "GET /2/users/:id/mentions"
+LIKES         = "POST /2/users/:id/likes"
+
+PAID_RESERVE = int(os.getenv("X_PAID_RESERVE", "5"))
+LOW_FRACTION = 0.25   # low-priority work needs at least 25% of the window left
+
+
+def endpoint_key(method: str, route: str) -> str:
+    """Normalize a request into its rate-limit bucket: GET /2/users/123/mentions → GET /2/users/:id/mentions."""
+    return f"{method.upper()} " + re.sub(r"/\d{3,}(?=/|$)", "/:id", route)
+
+
+# ─────────────────────────────────────────────
+#  STORE
+# ─────────────────────────────────────────────
+
+def _load() -> dict:
+    if RATELIMIT_FILE.exists():
+        try:
+            with open(RATELIMIT_FILE) as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"RateLimit: failed to load budget store: {e}")
+    return {}
+
+
+def _save(data: dict):
+    tmp = RATELIMIT_FILE.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp, RATELIMIT_FILE)
+
+
+@contextmanager
+def _locked():
+    """Exclusive read-modify-write of the budget store — pipeline workers, async
+    sends and the other timer processes record headers concurrently."""
+    RATELIMIT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with open(LOCK_FILE, "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            data = _load()
+            yield data
+            _save(data)
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def record(endpoint: str, headers) -> None:
+    """Store the x-rate-limit-* headers of a response for this endpoint."""
+    if not headers or "x-rate-limit-remaining" not in headers:
+        return
+    try:
+        entry = {
+            "limit":     int(headers.get("x-rate-limit-limit", 0)),
+            "remaining": int(headers["x-rate-limit-remaining"]),
+            "reset":     int(headers.get("x-rate-limit-reset", 0)),
+            "seen_at":   int(time.time()),
+        }
+    except (TypeError, ValueError):
+        return
+    try:
+        with _locked() as data:
+            current = data.get(endpoint)
+            # Responses of one window can land out of order — keep the lowest count seen
+            if current and current.get("reset") == entry["reset"] and current["remaining"] < entry["remaining"]:
+                entry["remaining"] = current["remaining"]
+            data[endpoint] = entry
+    except OSError as e:
+        logger.warning(f"RateLimit: failed to save budget store: {e}")
+        return
+    if entry["remaining"] <= PAID_RESERVE:
+        logger.warning(
+            f"RateLimit: {endpoint} low — {entry['remaining']}/{entry['limit']} left, "
+            f"resets in {max(entry['reset'] - int(time.time()), 0)}s"
+        )
+
+
+# ─────────────────────────────────────────────
+#  BUDGET CHECKS
+# ─────────────────────────────────────────────
+
+def _floor(entry: dict, priority: str) -> int:
+    """Calls that must remain in the window after this one, for a given priority."""
+    if priority == "paid":
+        return 0
+    if priority == "low":
+        return max(PAID_RESERVE, int(entry.get("limit", 0) * LOW_FRACTION))
+    return PAID_RESERVE
+
+
+def budget(endpoint: str) -> dict | None:
+    """Return the last recorded window for an endpoint, or None if unknown / already reset."""
+    entry = _load().get(endpoint)
+    if not entry or entry.get("reset", 0) <= time.time():
+        return None
+    return entry
+
+
+def allow(endpoint: str, priority: str = "normal") -> bool:
+    """
+    True if a call at this priority fits the endpoint's remaining budget — the
+    call is then counted against the window right away (record() keeps the
+    lowest count of a window, so the response headers never hand it back).
+    """
+    try:
+        with _locked() as data:
+            entry = data.get(endpoint)
+            if not entry or entry.get("reset", 0) <= time.time():
+                return True
+            if entry["remaining"] > _floor(entry, priority):
+                entry["remaining"] -= 1
+                return True
+    except OSError as e:
+        logger.warning(f"RateLimit: budget store unavailable — allowing {endpoint}: {e}")
+        return True
+    logger.info(
+        f"RateLimit: {priority} call to {endpoint} deferred — "
+        f"{entry['remaining']}/{entry['limit']} left, "
+        f"resets in {int(entry['reset'] - time.time())}s"
+    )
+    return False
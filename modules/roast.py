@@ -9,53 +9,59 @@ Memo format : ROAST @TargetHandle <tweet_url_or_id>
 Min payment : 0.01 SOL
 """
 
+import time
 import logging
 
 logger = logging.getLogger("0xeeTerm.roast")
 
 
-def process_roast(handle: str, tweet_id: str, sol_received: float, sol_price: float) -> dict | None:
+def process_roast(
+    handle: str,
+    tweet_id: str,
+    sol_received: float,
+    sol_price: float,
+    key: str = None,
+) -> dict | None:
     """
     Handle a ROAST service request end-to-end:
     1. Fetch the target tweet text
     2. Generate the roast via brain
     3. Reply to the target tweet
     4. Post a public confirmation tweet
+    Both tweets go through the outbox under key (default: a one-off manual key),
+    so a retry of the same payment never regenerates or double-posts the roast.
     Returns {"reply_result": ..., "confirm_result": ...} or None on failure.
     """
-    from modules.twitter import get_tweet_text, post_reply, post_tweet
+    from modules.twitter import get_tweet_text
     from modules.brain import generate_roast_tweet
+    from modules import outbox
 
     usd = round(sol_received * sol_price, 2)
+    priority = "paid" if sol_received > 0 else "normal"   # free manual roasts don't touch the paid reserve
+    key = key or f"manual:{tweet_id}:{int(time.time())}:roast"
+    confirm_key = f"{key}:confirm"
 
-    # 1. Fetch the target tweet (may be None if private/deleted)
-    tweet_text = get_tweet_text(tweet_id) if tweet_id else None
-    if not tweet_text:
-        logger.warning(f"Roast: could not fetch tweet {tweet_id} — proceeding without context")
+    def generate() -> str | None:
+        # 1. Fetch the target tweet (may be None if private/deleted)
+        tweet_text = get_tweet_text(tweet_id) if tweet_id else None
+        if not tweet_text:
+            logger.warning(f"Roast: could not fetch tweet {tweet_id} — proceeding without context")
 
-    # 2. Generate the roast
-    roast_text = generate_roast_tweet(tweet_text, handle)
-    if not roast_text:
-        logger.error(f"Roast: brain failed to generate roast for {handle}")
-        return None
+        # 2. Generate the roast
+        roast_text = generate_roast_tweet(tweet_text, handle)
+        if not roast_text:
+            logger.error(f"Roast: brain failed to generate roast for {handle}")
+        return roast_text
 
-    # 3. Reply to the target tweet — fall back to standalone tweet if API blocks the reply
+    # 3. Reply to the target tweet — the outbox falls back to a standalone tweet
+    #    with the target URL embedded if the API blocks the reply
     #    (403: bot not mentioned/engaged by author of target tweet)
-    reply_result = post_reply(roast_text, tweet_id) if tweet_id else None
-    if reply_result:
-        logger.info(f"Roast: reply posted for {handle} — ID: {reply_result['id']}")
-    else:
-        # Fallback: standalone tweet with target URL embedded so context is visible
-        # Reserve 45 chars for "\n\nhttps://x.com/i/status/<19-digit-id>"
-        tweet_url = f"https://x.com/i/status/{tweet_id}" if tweet_id else ""
-        max_roast = 280 - len(tweet_url) - 2 if tweet_url else 280
-        body = roast_text[:max_roast].rstrip()
-        standalone = f"{body}\n\n{tweet_url}".strip() if tweet_url else body
-        reply_result = post_tweet(standalone)
-        if not reply_result:
-            logger.error(f"Roast: both reply and standalone fallback failed for {handle}")
-            return None
-        logger.info(f"Roast: posted as standalone (reply blocked) for {handle} — ID: {reply_result['id']}")
+    reply_result = outbox.submit(key, generate, reply_to=tweet_id, fallback=True, priority=priority)
+    if not reply_result:
+        if outbox.get(key):
+            logger.error(f"Roast: post pending for {handle} — queued in outbox")
+        return None
+    logger.info(f"Roast: posted for {handle} — ID: {reply_result['id']}")
 
     # 4. Confirmation tweet — handle is the TARGET, not the buyer
     treasury_line = f"Treasury: +${usd:.2f}\n" if sol_received > 0 else ""
@@ -66,10 +72,11 @@ def process_roast(handle: str, tweet_id: str, sol_received: float, sol_price: fl
         f"The blockchain has receipted this transaction.\n\n"
         f"$0xEE — ai.0xee.li"
     )
-    confirm_result = post_tweet(confirm_text)
+    outbox.enqueue(confirm_key, confirm_text, priority=priority, after=key)
+    confirm_result = outbox.send(confirm_key)
     if confirm_result:
         logger.info(f"Roast: confirmation posted — ID: {confirm_result['id']}")
     else:
-        logger.warning(f"Roast: confirmation tweet failed (reply was still posted)")
+        logger.warning(f"Roast: confirmation tweet queued (reply was still posted)")
 
     return {"reply_result": reply_result, "confirm_result": confirm_result}
@@ -0,0 +1,121 @@
+"""
+0xeeTerm — Series Module
+
+Round-robin time-series store for treasury history (net worth, SOL price,
+survival_pct). Each sample is folded into three fixed-size rings — 5-minute,
+hourly and daily buckets — so memory and disk use stay constant however
+long the engine runs, and a chart never needs historical RPC work.
+
+Storage : logs/state.db, table series(metric, res, slot, ts, sum, count, min, max)
+          slot = (ts // step) % size — a bucket is overwritten once its ring wraps
+Export  : chart() → {metric: {res: [[ts, avg], ...]}} for the series.json shard
+          (res: 5min, hour, day — drawn by the web dashboard's treasury chart)
+"""
+
+import time
+import logging
+from modules import state as state_store
+
+logger = logging.getLogger("0xeeTerm.series")
+
+# res → (step seconds, ring size)
+RESOLUTIONS = {
+    "5min":   (300,   288),   # last 24h
+    "hour":   (3600,  168),   # last 7 days
+    "day":    (86400, 365),   # last year
+}
+
+METRICS = ("net_worth_usd", "sol_price", "survival_pct")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS series (
+    metric TEXT    NOT NULL,
+    res    TEXT    NOT NULL,
+    slot   INTEGER NOT NULL,
+    ts     INTEGER NOT NULL,
+    sum    REAL    NOT NULL,
+    count  INTEGER NOT NULL,
+    min    REAL    NOT NULL,
+    max    REAL    NOT NULL,
+    PRIMARY KEY (metric, res, slot)
+);
+"""
+
+# Same bucket → accumulate; older bucket in that slot (ring wrapped) → overwrite.
+# SQLite evaluates every SET expression against the old row, so ts is compared before it moves.
+_FOLD = (
+    "INSERT INTO series (metric, res, slot, ts, sum, count, min, max) VALUES (?, ?, ?, ?, ?, 1, ?, ?) "
+    "ON CONFLICT(metric, res, slot) DO UPDATE SET "
+    "sum   = CASE WHEN ts = excluded.ts THEN sum + excluded.sum ELSE excluded.sum END, "
+    "count = CASE WHEN ts = excluded.ts THEN count + 1 ELSE 1 END, "
+    "min   = CASE WHEN ts = excluded.ts THEN MIN(min, excluded.min) ELSE excluded.min END, "
+    "max   = CASE WHEN ts = excluded.ts THEN MAX(max, excluded.max) ELSE excluded.max END, "
+    "ts    = excluded.ts"
+)
+
+_initialized = False
+
+
+def _ensure_schema():
+    global _initialized
+    if not _initialized:
+        with state_store.connection() as conn:
+            conn.executescript(_SCHEMA)
+        _initialized = True
+
+
+def record(values: dict, ts: int = None):
+    """Fold one snapshot ({metric: value}) into every resolution ring. Unknown / None values are skipped."""
+    ts = int(ts or time.time())
+    rows = []
+    for metric, value in values.items():
+        if metric not in METRICS or value is None:
+            continue
+        for res, (step, size) in RESOLUTIONS.items():
+            bucket = ts - ts % step
+            rows.append((metric, res, (ts // step) % size, bucket, float(value), float(value), float(value)))
+    if not rows:
+        return
+    try:
+        _ensure_schema()
+        with state_store.transaction() as conn:
+            conn.executemany(_FOLD, rows)
+    except Exception as e:
+        logger.warning(f"Series: failed to record snapshot: {e}")
+
+
+def record_status(status: dict):
+    """Record a get_survival_status() snapshot."""
+    record({
+        "net_worth_usd": status.get("balance_usd"),
+        "sol_price":     status.get("sol_price"),
+        "survival_pct":  status.get("survival_pct"),
+    })
+
+
+def stale(max_age_seconds: int, metric: str = "net_worth_usd", now: int = None) -> bool:
+    """True if the newest sample of `metric` is older than max_age_seconds (or there is none)."""
+    _ensure_schema()
+    now = int(now or time.time())
+    step, _ = RESOLUTIONS["5min"]
+    with state_store.connection() as conn:
+        row = conn.execute("SELECT MAX(ts) FROM series WHERE metric = ? AND res = '5min'", (metric,)).fetchone()
+    # ts is the start of a 5-minute bucket — the sample itself is up to one step newer
+    return row[0] is None or now - (row[0] + step) >= max_age_seconds
+
+
+def chart(metrics: tuple = METRICS, now: int = None) -> dict:
+    """Chart-ready averages per bucket, oldest first, limited to each ring's window."""
+    _ensure_schema()
+    now = int(now or time.time())
+    out = {metric: {} for metric in metrics}
+    with state_store.connection() as conn:
+        for res, (step, size) in RESOLUTIONS.items():
+            since = now - step * size
+            for metric in metrics:
+                rows = conn.execute(
+                    "SELECT ts, sum / count FROM series WHERE metric = ? AND res = ? AND ts > ? ORDER BY ts",
+                    (metric, res, since),
+                ).fetchall()
+                out[metric][res] = [[ts, round(avg, 4)] for ts, avg in rows]
+    return out
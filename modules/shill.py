@@ -7,17 +7,24 @@ Shill-as-a-Service: listens for incoming SOL transfers with a Twitter
 Phase 1: SOL transfers only.
 # TODO: accept $0xEE token transfers + increase SHILL_MIN_AMOUNT
 
-Storage : logs/shill_state.json (project-relative, included in nexus backup)
+Storage : logs/state.db, namespace "shill" (project-relative, included in nexus backup)
 Env vars: SHILL_MIN_SOL (default: 0.001), SOLANA_WALLET, SOLANA_RPC
 """
 
 import os
 import re
+import copy
 import json
+import time
 import logging
-import requests
 from pathlib import Path
 from datetime import datetime, timezone
+from modules import state as state_store
+from modules import genesis
+from modules import ledger
+from modules import dlq
+from modules import metrics
+from modules import net
 
 logger = logging.getLogger("0xeeTerm.shill")
 
@@ -33,71 +40,121 @@ _SERVICE_MIN_SOL = {
 }
 
 SHILL_STATE_DIR      = Path(__file__).parent.parent / "logs"
-SHILL_STATE_FILE     = SHILL_STATE_DIR / "shill_state.json"
-GENESIS_REGISTRY_FILE = SHILL_STATE_DIR / "genesis_registry.json"
+SHILL_STATE_FILE     = SHILL_STATE_DIR / "shill_state.json"   # legacy, see _load_state()
 
 
 # ─────────────────────────────────────────────
 #  STATE
 # ─────────────────────────────────────────────
 
+SHILL_NAMESPACE = "shill"   # logs/state.db namespace (legacy shill_state.json migrated once)
+
+PROCESSED_WINDOW     = 500    # processed signatures kept explicitly above the watermark
+PROCESSED_HARD_CAP   = 2000   # past this, the watermark moves even over pending signatures
+MEMO_GRACE_SECONDS   = 600    # a memo-less tx older than this is a plain transfer, not late indexing
+
+_STATE_DEFAULTS = {
+    "processed_watermark": 0,
+    "processed_recent": {},
+}
+
+# Running totals kept here before the payment ledger — seeded into it once, then dropped
+_LEGACY_EARNING_KEYS = ("tolls_count", "recent_tolls", "total_earned_sol", "monthly_earned_sol", "monthly_reset")
+
+
 def _load_state() -> dict:
-    if SHILL_STATE_FILE.exists():
+    try:
+        state = state_store.load(SHILL_NAMESPACE, _STATE_DEFAULTS, legacy_file=SHILL_STATE_FILE)
+    except Exception as e:
+        logger.error(f"Shill: failed to load state: {e}")
+        return copy.deepcopy(_STATE_DEFAULTS)
+    if any(k in state for k in _LEGACY_EARNING_KEYS):
         try:
-            with open(SHILL_STATE_FILE) as f:
-                return json.load(f)
+            ledger.seed_legacy(state)
         except Exception as e:
-            logger.error(f"Shill: failed to load state: {e}")
-    return {
-        "processed_signatures": [],
-        "tolls_count": 0,
-        "recent_tolls": [],
-        "total_earned_sol": 0.0,
-        "monthly_earned_sol": 0.0,
-        "monthly_reset": "",
-    }
+            logger.error(f"Shill: failed to seed legacy earnings into the ledger — retrying next cycle: {e}")
+            return state
+        for k in _LEGACY_EARNING_KEYS:
+            state.pop(k, None)
+    return state
+
 
+class ProcessedIndex:
+    """
+    Dedupe index for payment signatures, ordered by slot.
+    Every signature below `watermark` counts as processed; only the recent
+    window above it is stored ({sig: slot}), so membership is O(1) and the
+    stored size stays bounded however long the service runs. The watermark
+    never passes a signature still pending a retry (up to PROCESSED_HARD_CAP).
+    """
 
-def _record_earning(state: dict, sol: float):
-    """Accumulate earnings: cumulative total + monthly (auto-reset each calendar month)."""
-    now_month = datetime.now(timezone.utc).strftime("%Y-%m")
-    if state.get("monthly_reset") != now_month:
-        state["monthly_earned_sol"] = 0.0
-        state["monthly_reset"] = now_month
-    state["total_earned_sol"]   = round(state.get("total_earned_sol",  0.0) + sol, 6)
-    state["monthly_earned_sol"] = round(state.get("monthly_earned_sol", 0.0) + sol, 6)
+    def __init__(self, state: dict):
+        self.watermark = int(state.get("processed_watermark") or 0)
+        self.recent    = dict(state.get("processed_recent") or {})
+        # Legacy flat list (no slots) — kept at slot 0 until the watermark covers it
+        for sig in state.pop("processed_signatures", None) or []:
+            self.recent.setdefault(sig, 0)
+        self.pending_floor = None
+
+    def seen(self, sig: str, slot: int) -> bool:
+        return sig in self.recent or (slot or 0) < self.watermark
+
+    def add(self, sig: str, slot: int):
+        self.recent[sig] = slot or 0
+
+    def hold(self, slot: int):
+        """Signature left for a retry — the watermark must stay at or below its slot."""
+        if slot and (self.pending_floor is None or slot < self.pending_floor):
+            self.pending_floor = slot
+
+    def compact(self):
+        """Advance the watermark over the oldest entries once the window overflows."""
+        if len(self.recent) <= PROCESSED_WINDOW:
+            return
+        slots = sorted(self.recent.values())
+        target = slots[len(slots) - PROCESSED_WINDOW]
+        if self.pending_floor is not None and target > self.pending_floor:
+            if len(self.recent) <= PROCESSED_HARD_CAP:
+                target = self.pending_floor
+            else:
+                logger.warning(
+                    f"Shill: dedupe window over {PROCESSED_HARD_CAP} — watermark passes "
+                    f"pending slot {self.pending_floor}"
+                )
+        if target > self.watermark:
+            self.watermark = target
+            self.recent = {sig: slot for sig, slot in self.recent.items() if slot >= target}
+
+    def store(self, state: dict, compact: bool = True):
+        """Write the index into state. Per-payment acks skip compaction — retry holds are only known at cycle end."""
+        if compact:
+            self.compact()
+        state["processed_watermark"] = self.watermark
+        state["processed_recent"]    = self.recent
+
+
+def _record_payment(sig: str, slot: int, service: str, handle: str, sol: float, sol_price: float, tweet_id: str = None):
+    """Append a served payment to the ledger (rollups are updated with it)."""
+    try:
+        ledger.record(sig, slot, service, handle, round(sol * LAMPORTS_PER_SOL), sol_price, tweet_id)
+        metrics.inc("oxeeterm_payments_served_total", service=service)
+        metrics.inc("oxeeterm_payments_sol_total", sol, service=service)
+    except Exception as e:
+        logger.error(f"Shill: failed to record {service} payment {sig[:16]}... in ledger: {e}")
 
 
 def _save_state(state: dict):
+    """Write back only the keys changed since _load_state()."""
     try:
-        SHILL_STATE_DIR.mkdir(parents=True, exist_ok=True)
-        with open(SHILL_STATE_FILE, "w") as f:
-            json.dump(state, f, indent=2)
+        state_store.save(SHILL_NAMESPACE, state)
     except Exception as e:
         logger.error(f"Shill: failed to save state: {e}")
 
 
-def _load_genesis_registry() -> list:
-    if GENESIS_REGISTRY_FILE.exists():
-        try:
-            with open(GENESIS_REGISTRY_FILE) as f:
-                return json.load(f)
-        except Exception as e:
-            logger.error(f"Shill: failed to load genesis registry: {e}")
-    return []
-
-
 def _append_genesis_entry(handle: str, sol: float, tx_sig: str, at: str):
     """Append a new entry to the genesis registry (deduped by tx_sig)."""
-    registry = _load_genesis_registry()
-    if any(e.get("tx_sig") == tx_sig for e in registry):
-        return
-    registry.append({"handle": handle, "sol": round(sol, 4), "tx_sig": tx_sig, "at": at})
     try:
-        SHILL_STATE_DIR.mkdir(parents=True, exist_ok=True)
-        with open(GENESIS_REGISTRY_FILE, "w") as f:
-            json.dump(registry, f, indent=2)
-        logger.info(f"Shill: genesis entry saved — {handle} (#{len(registry)})")
+        genesis.append(handle, sol, tx_sig, at)
     except Exception as e:
         logger.error(f"Shill: failed to save genesis registry: {e}")
 
@@ -106,7 +163,7 @@ def _append_genesis_entry(handle: str, sol: float, tx_sig: str, at: str):
 #  SOLANA RPC HELPERS
 # ─────────────────────────────────────────────
 
-_PUBLIC_RPC = "https://api.mainnet-beta.solana.com"
+_PUBLIC_RPC = os.getenv("SOLANA_PUBLIC_RPC", "https://api.mainnet-beta.solana.com")
 
 
 def _get_recent_signatures(wallet: str, limit: int = 20) -> list:
@@ -120,15 +177,16 @@ def _get_recent_signatures(wallet: str, limit: int = 20) -> list:
             "method": "getSignaturesForAddress",
             "params": [wallet, {"limit": limit}],
         }
-        r = requests.post(_PUBLIC_RPC, json=payload, timeout=10)
+        r = net.post(_PUBLIC_RPC, json=payload, timeout=10)
         return r.json().get("result", [])
     except Exception as e:
         logger.error(f"Shill: failed to fetch signatures: {e}")
         return []
 
 
-def _get_sol_received(signature: str, wallet: str, rpc: str) -> float:
-    """Return how many SOL our wallet received in this transaction (0 if outgoing)."""
+def _get_sol_received(signature: str, wallet: str, rpc: str) -> float | None:
+    """Return how many SOL our wallet received in this transaction (0 if outgoing).
+    None if it could not be read (RPC error, not found yet) — retried, not skipped."""
     try:
         payload = {
             "jsonrpc": "2.0",
@@ -139,10 +197,10 @@ def _get_sol_received(signature: str, wallet: str, rpc: str) -> float:
                 {"encoding": "json", "maxSupportedTransactionVersion": 0},
             ],
         }
-        r = requests.post(rpc, json=payload, timeout=10)
+        r = net.post(rpc, json=payload, timeout=10)
         data = r.json().get("result")
         if not data:
-            return 0.0
+            return None
 
         accounts = data["transaction"]["message"]["accountKeys"]
         pre  = data["meta"]["preBalances"]
@@ -157,7 +215,7 @@ def _get_sol_received(signature: str, wallet: str, rpc: str) -> float:
 
     except Exception as e:
         logger.error(f"Shill: failed to parse tx {signature[:16]}...: {e}")
-        return 0.0
+        return None
 
 
 # ─────────────────────────────────────────────
@@ -275,7 +333,7 @@ def _get_wallet_info(wallet: str) -> dict:
         return result
 
     try:
-        r = requests.post(_PUBLIC_RPC, json={
+        r = net.post(_PUBLIC_RPC, json={
             "jsonrpc": "2.0", "id": 1,
             "method": "getBalance",
             "params": [wallet],
@@ -286,7 +344,7 @@ def _get_wallet_info(wallet: str) -> dict:
         logger.error(f"Shill: _get_wallet_info balance error for {wallet[:16]}...: {e}")
 
     try:
-        r = requests.post(_PUBLIC_RPC, json={
+        r = net.post(_PUBLIC_RPC, json={
             "jsonrpc": "2.0", "id": 1,
             "method": "getSignaturesForAddress",
             "params": [wallet, {"limit": 1000}],
@@ -316,6 +374,211 @@ def _get_wallet_info(wallet: str) -> dict:
 #  MAIN ENTRY POINT
 # ─────────────────────────────────────────────
 
+# Worker threads per pipeline stage. generate holds the LLM calls and the
+# composite roast / persona services; post shares the X write budget.
+SHILL_WORKERS = {"verify": 4, "enrich": 4, "generate": 4, "post": 2}
+
+
+class _Payment:
+    """A service request found in the wallet's recent transactions, on its way through the pipeline."""
+
+    def __init__(self, sig: str, slot: int, service: dict, memo: str):
+        self.sig     = sig
+        self.slot    = slot
+        self.memo    = memo   # kept in the DLQ entry, re-parsed on retry
+        self.service = service
+        self.type    = service["type"]
+        self.handle  = service.get("handle")
+        # Idempotency key — a tweet generated for this payment is queued once,
+        # then retried from the outbox without another LLM call
+        self.key     = f"{sig}:{self.type}"
+        self.sol     = 0.0
+        self.context = None   # enrich: target tweet text (reply) / wallet info (verdict)
+        self.result  = None   # {"id", "text"} of the service tweet once posted
+        self.outcome = None   # skip | served | retry | error (see modules.pipeline)
+        self.error   = None   # failure reason, kept in the DLQ entry
+        self.wait    = None   # post deferred by the outbox — retry then, no DLQ attempt spent
+        self.dead    = False  # the outbox gave up — dead-letter without more attempts
+
+    def __repr__(self) -> str:
+        return f"{self.type} {self.handle} {self.sig[:16]}..."
+
+
+def _post_failed(job: _Payment, what: str):
+    """
+    Classify a failure from the state of the job's outbox entry. A tweet still
+    pending there is the outbox's to retry (its own backoff, rate-limit
+    deferrals): the request waits for it without spending a DLQ attempt.
+    """
+    from modules import outbox
+
+    entry = outbox.get(job.key)
+    job.outcome = "retry"
+    if entry is None:
+        job.error = f"{what}: no tweet generated"
+    elif entry["status"] == "failed":
+        job.error, job.dead = f"{what}: outbox gave up — {entry.get('last_error')}", True
+    else:
+        job.error = f"{what}: post pending in outbox — {entry.get('last_error') or 'rate limited'}"
+        next_at = entry.get("next_attempt_at")
+        job.wait = datetime.fromisoformat(next_at) if next_at else datetime.now(timezone.utc)
+
+
+def _verify(job: _Payment, wallet: str, rpc: str):
+    """Stage 1 — read the amount received and check it against the service minimum."""
+    job.sol = _get_sol_received(job.sig, wallet, rpc)
+    if job.sol is None:
+        job.outcome, job.error = "retry", "transaction unreadable (RPC error or not found)"
+        return
+
+    min_required = _SERVICE_MIN_SOL[job.type]
+    if job.sol < min_required:
+        logger.info(
+            f"Shill: {job.sig[:16]}... below minimum for {job.type} "
+            f"({job.sol:.4f} < {min_required} SOL) — skipping."
+        )
+        job.outcome = "skip"  # intentional skip — mark done
+        return
+
+    metrics.inc("oxeeterm_payments_detected_total", service=job.type)
+    logger.info(f"Shill: qualifying tx — {job.type} {job.handle} {job.sol:.4f} SOL")
+
+    if job.type == "roast" and not job.service.get("tweet_id"):
+        logger.error(f"Shill: ROAST memo missing tweet_id for {job.handle} — skipping.")
+        job.outcome = "skip"
+    elif job.type == "persona" and not job.service.get("wallet"):
+        logger.error(f"Shill: PERSONA memo missing wallet for {job.handle} — skipping.")
+        job.outcome = "skip"
+
+
+def _enrich(job: _Payment):
+    """Stage 2 — fetch what the prompt needs, unless the tweet is already queued."""
+    from modules import outbox
+    from modules.twitter import get_tweet_text
+
+    if outbox.get(job.key) is not None:
+        return
+    if job.type == "reply":
+        job.context = get_tweet_text(job.service["tweet_id"])
+    elif job.type == "verdict":
+        job.context = _get_wallet_info(job.service.get("wallet") or "")
+
+
+def _generate(job: _Payment, sol_price: float):
+    """
+    Stage 3 — generate the tweet once and queue it in the outbox.
+    Roast and persona are composite services (own lookups, several posts)
+    and are served entirely here.
+    """
+    from modules import outbox
+    from modules.brain import (
+        generate_shill_tweet, generate_genesis_tweet,
+        generate_reply_tweet, generate_verdict_tweet,
+    )
+    from modules.roast import process_roast
+    from modules.persona import process_persona
+
+    if job.type == "roast":
+        roast_result = process_roast(job.handle, job.service["tweet_id"], job.sol, sol_price, key=job.key)
+        if roast_result:
+            logger.info(f"Shill: ROAST complete for {job.handle}")
+            job.result, job.outcome = roast_result.get("reply_result") or {}, "served"
+        else:
+            _post_failed(job, "roast failed")
+        return
+
+    if job.type == "persona":
+        persona_result = process_persona(job.handle, job.service["wallet"], job.sol, sol_price, key=job.key)
+        if persona_result:
+            logger.info(f"Shill: PERSONA complete for {job.handle} — label={persona_result['label']}")
+            job.result, job.outcome = persona_result["result"], "served"
+        else:
+            _post_failed(job, "persona failed")
+        return
+
+    def generate() -> str | None:
+        if job.type == "toll":
+            return generate_shill_tweet(job.handle, job.sol, job.sol * sol_price)
+
+        if job.type == "genesis":
+            return generate_genesis_tweet(job.handle, job.sol)
+
+        if job.type == "reply":
+            return generate_reply_tweet(job.handle, job.context, job.sol)
+
+        if job.type == "verdict":
+            body = generate_verdict_tweet(job.handle, job.context)
+            if body:
+                return (
+                    f"WALLET VERDICT // {job.handle}\n\n"
+                    f"{body}\n\n"
+                    f"Treasury: +{job.sol:.3f} SOL\n"
+                    f"$0xEE — ai.0xee.li"
+                )
+        return None
+
+    # Reply service: 403 permanent (bot not engaged by author) → the
+    # outbox falls back to a standalone tweet embedding the target URL
+    queued = outbox.prepare(
+        job.key, generate,
+        reply_to=job.service.get("tweet_id") if job.type == "reply" else None,
+        fallback=True,
+        priority="paid",
+    )
+    if not queued:
+        job.outcome, job.error = "retry", "brain returned no text"
+
+
+def _post(job: _Payment):
+    """Stage 4 — send the queued tweet."""
+    from modules import outbox
+
+    job.result = outbox.send(job.key)
+    if job.result:
+        logger.info(f"Shill: tweet posted for {job.type} {job.handle} — ID: {job.result['id']}")
+        job.outcome = "served"
+    else:
+        _post_failed(job, "post failed")
+
+
+def _dead_letter(job: _Payment) -> bool:
+    """
+    Hand a failed request to the dead-letter queue, which schedules its
+    retries from now on. False if that failed too — the signature then stays
+    unprocessed and the next scan picks it up again.
+    """
+    reason = job.error if isinstance(job.error, str) else f"{type(job.error).__name__}: {job.error}"
+    try:
+        entry = dlq.fail(
+            job.sig, job.slot, job.memo, job.type, job.handle, reason,
+            retry_at=job.wait, dead=job.dead,
+        )
+    except Exception as e:
+        logger.error(f"Shill: failed to record {job!r} in the DLQ ({reason}): {e} — will rescan next cycle.")
+        return False
+    if entry["status"] == "dead":
+        logger.error(
+            f"Shill: {job!r} dead-lettered after {entry['attempts']} attempt(s): {reason} "
+            f"— see `0xeeTerm dlq`."
+        )
+    elif job.wait:
+        logger.info(f"Shill: {job!r} waiting on the outbox ({reason}) — next try {entry['next_attempt_at'][:16]}.")
+    else:
+        logger.warning(
+            f"Shill: {job!r} failed (attempt {entry['attempts']}/{dlq.DLQ_MAX_ATTEMPTS}): {reason} "
+            f"— retry after {entry['next_attempt_at'][:16]}."
+        )
+    return True
+
+
+def _clear_dead_letter(job: _Payment):
+    """Served or skipped — drop any DLQ entry left by an earlier attempt."""
+    try:
+        dlq.clear(job.sig)
+    except Exception as e:
+        logger.error(f"Shill: failed to clear {job!r} from the DLQ: {e}")
+
+
 def process_shills():
     """
     Scan recent transactions for on-chain service requests.
@@ -324,15 +587,21 @@ def process_shills():
       - genesis : Genesis Certificate (0.005 SOL, memo: GENESIS @handle)
       - reply   : Reply-as-a-Service (0.01 SOL, memo: @handle <tweet_url_or_id>)
       - verdict : Wallet Verdict (0.01 SOL, memo: VERDICT @handle <wallet>)
+      - roast / persona : composite services (modules/roast.py, modules/persona.py)
+
+    Detected payments go through a staged pipeline (modules/pipeline.py):
+    verify amount → enrich → generate → post, each stage with its own
+    workers, so one slow payment no longer holds up the rest. Results are
+    then acked in transaction order — ledger row, Genesis entry, dedupe
+    index, state saved — one payment at a time.
+
+    A request that fails is marked processed and handed to the dead-letter
+    queue (modules/dlq.py), which feeds it back into the pipeline once its
+    backoff expires — until it is served or dead after DLQ_MAX_ATTEMPTS.
     """
+    from functools import partial
     from modules.solana import get_sol_price_usd, _get_rpc
-    from modules.brain import (
-        generate_shill_tweet, generate_genesis_tweet,
-        generate_reply_tweet, generate_verdict_tweet,
-    )
-    from modules.twitter import post_tweet, post_reply, get_tweet_text
-    from modules.roast import process_roast
-    from modules.persona import process_persona
+    from modules import pipeline
 
     wallet = os.getenv("SOLANA_WALLET")
     if not wallet:
@@ -340,193 +609,87 @@ def process_shills():
         return
 
     state     = _load_state()
-    processed = set(state.get("processed_signatures", []))
+    processed = ProcessedIndex(state)
 
     rpc        = _get_rpc()              # used for getTransaction
     signatures = _get_recent_signatures(wallet)  # always public RPC — memo fields
-    if not signatures:
+    try:
+        retries = dlq.due()
+    except Exception as e:
+        logger.error(f"Shill: failed to read the DLQ: {e}")
+        retries = []
+    if not signatures and not retries:
         logger.info("Shill: no recent transactions found.")
         return
 
-    sol_price  = get_sol_price_usd()
-    new_shills = 0
-
+    # ── DETECT ────────────────────────────────────────────────────────
+    jobs = []
     for entry in signatures:
         sig  = entry.get("signature")
         memo = entry.get("memo") or ""
         err  = entry.get("err")
 
+        slot = entry.get("slot") or 0
+
         # Skip failed txs and already-processed signatures
-        if err or not sig or sig in processed:
+        if err or not sig or processed.seen(sig, slot):
             continue
 
         service = _parse_service(memo)
         if not service["type"]:
-            if memo:  # memo present but unrecognised → skip definitively
-                processed.add(sig)
+            block_time = entry.get("blockTime") or 0
+            if memo or time.time() - block_time > MEMO_GRACE_SECONDS:
+                processed.add(sig, slot)  # unrecognised memo / plain transfer → skip definitively
             continue  # memo empty → retry (late indexing)
 
         logger.info(
             f"Shill: service={service['type']} handle={service.get('handle')} "
             f"in tx {sig[:20]}..."
         )
+        jobs.append(_Payment(sig, slot, service, memo))
 
-        try:
-            sol_received = _get_sol_received(sig, wallet, rpc)
-        except Exception as e:
-            logger.error(f"Shill: could not read amount for {sig[:16]}...: {e}")
-            processed.add(sig)
-            continue
-
-        min_required = _SERVICE_MIN_SOL[service["type"]]
-        if sol_received < min_required:
-            logger.info(
-                f"Shill: {sig[:16]}... below minimum for {service['type']} "
-                f"({sol_received:.4f} < {min_required} SOL) — skipping."
-            )
-            processed.add(sig)  # intentional skip — mark done
+    # Failed requests whose backoff has expired — already marked processed
+    queued = {job.sig for job in jobs}
+    for entry in retries:
+        service = _parse_service(entry["memo"])
+        if entry["sig"] in queued or not service["type"]:
             continue
-
-        usd_received = sol_received * sol_price
-        handle       = service["handle"]
         logger.info(
-            f"Shill: qualifying tx — {service['type']} {handle} "
-            f"{sol_received:.4f} SOL (${usd_received:.2f})"
+            f"Shill: retrying {entry['service']} {entry['handle']} in tx {entry['sig'][:20]}... "
+            f"(attempt {entry['attempts'] + 1}/{dlq.DLQ_MAX_ATTEMPTS}, last error: {entry['last_error']})"
         )
+        jobs.append(_Payment(entry["sig"], entry["slot"], service, entry["memo"]))
 
-        # ── ROAST: handled separately (returns composite result) ──────────
-        if service["type"] == "roast":
-            if not service.get("tweet_id"):
-                logger.error(f"Shill: ROAST memo missing tweet_id for {handle} — skipping.")
-                processed.add(sig)
-                continue
-            try:
-                roast_result = process_roast(handle, service["tweet_id"], sol_received, sol_price)
-            except Exception as e:
-                logger.error(f"Shill: ROAST error for {handle}: {e} — will retry next cycle.")
-                continue
-            if roast_result:
-                logger.info(f"Shill: ROAST complete for {handle}")
-                new_shills += 1
-                now_iso = datetime.now(timezone.utc).isoformat()
-                state["tolls_count"] = (state.get("tolls_count") or 0) + 1
-                _record_earning(state, sol_received)
-                recent = state.get("recent_tolls", [])
-                recent.insert(0, {"handle": handle, "sol": round(sol_received, 4), "at": now_iso, "service": "roast"})
-                state["recent_tolls"] = recent[:10]
-                processed.add(sig)
-            else:
-                logger.error(f"Shill: ROAST failed for {handle} — will retry next cycle.")
-            continue
-        # ──────────────────────────────────────────────────────────────────
-
-        # ── PERSONA: handled separately (returns composite result) ────────
-        if service["type"] == "persona":
-            if not service.get("wallet"):
-                logger.error(f"Shill: PERSONA memo missing wallet for {handle} — skipping.")
-                processed.add(sig)
-                continue
-            try:
-                persona_result = process_persona(handle, service["wallet"], sol_received, sol_price)
-            except Exception as e:
-                logger.error(f"Shill: PERSONA error for {handle}: {e} — will retry next cycle.")
-                continue
-            if persona_result:
-                logger.info(f"Shill: PERSONA complete for {handle} — label={persona_result['label']}")
-                new_shills += 1
-                now_iso = datetime.now(timezone.utc).isoformat()
-                state["tolls_count"] = (state.get("tolls_count") or 0) + 1
-                _record_earning(state, sol_received)
-                recent = state.get("recent_tolls", [])
-                recent.insert(0, {"handle": handle, "sol": round(sol_received, 4), "at": now_iso, "service": "persona"})
-                state["recent_tolls"] = recent[:10]
-                processed.add(sig)
-            else:
-                logger.error(f"Shill: PERSONA failed for {handle} — will retry next cycle.")
-            continue
-        # ──────────────────────────────────────────────────────────────────
-
-        tweet_text = None
-        result     = None
-
-        try:
-            if service["type"] == "toll":
-                tweet_text = generate_shill_tweet(handle, sol_received, usd_received)
-                if tweet_text:
-                    result = post_tweet(tweet_text)
-
-            elif service["type"] == "genesis":
-                tweet_text = generate_genesis_tweet(handle, sol_received)
-                if tweet_text:
-                    result = post_tweet(tweet_text)
-
-            elif service["type"] == "reply":
-                orig_text  = get_tweet_text(service["tweet_id"])
-                tweet_text = generate_reply_tweet(handle, orig_text, sol_received)
-                if tweet_text:
-                    result = post_reply(tweet_text, service["tweet_id"])
-                    if not result:
-                        # 403 permanent (bot not engaged by author) — fallback to standalone
-                        tweet_url = f"https://x.com/i/status/{service['tweet_id']}"
-                        max_body  = 280 - len(tweet_url) - 2
-                        body      = tweet_text[:max_body].rstrip()
-                        standalone = f"{body}\n\n{tweet_url}"
-                        logger.warning(f"Shill: reply blocked for {handle} — posting standalone")
-                        result = post_tweet(standalone)
-
-            elif service["type"] == "verdict":
-                wallet_info = _get_wallet_info(service.get("wallet") or "")
-                body = generate_verdict_tweet(handle, wallet_info)
-                if body:
-                    tweet_text = (
-                        f"WALLET VERDICT // {handle}\n\n"
-                        f"{body}\n\n"
-                        f"Treasury: +{sol_received:.3f} SOL\n"
-                        f"$0xEE — ai.0xee.li"
-                    )
-                    result = post_tweet(tweet_text)
-
-        except Exception as e:
-            logger.error(
-                f"Shill: error for {service['type']} {handle}: {e} — will retry next cycle."
-            )
-            continue  # do NOT mark as processed — retry next cycle
-
-        if not tweet_text:
-            logger.error(
-                f"Shill: brain returned nothing for {service['type']} {handle} "
-                f"— will retry next cycle."
-            )
-            continue  # do NOT mark as processed — retry next cycle
-
-        if result:
-            logger.info(
-                f"Shill: tweet posted for {service['type']} {handle} — ID: {result['id']}"
-            )
+    sol_price  = get_sol_price_usd() if jobs else 0.0
+    new_shills = 0
+    stages = [
+        pipeline.Stage("verify",   partial(_verify, wallet=wallet, rpc=rpc), SHILL_WORKERS["verify"]),
+        pipeline.Stage("enrich",   _enrich,                                  SHILL_WORKERS["enrich"]),
+        pipeline.Stage("generate", partial(_generate, sol_price=sol_price),  SHILL_WORKERS["generate"]),
+        pipeline.Stage("post",     _post,                                    SHILL_WORKERS["post"]),
+    ]
+
+    # ── RECORD — in transaction order, acked one payment at a time ───
+    for job in pipeline.run(stages, jobs):
+        if job.outcome == "served":
             new_shills += 1
-            now_iso = datetime.now(timezone.utc).isoformat()
-            state["tolls_count"] = (state.get("tolls_count") or 0) + 1
-            _record_earning(state, sol_received)
-            recent = state.get("recent_tolls", [])
-            recent.insert(0, {
-                "handle":  handle,
-                "sol":     round(sol_received, 4),
-                "at":      now_iso,
-                "service": service["type"],
-            })
-            state["recent_tolls"] = recent[:10]
+            _record_payment(job.sig, job.slot, job.type, job.handle, job.sol, sol_price, job.result.get("id"))
             # Genesis: persist to registry
-            if service["type"] == "genesis":
-                _append_genesis_entry(handle, sol_received, sig, now_iso)
-            processed.add(sig)  # success — mark done
-        else:
-            logger.error(
-                f"Shill: post failed for {service['type']} {handle} — will retry next cycle."
-            )
-            # do NOT mark as processed — retry next cycle
+            if job.type == "genesis":
+                _append_genesis_entry(job.handle, job.sol, job.sig, datetime.now(timezone.utc).isoformat())
+        if job.outcome in ("served", "skip"):
+            _clear_dead_letter(job)
+        elif not _dead_letter(job):  # retry / error — the DLQ owns its retries from here
+            continue
+        processed.add(job.sig, job.slot)  # done — never served twice
+        processed.store(state, compact=False)
+        _save_state(state)
 
-    # Cap to last 500 to prevent shill_state.json from growing unboundedly
-    state["processed_signatures"] = list(processed)[-500:]
+    # Anything left unprocessed is retried next cycle — keep the watermark below it
+    for entry in signatures:
+        if entry.get("signature") and not entry.get("err") and not processed.seen(entry["signature"], entry.get("slot") or 0):
+            processed.hold(entry.get("slot") or 0)
+    processed.store(state)
     _save_state(state)
 
     logger.info(
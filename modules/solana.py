@@ -5,14 +5,18 @@ Tracks wallet balance and token market cap via Solana RPC
 
 import os
 import logging
-import requests
+from collections.abc import MutableMapping
+from modules import net
+from modules import series
 
 logger = logging.getLogger("0xeeTerm.solana")
 
 LAMPORTS_PER_SOL = 1_000_000_000
 
 
-_PUBLIC_RPC = "https://api.mainnet-beta.solana.com"
+# Overridable for local stand-ins (bench/fakes.py) — defaults are the live services
+_PUBLIC_RPC   = os.getenv("SOLANA_PUBLIC_RPC", "https://api.mainnet-beta.solana.com")
+COINGECKO_API = os.getenv("COINGECKO_API_URL", "https://api.coingecko.com/api/v3")
 
 
 def _get_rpc() -> str:
@@ -31,7 +35,7 @@ def check_helius() -> dict:
     url = f"https://mainnet.helius-rpc.com/?api-key={key}"
     try:
         wallet = os.getenv("SOLANA_WALLET", "11111111111111111111111111111111")
-        r = requests.post(url, json={"jsonrpc": "2.0", "id": 1, "method": "getBalance", "params": [wallet]}, timeout=8)
+        r = net.post(url, json={"jsonrpc": "2.0", "id": 1, "method": "getBalance", "params": [wallet]}, timeout=8)
         data = r.json()
         if "error" in data:
             return {"configured": True, "ok": False, "rpc": url, "error": data["error"].get("message", str(data["error"]))}
@@ -44,7 +48,7 @@ def _rpc_post(payload: dict) -> dict:
     """POST to primary RPC, auto-fallback to public if primary returns an error or times out."""
     primary = _get_rpc()
     try:
-        r = requests.post(primary, json=payload, timeout=10)
+        r = net.post(primary, json=payload, timeout=10)
         data = r.json()
         if "error" not in data:
             return data
@@ -52,7 +56,7 @@ def _rpc_post(payload: dict) -> dict:
     except Exception as e:
         logger.warning(f"RPC primary unreachable: {e} — falling back to public RPC")
     # Fallback
-    r = requests.post(_PUBLIC_RPC, json=payload, timeout=10)
+    r = net.post(_PUBLIC_RPC, json=payload, timeout=10)
     return r.json()
 
 USDC_MINT    = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
@@ -62,8 +66,8 @@ JITOSOL_MINT = "J1toso1uCk3RLmjorhTtrVwY9HJ7X8V9yYac6Y7kGCPn"
 def get_sol_price_usd() -> float:
     """Fetch current SOL price in USD from CoinGecko (free, no key needed)."""
     try:
-        r = requests.get(
-            "https://api.coingecko.com/api/v3/simple/price",
+        r = net.get(
+            f"{COINGECKO_API}/simple/price",
             params={"ids": "solana", "vs_currencies": "usd"},
             timeout=10,
         )
@@ -112,8 +116,8 @@ def _get_token_balance_rpc(wallet: str, mint: str) -> float:
 def _get_extended_prices() -> dict:
     """Fetch SOL and JitoSOL prices from CoinGecko."""
     try:
-        r = requests.get(
-            "https://api.coingecko.com/api/v3/simple/price",
+        r = net.get(
+            f"{COINGECKO_API}/simple/price",
             params={"ids": "solana,jito-staked-sol", "vs_currencies": "usd"},
             timeout=10,
         )
@@ -127,11 +131,12 @@ def _get_extended_prices() -> dict:
         return {"sol": 0.0, "jitosol": 0.0}
 
 
-def get_spl_balances() -> dict:
+def get_spl_balances(prices: dict = None) -> dict:
     """
     Fetch USDC and JitoSOL balances from the treasury wallet.
     Returns dict with balance, price, and USD value for each token.
     Handles missing token accounts gracefully (returns 0.0).
+    prices: an already fetched _get_extended_prices() result (saves a CoinGecko call).
     """
     wallet = os.getenv("SOLANA_WALLET", "")
 
@@ -141,7 +146,7 @@ def get_spl_balances() -> dict:
             "jitosol": {"balance": 0.0, "price": 0.0,  "usd": 0.0},
         }
 
-    prices      = _get_extended_prices()
+    prices      = prices or _get_extended_prices()
     usdc_bal    = _get_token_balance_rpc(wallet, USDC_MINT)
     jitosol_bal = _get_token_balance_rpc(wallet, JITOSOL_MINT)
 
@@ -168,40 +173,130 @@ def get_wallet_balance_usd() -> float:
     return usd
 
 
-def get_survival_status() -> dict:
-    """Return a full survival snapshot — Net Worth includes SOL + USDC + JitoSOL."""
-    monthly_rent = float(os.getenv("MONTHLY_RENT", 38.0))
-    runway_days  = int(os.getenv("RUNWAY_DAYS", 60))
+class SurvivalStatus(MutableMapping):
+    """
+    Lazy survival snapshot — the get_survival_status() dict, with every field
+    computed on first access and memoized. A field pulls only the reads it
+    depends on, each made at most once per snapshot:
+
+      monthly_rent, runway_days         env only
+      balance_sol                       getBalance
+      sol_price                         CoinGecko (SOL + JitoSOL in one call)
+      balance_usd, months_covered,
+      survival_pct, portfolio           all of the above + USDC / JitoSOL balances
+
+    A cycle that reads nothing makes no network call. Computing the net worth
+    records the snapshot in the treasury series, as the eager version did.
+    Keys set by callers (status["tweets_posted"] = ...) are kept alongside;
+    dict(status) resolves every field.
+    """
 
-    balance_sol = get_wallet_balance_sol()
-    sol_price   = get_sol_price_usd()
-    sol_usd     = balance_sol * sol_price
+    FIELDS = {
+        "balance_usd":    "_net_worth",
+        "balance_sol":    "_balance_sol",
+        "sol_price":      "_sol_price",
+        "monthly_rent":   "_monthly_rent",
+        "months_covered": "_months_covered",
+        "survival_pct":   "_survival_pct",
+        "runway_days":    "_runway_days",
+        "portfolio":      "_portfolio",
+    }
 
-    spl         = get_spl_balances()
-    usdc_usd    = spl["usdc"]["usd"]
-    jitosol_usd = spl["jitosol"]["usd"]
+    def __init__(self):
+        self._values = {}
+        self._reads  = {}   # network reads shared by several fields
 
-    net_worth      = round(sol_usd + usdc_usd + jitosol_usd, 2)
-    months_covered = net_worth / monthly_rent if monthly_rent > 0 else 0
-    survival_pct   = min((net_worth / monthly_rent) * 100, 999)
+    def _read(self, name: str, fetch):
+        if name not in self._reads:
+            self._reads[name] = fetch()
+        return self._reads[name]
 
-    logger.info(
-        f"Net Worth: ${net_worth:.2f} "
-        f"(SOL ${sol_usd:.2f} + USDC ${usdc_usd:.2f} + JitoSOL ${jitosol_usd:.2f})"
-    )
+    # ── reads ──────────────────────────────────────
+    def _sol(self) -> float:
+        return self._read("sol", get_wallet_balance_sol)
 
-    return {
-        "balance_usd":    net_worth,
-        "balance_sol":    round(balance_sol, 4),
-        "sol_price":      sol_price,
-        "monthly_rent":   monthly_rent,
-        "months_covered": round(months_covered, 2),
-        "survival_pct":   round(survival_pct, 1),
-        "runway_days":    runway_days,
-        "portfolio": {
-            "sol":     {"balance": round(balance_sol, 4), "usd": round(sol_usd, 2),  "price": sol_price},
-            "usdc":    spl["usdc"],
-            "jitosol": spl["jitosol"],
-            "net_worth": net_worth,
-        },
-    }
+    def _prices(self) -> dict:
+        return self._read("prices", _get_extended_prices)
+
+    def _spl(self) -> dict:
+        return self._read("spl", lambda: get_spl_balances(self._prices()))
+
+    # ── fields ─────────────────────────────────────
+    def _monthly_rent(self) -> float:
+        return float(os.getenv("MONTHLY_RENT", 38.0))
+
+    def _runway_days(self) -> int:
+        return int(os.getenv("RUNWAY_DAYS", 60))
+
+    def _balance_sol(self) -> float:
+        return round(self._sol(), 4)
+
+    def _sol_price(self) -> float:
+        return self._prices()["sol"]
+
+    def _portfolio(self) -> dict:
+        spl = self._spl()
+        return {
+            "sol":       {"balance": round(self._sol(), 4), "usd": round(self._sol() * self["sol_price"], 2), "price": self["sol_price"]},
+            "usdc":      spl["usdc"],
+            "jitosol":   spl["jitosol"],
+            "net_worth": self["balance_usd"],
+        }
+
+    def _net_worth(self) -> float:
+        sol_usd     = self._sol() * self["sol_price"]
+        usdc_usd    = self._spl()["usdc"]["usd"]
+        jitosol_usd = self._spl()["jitosol"]["usd"]
+        logger.info(
+            f"Net Worth: ${sol_usd + usdc_usd + jitosol_usd:.2f} "
+            f"(SOL ${sol_usd:.2f} + USDC ${usdc_usd:.2f} + JitoSOL ${jitosol_usd:.2f})"
+        )
+        return round(sol_usd + usdc_usd + jitosol_usd, 2)
+
+    def _months_covered(self) -> float:
+        rent = self["monthly_rent"]
+        return round(self["balance_usd"] / rent if rent > 0 else 0, 2)
+
+    def _survival_pct(self) -> float:
+        return round(min((self["balance_usd"] / self["monthly_rent"]) * 100, 999), 1)
+
+    # ── mapping ────────────────────────────────────
+    def __getitem__(self, key):
+        if key not in self._values:
+            if key not in self.FIELDS:
+                raise KeyError(key)
+            self._values[key] = getattr(self, self.FIELDS[key])()
+            if key == "balance_usd":
+                series.record_status(self)
+        return self._values[key]
+
+    def __setitem__(self, key, value):
+        self._values[key] = value
+
+    def __delitem__(self, key):
+        del self._values[key]
+
+    def __iter__(self):
+        yield from self.FIELDS
+        yield from (k for k in self._values if k not in self.FIELDS)
+
+    def __len__(self) -> int:
+        return len(self.FIELDS) + sum(1 for k in self._values if k not in self.FIELDS)
+
+    def __repr__(self) -> str:
+        return f"SurvivalStatus({self._values!r})"   # resolved fields only — never triggers a read
+
+    @property
+    def resolved(self) -> bool:
+        return all(k in self._values for k in self.FIELDS)
+
+    def resolve(self) -> "SurvivalStatus":
+        for key in self.FIELDS:
+            self[key]
+        return self
+
+
+def get_survival_status() -> SurvivalStatus:
+    """Return a lazy survival snapshot — Net Worth includes SOL + USDC + JitoSOL.
+    Nothing is fetched until a field is read (see SurvivalStatus)."""
+    return SurvivalStatus()
@@ -0,0 +1,216 @@
+"""
+0xeeTerm — State Module
+
+Transactional key-value store shared by the heartbeat, mentions and shill
+processes. State is stored one key per row, so a process writes back only
+the keys it changed — two overlapping timers touching different keys no
+longer overwrite each other, and a crash mid-write leaves the previous
+value intact. Snapshots are kept per thread, so the daemon's concurrent
+loops get the same guarantee as separate processes.
+
+Storage   : logs/state.db (SQLite, WAL mode)
+Table     : kv(namespace, key, value JSON, updated_at)
+Namespaces: "engine" (0xeeTerm state), "shill" (payment processing)
+A legacy JSON file passed to load() is imported once, then renamed to <name>.migrated.
+"""
+
+import copy
+import json
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+logger = logging.getLogger("0xeeTerm.state")
+
+STATE_DIR = Path(__file__).parent.parent / "logs"
+STATE_DB  = STATE_DIR / "state.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (
+    namespace  TEXT NOT NULL,
+    key        TEXT NOT NULL,
+    value      TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (namespace, key)
+);
+"""
+
+_UPSERT = (
+    "INSERT INTO kv (namespace, key, value, updated_at) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT(namespace, key) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at"
+)
+
+_initialized = False
+
+# Encoded values as of the last load()/save() in this thread, per namespace —
+# save() diffs against it to find the keys this thread actually changed
+_local = threading.local()
+
+
+def _snapshots() -> dict[str, dict[str, str]]:
+    if not hasattr(_local, "snapshots"):
+        _local.snapshots = {}
+    return _local.snapshots
+
+
+# ─────────────────────────────────────────────
+#  INTERNAL HELPERS
+# ─────────────────────────────────────────────
+
+def _encode(value) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+@contextmanager
+def _db():
+    """Short-lived connection, shared schema set up once per process."""
+    global _initialized
+    STATE_DIR.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(STATE_DB, timeout=30, isolation_level=None)
+    try:
+        if not _initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            _initialized = True
+        conn.execute("PRAGMA synchronous=NORMAL")
+        yield conn
+    finally:
+        conn.close()
+
+
+@contextmanager
+def _transaction(conn: sqlite3.Connection):
+    """BEGIN IMMEDIATE — takes the write lock up front so read-modify-write is atomic."""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def _import_legacy(conn: sqlite3.Connection, namespace: str, legacy_file: Path):
+    """One-shot import of a JSON state file into an empty namespace."""
+    if not legacy_file.exists():
+        return
+    try:
+        with open(legacy_file) as f:
+            legacy = json.load(f)
+    except Exception as e:
+        logger.error(f"State: cannot migrate {legacy_file.name}: {e}")
+        return
+
+    with _transaction(conn):
+        if conn.execute("SELECT 1 FROM kv WHERE namespace = ? LIMIT 1", (namespace,)).fetchone():
+            return   # another process migrated it first
+        now = _now()
+        conn.executemany(_UPSERT, [(namespace, k, _encode(v), now) for k, v in legacy.items()])
+    try:
+        legacy_file.rename(legacy_file.with_suffix(legacy_file.suffix + ".migrated"))
+    except FileNotFoundError:
+        pass
+    logger.info(f"State: migrated {len(legacy)} key(s) from {legacy_file.name} into '{namespace}'")
+
+
+# ─────────────────────────────────────────────
+#  PUBLIC API
+# ─────────────────────────────────────────────
+
+def _rows(namespace: str, legacy_file: Path = None) -> list:
+    with _db() as conn:
+        if legacy_file is not None:
+            _import_legacy(conn, namespace, legacy_file)
+        return conn.execute("SELECT key, value FROM kv WHERE namespace = ?", (namespace,)).fetchall()
+
+
+def load(namespace: str, defaults: dict = None, legacy_file: Path = None) -> dict:
+    """
+    Return every key of a namespace as a dict (defaults fill missing keys).
+    Records a snapshot so the next save() writes only what changed.
+    """
+    rows  = _rows(namespace, legacy_file)
+    state = copy.deepcopy(defaults or {})
+    # Defaults count as unchanged — an untouched default must not overwrite
+    # a value another process stores after this load
+    snapshot = _snapshots()[namespace] = {key: _encode(value) for key, value in state.items()}
+    snapshot.update(rows)
+    state.update({key: json.loads(value) for key, value in rows})
+    return state
+
+
+def read(namespace: str, defaults: dict = None, legacy_file: Path = None) -> dict:
+    """Like load(), for read-only consumers (public.json export) — leaves the snapshot alone."""
+    state = copy.deepcopy(defaults or {})
+    state.update({key: json.loads(value) for key, value in _rows(namespace, legacy_file)})
+    return state
+
+
+def save(namespace: str, state: dict) -> int:
+    """
+    Write the keys of `state` whose value differs from the last load()/save()
+    in this thread, and delete keys that were dropped, in one transaction.
+    Keys changed meanwhile by another process or thread are left alone unless
+    this one changed them too. Returns the number of keys written or deleted.
+    """
+    snapshot = _snapshots().setdefault(namespace, {})
+    encoded  = {key: _encode(value) for key, value in state.items()}
+    changed  = {key: value for key, value in encoded.items() if snapshot.get(key) != value}
+    removed  = [key for key in snapshot if key not in encoded]
+    if not changed and not removed:
+        return 0
+
+    now = _now()
+    with _db() as conn, _transaction(conn):
+        conn.executemany(_UPSERT, [(namespace, key, value, now) for key, value in changed.items()])
+        conn.executemany("DELETE FROM kv WHERE namespace = ? AND key = ?", [(namespace, key) for key in removed])
+
+    snapshot.update(changed)
+    for key in removed:
+        snapshot.pop(key, None)
+    logger.debug(f"State: '{namespace}' saved {len(changed)} changed / {len(removed)} removed key(s)")
+    return len(changed) + len(removed)
+
+
+@contextmanager
+def connection():
+    """Read connection to state.db, for modules that keep their own tables in it (ledger)."""
+    with _db() as conn:
+        yield conn
+
+
+@contextmanager
+def transaction():
+    """Write transaction on state.db (BEGIN IMMEDIATE), for modules with their own tables."""
+    with _db() as conn, _transaction(conn):
+        yield conn
+
+
+def get(namespace: str, key: str, default=None):
+    """Read a single key."""
+    with _db() as conn:
+        row = conn.execute("SELECT value FROM kv WHERE namespace = ? AND key = ?", (namespace, key)).fetchone()
+    return json.loads(row[0]) if row else default
+
+
+def update(namespace: str, key: str, fn, default=None):
+    """
+    Atomically apply fn(current) to a single key and return the new value —
+    for counters that several processes bump (e.g. tweets_posted). Assign the
+    result back into the loaded dict: the snapshot already holds it, so the
+    next save() does not write the key again.
+    """
+    with _db() as conn, _transaction(conn):
+        row = conn.execute("SELECT value FROM kv WHERE namespace = ? AND key = ?", (namespace, key)).fetchone()
+        value = fn(json.loads(row[0]) if row else default)
+        conn.execute(_UPSERT, (namespace, key, _encode(value), _now()))
+    if namespace in _snapshots():
+        _snapshots()[namespace][key] = _encode(value)
+    return value
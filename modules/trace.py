@@ -0,0 +1,194 @@
+"""
+0xeeTerm — Trace Module
+
+Lightweight per-cycle tracing. Every external call (Solana RPC method,
+CoinGecko, X endpoint, Anthropic request) runs inside a timed span with
+attributes (endpoint, method, status, bytes, retries, tokens). Spans nest
+under the root span of the cycle that triggered them (heartbeat, mentions,
+shill, ...), so a slow cycle can be broken down after the fact.
+
+Storage : logs/trace.jsonl — one JSON record per span, written once per
+          cycle when its root span closes; rotated at TRACE_MAX_BYTES
+          (trace.jsonl.1 … .TRACE_BACKUPS)
+Record  : { trace, span, parent, cycle, name, start, ms, error, attrs }
+Metrics : every finished trace also goes to modules.metrics.observe_trace()
+Disable : TRACE_ENABLED=false (stops the file only — metrics keep flowing)
+
+The current span lives in a ContextVar, so it follows asyncio tasks and
+asyncio.to_thread; plain thread pools need trace.bind(fn).
+Summaries: summary() / `0xeeTerm trace`.
+"""
+
+import os
+import json
+import time
+import fcntl
+import uuid
+import logging
+import functools
+import contextvars
+from pathlib import Path
+from contextlib import contextmanager
+from collections import Counter, defaultdict
+
+from modules import metrics
+
+logger = logging.getLogger("0xeeTerm.trace")
+
+TRACE_DIR       = Path(__file__).parent.parent / "logs"
+TRACE_FILE      = TRACE_DIR / "trace.jsonl"
+LOCK_FILE       = TRACE_DIR / "trace.lock"
+TRACE_ENABLED   = os.getenv("TRACE_ENABLED", "true").lower() not in ("0", "false", "no")
+TRACE_MAX_BYTES = int(os.getenv("TRACE_MAX_BYTES", str(5 * 1024 * 1024)))
+TRACE_BACKUPS   = int(os.getenv("TRACE_BACKUPS", "3"))
+
+_current: contextvars.ContextVar = contextvars.ContextVar("trace_span", default=None)
+
+
+class _Span:
+    __slots__ = ("trace", "id", "cycle", "records")
+
+    def __init__(self, trace: str, cycle: str, records: list):
+        self.trace   = trace
+        self.id      = uuid.uuid4().hex[:16]
+        self.cycle   = cycle
+        self.records = records   # shared by every span of the trace, flushed by the root
+
+
+# ─────────────────────────────────────────────
+#  STORAGE
+# ─────────────────────────────────────────────
+
+def _rotate():
+    for n in range(TRACE_BACKUPS, 0, -1):
+        src = TRACE_FILE.with_name(f"{TRACE_FILE.name}.{n - 1}") if n > 1 else TRACE_FILE
+        if src.exists():
+            src.replace(TRACE_FILE.with_name(f"{TRACE_FILE.name}.{n}"))
+
+
+def _write(records: list):
+    lines = "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records)
+    try:
+        TRACE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(LOCK_FILE, "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                if TRACE_FILE.exists() and TRACE_FILE.stat().st_size + len(lines) > TRACE_MAX_BYTES:
+                    _rotate()
+                with open(TRACE_FILE, "a") as f:
+                    f.write(lines)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+    except OSError as e:
+        logger.warning(f"Trace: could not write {len(records)} span(s): {e}")
+
+
+# ─────────────────────────────────────────────
+#  PUBLIC API
+# ─────────────────────────────────────────────
+
+@contextmanager
+def span(name: str, **attrs):
+    """
+    Time a block as a child of the current span — or as the root of a new
+    trace when there is none. Yields the attrs dict; add to it inside the
+    block (status, bytes, ...). An exception is recorded and re-raised.
+    """
+    parent = _current.get()
+    if parent is None:
+        current = _Span(uuid.uuid4().hex[:16], name, [])
+    else:
+        current = _Span(parent.trace, parent.cycle, parent.records)
+    token   = _current.set(current)
+    start   = time.time()
+    started = time.perf_counter()
+    error   = None
+    try:
+        yield attrs
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"[:200]
+        raise
+    finally:
+        _current.reset(token)
+        current.records.append({
+            "trace":  current.trace,
+            "span":   current.id,
+            "parent": parent.id if parent else None,
+            "cycle":  current.cycle,
+            "name":   name,
+            "start":  round(start, 3),
+            "ms":     round((time.perf_counter() - started) * 1000, 2),
+            "error":  error,
+            "attrs":  attrs,
+        })
+        if parent is None:
+            if TRACE_ENABLED:
+                _write(current.records)
+            metrics.observe_trace(current.records)
+
+
+def cycle(name: str):
+    """Decorator — run the function as the root span of a cycle trace."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name, kind="cycle"):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def bind(fn):
+    """Carry the current span into a thread pool: pool.submit(trace.bind(fn), ...)."""
+    ctx = contextvars.copy_context()
+    return functools.partial(ctx.run, fn)
+
+
+# ─────────────────────────────────────────────
+#  SUMMARY
+# ─────────────────────────────────────────────
+
+def _read(limit_files: int = 2) -> list:
+    files = [TRACE_FILE.with_name(f"{TRACE_FILE.name}.{n}") for n in range(limit_files - 1, 0, -1)] + [TRACE_FILE]
+    records = []
+    for path in files:
+        if not path.exists():
+            continue
+        with open(path) as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    return records
+
+
+def summary(cycles: int = 10, slowest: int = 10, cycle_name: str = None) -> dict:
+    """
+    Last `cycles` cycle traces (optionally one cycle type): per cycle its
+    duration and external-call counts, plus the slowest non-root spans.
+    """
+    traces = defaultdict(list)
+    for record in _read():
+        traces[record["trace"]].append(record)
+
+    roots = [
+        (root, spans) for spans in traces.values()
+        for root in spans if root["parent"] is None and (root["attrs"] or {}).get("kind") == "cycle"
+        and (cycle_name is None or root["name"] == cycle_name)
+    ]
+    roots.sort(key=lambda item: item[0]["start"])
+    roots = roots[-cycles:]
+
+    out_cycles, children = [], []
+    for root, spans in roots:
+        calls = Counter(s["name"] for s in spans if s["span"] != root["span"])
+        errors = sum(1 for s in spans if s["error"] or (s["attrs"] or {}).get("status", 200) >= 400)
+        out_cycles.append({
+            "cycle": root["name"], "start": root["start"], "ms": root["ms"], "error": root["error"],
+            "calls": dict(calls.most_common()), "errors": errors,
+        })
+        children.extend(s for s in spans if s["span"] != root["span"])
+
+    children.sort(key=lambda s: s["ms"], reverse=True)
+    return {"cycles": out_cycles, "slowest": children[:slowest]}
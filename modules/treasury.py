@@ -3,17 +3,37 @@
 
 Read-only portfolio snapshot + DevFund sweep.
 No autonomous swaps or staking — the AI operates with minimal hot-wallet balance.
-Profits are swept to DEVFUND_ADDRESS after each service payment.
+Profits are swept to DEVFUND_ADDRESS in batches, by policy:
+
+  income   : ledger-recorded income since the last check ≥ SWEEP_MIN_SOL
+             → check the balance, sweep if the surplus is ≥ SWEEP_MIN_SOL
+  interval : SWEEP_MAX_INTERVAL_HOURS since the last check
+             → check the balance, sweep any surplus above dust
+  otherwise: no RPC call at all — sweep_to_devfund() is cheap to call every cycle
+  manual   : `0xeeTerm sweep` — check and sweep any surplus above dust now
+
+A failed sweep is retried with backoff (dlq.backoff_seconds: DLQ_BACKOFF_SECONDS
+doubled per failure, capped at 12h), not on every sweep cycle.
 
 DEVFUND_ADDRESS: set in .env — cold wallet controlled by the human operator.
 SWEEP_KEEP_SOL:  minimum SOL to keep in hot wallet for gas (default 0.01).
+SWEEP_DRY_RUN:   log and record the sweep without sending it (default: DRY_RUN).
+
+Storage : logs/state.db — namespace "sweep" (policy checkpoint: ledger
+          income and time of the last balance check, failure backoff),
+          table sweeps (one row per sweep: trigger, amount, fee, signature, status)
 """
 
 import os
 import base64
 import logging
-import requests
-from datetime import datetime, timezone
+from modules import dlq
+from modules import net
+from modules import series
+from modules import ledger
+from modules import metrics
+from modules import state as state_store
+from datetime import datetime, timezone, timedelta
 
 logger = logging.getLogger("0xeeTerm.treasury")
 
@@ -22,19 +42,26 @@ JITOSOL_MINT     = "J1toso1uCk3RLmjorhTtrVwY9HJ7X8V9yYac6Y7kGCPn"
 USDC_MINT        = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
 MEMO_PROGRAM     = "MemoSq4gqABAXKb96qnH8TysNcWxMyWCqXgDLGmfcHr"
 
+SWEEP_KEEP_SOL           = float(os.getenv("SWEEP_KEEP_SOL", "0.01"))
+SWEEP_MIN_SOL            = float(os.getenv("SWEEP_MIN_SOL", "0.05"))
+SWEEP_MAX_INTERVAL_HOURS = float(os.getenv("SWEEP_MAX_INTERVAL_HOURS", "24"))
+SWEEP_DRY_RUN            = os.getenv("SWEEP_DRY_RUN", os.getenv("DRY_RUN", "false")).lower() in ("1", "true", "yes")
+SWEEP_DUST_SOL           = 0.001   # never sweep less — the fee would eat it
+BASE_FEE_LAMPORTS        = 5000    # one signature, no priority fee — fallback fee estimate
+
 
 def _get_rpc() -> str:
     """Helius if HELIUS_API_KEY is set, else SOLANA_RPC env, else public fallback."""
     key = os.getenv("HELIUS_API_KEY")
     if key:
         return f"https://mainnet.helius-rpc.com/?api-key={key}"
-    return os.getenv("SOLANA_RPC", "https://api.mainnet-beta.solana.com")
+    return os.getenv("SOLANA_RPC", os.getenv("SOLANA_PUBLIC_RPC", "https://api.mainnet-beta.solana.com"))
 
 
 def _get_token_balance(wallet: str, mint: str, rpc: str) -> float:
     """Fetch SPL token balance for a given mint address."""
     try:
-        r = requests.post(rpc, json={
+        r = net.post(rpc, json={
             "jsonrpc": "2.0", "id": 1,
             "method":  "getTokenAccountsByOwner",
             "params":  [wallet, {"mint": mint}, {"encoding": "jsonParsed"}],
@@ -55,8 +82,8 @@ def _get_token_balance(wallet: str, mint: str, rpc: str) -> float:
 def _get_prices() -> dict:
     """Fetch SOL price from CoinGecko."""
     try:
-        r = requests.get(
-            "https://api.coingecko.com/api/v3/simple/price",
+        r = net.get(
+            f"{os.getenv('COINGECKO_API_URL', 'https://api.coingecko.com/api/v3')}/simple/price",
             params={"ids": "solana,jito-staked-sol", "vs_currencies": "usd"},
             timeout=10,
         )
@@ -100,26 +127,185 @@ def get_portfolio() -> dict:
     logger.info(
         f"Treasury: {sol_balance:.4f} SOL + {usdc_balance:.2f} USDC = ${total_usd:.2f}"
     )
+    series.record({"net_worth_usd": total_usd, "sol_price": prices["sol"]})
     return portfolio
 
 
-def sweep_to_devfund(memo: str = "0xeeAI: profit sweep") -> str | None:
+# ─────────────────────────────────────────────
+#  SWEEP POLICY
+# ─────────────────────────────────────────────
+
+SWEEP_NAMESPACE = "sweep"
+
+_SWEEP_DEFAULTS = {
+    "income_lamports": 0,      # ledger income total at the last balance check
+    "checked_at":      None,   # ISO time of the last balance check
+    "failures":        0,      # consecutive failed sweeps
+    "retry_at":        None,   # ISO time before which a failed sweep is not retried
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sweeps (
+    id               INTEGER PRIMARY KEY AUTOINCREMENT,
+    at               TEXT NOT NULL,
+    trigger          TEXT NOT NULL,
+    income_lamports  INTEGER NOT NULL,
+    balance_lamports INTEGER NOT NULL,
+    lamports         INTEGER NOT NULL,
+    fee_lamports     INTEGER,
+    sig              TEXT,
+    status           TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sweeps_at ON sweeps(at);
+"""
+
+_initialized = False
+
+
+def _ensure_schema():
+    global _initialized
+    if not _initialized:
+        with state_store.connection() as conn:
+            conn.executescript(_SCHEMA)
+        _initialized = True
+
+
+def _sweep_trigger(state: dict, income_lamports: int, now: datetime) -> str | None:
+    """Why a balance check is due now ("income" / "interval"), or None."""
+    if income_lamports >= SWEEP_MIN_SOL * LAMPORTS_PER_SOL:
+        return "income"
+    checked_at = state.get("checked_at")
+    if not checked_at or now - datetime.fromisoformat(checked_at) >= timedelta(hours=SWEEP_MAX_INTERVAL_HOURS):
+        return "interval"
+    return None
+
+
+def _record_sweep(
+    trigger: str,
+    income_lamports: int,
+    balance_lamports: int,
+    lamports: int,
+    fee_lamports: int | None,
+    sig: str | None,
+    status: str,
+):
+    """Append one sweep (sent / dry_run / failed) to the sweeps table."""
+    try:
+        _ensure_schema()
+        with state_store.transaction() as conn:
+            conn.execute(
+                "INSERT INTO sweeps (at, trigger, income_lamports, balance_lamports, lamports, fee_lamports, sig, status) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (datetime.now(timezone.utc).isoformat(), trigger, income_lamports, balance_lamports,
+                 lamports, fee_lamports, sig, status),
+            )
+    except Exception as e:
+        logger.error(f"Treasury: failed to record sweep ({status}, {lamports / LAMPORTS_PER_SOL:.4f} SOL): {e}")
+    metrics.inc("oxeeterm_sweeps_total", trigger=trigger, status=status)
+    if status == "sent":
+        metrics.inc("oxeeterm_swept_sol_total", lamports / LAMPORTS_PER_SOL)
+        metrics.inc("oxeeterm_sweep_fees_sol_total", (fee_lamports or 0) / LAMPORTS_PER_SOL)
+
+
+def sweep_summary() -> dict:
+    """
+    Sent sweeps so far: count, SOL swept, fees paid and fees per SOL earned
+    (ledger income), plus the last sweep row of any status.
     """
-    Transfer surplus SOL to DEVFUND_ADDRESS.
+    _ensure_schema()
+    with state_store.connection() as conn:
+        count, lamports, fees = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(lamports), 0), COALESCE(SUM(fee_lamports), 0) "
+            "FROM sweeps WHERE status = 'sent'"
+        ).fetchone()
+        last = conn.execute(
+            "SELECT at, trigger, lamports, fee_lamports, sig, status FROM sweeps ORDER BY id DESC LIMIT 1"
+        ).fetchone()
+    earned = ledger.rollup("total", "all")["lamports"]
+    return {
+        "count":              count,
+        "sol":                round(lamports / LAMPORTS_PER_SOL, 6),
+        "fees_sol":           round(fees / LAMPORTS_PER_SOL, 6),
+        "fee_per_sol_earned": round(fees / earned, 8) if earned else None,
+        "last":               dict(zip(("at", "trigger", "lamports", "fee_lamports", "sig", "status"), last)) if last else None,
+    }
+
+
+def _checkpoint(state: dict, earned_lamports: int, now: datetime):
+    """Balance checked and settled — the next income trigger needs SWEEP_MIN_SOL of new income.
+    Not called after a failed send, so that one is retried next cycle."""
+    state["income_lamports"], state["checked_at"] = earned_lamports, now.isoformat()
+    state["failures"], state["retry_at"] = 0, None
+    try:
+        state_store.save(SWEEP_NAMESPACE, state)
+    except Exception as e:
+        logger.error(f"Treasury: failed to save sweep checkpoint: {e}")
+
+
+def _backoff(state: dict, now: datetime):
+    """Sweep failed — hold off the next attempt (the policy trigger stays armed)."""
+    state["failures"] = state.get("failures", 0) + 1
+    retry_at = now + timedelta(seconds=dlq.backoff_seconds(state["failures"]))
+    state["retry_at"] = retry_at.isoformat()
+    logger.warning(f"Treasury: sweep failure #{state['failures']} — next attempt after {state['retry_at'][:16]}")
+    try:
+        state_store.save(SWEEP_NAMESPACE, state)
+    except Exception as e:
+        logger.error(f"Treasury: failed to save sweep backoff: {e}")
+
+
+def _get_fee(rpc: str, message) -> int:
+    """Network fee for a compiled message (getFeeForMessage), BASE_FEE_LAMPORTS if unavailable."""
+    try:
+        r = net.post(rpc, json={
+            "jsonrpc": "2.0", "id": 1,
+            "method":  "getFeeForMessage",
+            "params":  [base64.b64encode(bytes(message)).decode(), {"commitment": "processed"}],
+        }, timeout=10)
+        fee = r.json()["result"]["value"]
+        if fee is not None:
+            return int(fee)
+    except Exception as e:
+        logger.warning(f"Treasury: fee lookup failed, assuming {BASE_FEE_LAMPORTS} lamports: {e}")
+    return BASE_FEE_LAMPORTS
+
+
+def sweep_to_devfund(memo: str = "0xeeAI: profit sweep", force: bool = False) -> str | None:
+    """
+    Transfer surplus SOL to DEVFUND_ADDRESS when the sweep policy says so
+    (see module docstring) — or now, with force (`0xeeTerm sweep`, which
+    also ignores the failure backoff).
     Keeps SWEEP_KEEP_SOL in hot wallet for gas (default 0.01 SOL).
-    Called automatically by shill service after each successful payment.
-    Returns tx signature or None if nothing to sweep / devfund not configured.
+    Called after every shill cycle (daemon: its own loop); costs no RPC call
+    until a sweep is due. Amount, fee and signature are recorded per sweep.
+    Returns tx signature or None if nothing to sweep / not due / dry run /
+    devfund not configured.
     """
     devfund = os.getenv("DEVFUND_ADDRESS", "")
     if not devfund:
         logger.info("Treasury: DEVFUND_ADDRESS not set — skipping sweep.")
         return None
 
-    keep_sol  = float(os.getenv("SWEEP_KEEP_SOL", "0.01"))
+    now    = datetime.now(timezone.utc)
+    state  = state_store.load(SWEEP_NAMESPACE, _SWEEP_DEFAULTS)
+    earned = ledger.rollup("total", "all")["lamports"]
+    income = max(earned - state["income_lamports"], 0)
+    trigger = "manual" if force else _sweep_trigger(state, income, now)
+    if trigger and not force and state.get("retry_at") and now < datetime.fromisoformat(state["retry_at"]):
+        logger.info(f"Treasury: sweep due ({trigger}) but backing off until {state['retry_at'][:16]}")
+        return None
+    if not trigger:
+        logger.info(
+            f"Treasury: sweep not due — {income / LAMPORTS_PER_SOL:.4f} SOL new income "
+            f"(min {SWEEP_MIN_SOL}), last check {state['checked_at'][:16]}"
+        )
+        return None
+
+    keep_sol  = SWEEP_KEEP_SOL
     rpc       = _get_rpc()
 
     try:
-        r = requests.post(rpc, json={
+        r = net.post(rpc, json={
             "jsonrpc": "2.0", "id": 1,
             "method": "getBalance",
             "params": [os.getenv("SOLANA_WALLET", "")],
@@ -128,11 +314,24 @@ def sweep_to_devfund(memo: str = "0xeeAI: profit sweep") -> str | None:
         balance_sol = balance_lamports / LAMPORTS_PER_SOL
     except Exception as e:
         logger.error(f"Treasury: sweep balance check failed: {e}")
+        _backoff(state, now)
         return None
 
     sweep_sol = balance_sol - keep_sol
-    if sweep_sol <= 0.001:
-        logger.info(f"Treasury: nothing to sweep (balance={balance_sol:.4f}, keep={keep_sol:.4f})")
+    minimum   = SWEEP_MIN_SOL if trigger == "income" else SWEEP_DUST_SOL
+    if sweep_sol < minimum:
+        logger.info(
+            f"Treasury: nothing to sweep ({trigger}: balance={balance_sol:.4f}, "
+            f"keep={keep_sol:.4f}, min={minimum})"
+        )
+        _checkpoint(state, earned, now)
+        return None
+
+    lamports = int(sweep_sol * LAMPORTS_PER_SOL)
+    if SWEEP_DRY_RUN:
+        logger.info(f"Treasury: [dry run] would sweep {sweep_sol:.4f} SOL → DevFund ({trigger})")
+        _record_sweep(trigger, income, balance_lamports, lamports, BASE_FEE_LAMPORTS, None, "dry_run")
+        _checkpoint(state, earned, now)
         return None
 
     try:
@@ -147,13 +346,13 @@ def sweep_to_devfund(memo: str = "0xeeAI: profit sweep") -> str | None:
         pk = os.getenv("SOLANA_PRIVATE_KEY")
         if not pk:
             logger.error("Treasury: SOLANA_PRIVATE_KEY not set — cannot sweep.")
+            _backoff(state, now)
             return None
 
         keypair   = Keypair.from_base58_string(pk)
         recipient = Pubkey.from_string(devfund)
-        lamports  = int(sweep_sol * LAMPORTS_PER_SOL)
 
-        bh_resp  = requests.post(rpc, json={
+        bh_resp  = net.post(rpc, json={
             "jsonrpc": "2.0", "id": 1,
             "method": "getLatestBlockhash", "params": [],
         }, timeout=10)
@@ -172,21 +371,31 @@ def sweep_to_devfund(memo: str = "0xeeAI: profit sweep") -> str | None:
 
         bh  = Hash.from_string(blockhash)
         msg = Message.new_with_blockhash([transfer_ix, memo_ix], keypair.pubkey(), bh)
+        fee = _get_fee(rpc, msg)
         tx  = Transaction.new_unsigned(msg)
         tx.sign([keypair], bh)
 
-        resp = requests.post(rpc, json={
+        resp = net.post(rpc, json={
             "jsonrpc": "2.0", "id": 1,
             "method":  "sendTransaction",
             "params":  [base64.b64encode(bytes(tx)).decode(), {"encoding": "base64"}],
         }, timeout=30)
         sig = resp.json().get("result")
         if sig:
-            logger.info(f"Treasury: swept {sweep_sol:.4f} SOL → DevFund — sig: {sig}")
+            logger.info(
+                f"Treasury: swept {sweep_sol:.4f} SOL → DevFund ({trigger}, fee "
+                f"{fee / LAMPORTS_PER_SOL:.6f} SOL) — sig: {sig}"
+            )
+            _record_sweep(trigger, income, balance_lamports, lamports, fee, sig, "sent")
+            _checkpoint(state, earned, now)
         else:
             logger.error(f"Treasury: sweep tx failed: {resp.json().get('error')}")
+            _record_sweep(trigger, income, balance_lamports, lamports, None, None, "failed")
+            _backoff(state, now)
         return sig
 
     except Exception as e:
         logger.error(f"Treasury: sweep failed: {e}")
+        _record_sweep(trigger, income, balance_lamports, lamports, None, None, "failed")
+        _backoff(state, now)
         return None
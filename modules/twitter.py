@@ -4,30 +4,150 @@ Handles all interactions with the X API v2
 """
 
 import os
+import json
+import hashlib
 import tweepy
 import logging
+import requests
+from pathlib import Path
+from modules import ratelimit, trace, metrics
 
 logger = logging.getLogger("0xeeTerm.twitter")
 
+# Our own account identity — cached after the first get_me() so the
+# rate-limited /2/users/me endpoint is hit once, not every cycle.
+ACCOUNT_FILE = Path(__file__).parent.parent / "logs" / "x_account.json"
+
+# Process-wide clients — each tweepy.Client holds a requests.Session,
+# so reusing them keeps the HTTPS connection pool warm between calls.
+_user_client: tweepy.Client | None = None
+_read_client: tweepy.Client | None = None
+_account: dict | None = None
+
+# tweepy hard-codes the API host; X_API_BASE points both clients (sync and
+# async) somewhere else — a proxy, or the bench/ fake servers.
+X_API_HOST = "https://api.twitter.com"
+X_API_BASE = os.getenv("X_API_BASE", "").rstrip("/")
+
+
+def rebase_url(url: str) -> str:
+    """Swap the X API host for X_API_BASE, if set."""
+    if X_API_BASE and url.startswith(X_API_HOST):
+        return X_API_BASE + url[len(X_API_HOST):]
+    return url
+
+
+class _RebasedSession(requests.Session):
+    def request(self, method, url, *args, **kwargs):
+        return super().request(method, rebase_url(url), *args, **kwargs)
+
+
+class TrackedClient(tweepy.Client):
+    """tweepy.Client that records x-rate-limit-* headers in the shared budget store.
+    Never sleeps on a 429 — TooManyRequests is raised and callers defer instead."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if X_API_BASE:
+            self.session = _RebasedSession()
+
+    def request(self, method, route, params=None, json=None, user_auth=False):
+        endpoint = ratelimit.endpoint_key(method, route)
+        with trace.span(f"x.{endpoint}", endpoint=route, method=method) as attrs:
+            try:
+                response = super().request(method, route, params=params, json=json, user_auth=user_auth)
+            except tweepy.HTTPException as e:
+                attrs["status"] = e.response.status_code
+                ratelimit.record(endpoint, e.response.headers)
+                raise
+            attrs["status"] = response.status_code
+            attrs["bytes"]  = len(response.content)
+            ratelimit.record(endpoint, response.headers)
+            return response
+
 
 def get_client() -> tweepy.Client:
-    """Initialize and return an authenticated Tweepy client."""
-    client = tweepy.Client(
-        consumer_key=os.getenv("X_API_KEY"),
-        consumer_secret=os.getenv("X_API_SECRET"),
-        access_token=os.getenv("X_ACCESS_TOKEN"),
-        access_token_secret=os.getenv("X_ACCESS_SECRET"),
-        wait_on_rate_limit=True,
-    )
-    return client
-
-
-def post_tweet(text: str) -> dict | None:
-    """Post a tweet and return the response."""
+    """Return the process-wide authenticated (OAuth 1.0a user context) client."""
+    global _user_client
+    if _user_client is None:
+        _user_client = TrackedClient(
+            consumer_key=os.getenv("X_API_KEY"),
+            consumer_secret=os.getenv("X_API_SECRET"),
+            access_token=os.getenv("X_ACCESS_TOKEN"),
+            access_token_secret=os.getenv("X_ACCESS_SECRET"),
+        )
+    return _user_client
+
+
+def get_read_client() -> tweepy.Client:
+    """Return the process-wide Bearer Token (app context) client used for public reads."""
+    global _read_client
+    if _read_client is None:
+        _read_client = TrackedClient(bearer_token=os.getenv("X_BEARER_TOKEN"))
+    return _read_client
+
+
+def _token_fingerprint() -> str:
+    """Short digest of the access token — invalidates the cached identity if the account changes."""
+    token = os.getenv("X_ACCESS_TOKEN", "")
+    return hashlib.sha256(token.encode()).hexdigest()[:12]
+
+
+def get_account() -> dict | None:
+    """
+    Return our own account as {"id": str, "username": str}.
+    Looked up once via get_me(), then cached in memory and in logs/x_account.json.
+    """
+    global _account
+    if _account is not None:
+        metrics.cache("account", True)
+        return _account
+
+    fingerprint = _token_fingerprint()
+    if ACCOUNT_FILE.exists():
+        try:
+            with open(ACCOUNT_FILE) as f:
+                cached = json.load(f)
+            if cached.get("token") == fingerprint and cached.get("id"):
+                _account = {"id": cached["id"], "username": cached.get("username", "")}
+                metrics.cache("account", True)
+                return _account
+        except Exception as e:
+            logger.warning(f"Could not read cached account identity: {e}")
+
+    metrics.cache("account", False)
+    try:
+        me = get_client().get_me(user_auth=True)
+    except tweepy.TweepyException as e:
+        logger.error(f"Failed to look up own account: {e}")
+        return None
+
+    _account = {"id": str(me.data.id), "username": me.data.username}
+    try:
+        ACCOUNT_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(ACCOUNT_FILE, "w") as f:
+            json.dump({**_account, "token": fingerprint}, f, indent=2)
+        logger.info(f"Account identity cached — @{_account['username']} ({_account['id']})")
+    except Exception as e:
+        logger.warning(f"Could not cache account identity: {e}")
+    return _account
+
+
+def _fit_text(text: str) -> str:
+    """Truncate to 280 chars on a word boundary."""
     if len(text) > 280:
         logger.warning(f"Tweet exceeds 280 chars ({len(text)}) — truncating")
         cutoff = text.rfind(" ", 0, 277)
         text = text[:cutoff if cutoff > 0 else 277] + "..."
+    return text
+
+
+def post_tweet(text: str, priority: str = "normal") -> dict | None:
+    """Post a tweet and return the response. priority="paid" may use the reserved X budget."""
+    text = _fit_text(text)
+    if not ratelimit.allow(ratelimit.TWEETS_POST, priority):
+        logger.warning(f"Tweet deferred — X post budget too low for {priority} priority")
+        return None
     try:
         client = get_client()
         response = client.create_tweet(text=text)
@@ -42,13 +162,14 @@ def post_tweet(text: str) -> dict | None:
 def get_mentions(since_id: str = None) -> list:
     """Fetch recent mentions of the account."""
     try:
+        account = get_account()
+        if not account:
+            return []
         client = get_client()
-        me = client.get_me()
-        user_id = me.data.id
         params = {"max_results": 10}
         if since_id:
             params["since_id"] = since_id
-        mentions = client.get_users_mentions(user_id, **params)
+        mentions = client.get_users_mentions(account["id"], **params)
         if mentions.data:
             logger.info(f"Fetched {len(mentions.data)} mentions")
             return mentions.data
@@ -61,9 +182,10 @@ def get_mentions(since_id: str = None) -> list:
 def get_latest_tweet_id() -> str | None:
     """Get the ID of our latest tweet (for since_id tracking)."""
     try:
-        client = get_client()
-        me = client.get_me()
-        tweets = client.get_users_tweets(me.data.id, max_results=5)
+        account = get_account()
+        if not account:
+            return None
+        tweets = get_client().get_users_tweets(account["id"], max_results=5)
         if tweets.data:
             return tweets.data[0].id
         return None
@@ -72,23 +194,50 @@ def get_latest_tweet_id() -> str | None:
         return None
 
 
+def get_recent_tweets(limit: int = 50) -> list | None:
+    """
+    Our latest tweets and replies as [{"id", "text", "reply_to"}], newest first
+    (reply_to = the replied-to tweet ID, None for a standalone tweet).
+    None if the lookup failed.
+    """
+    try:
+        account = get_account()
+        if not account:
+            return None
+        tweets = get_client().get_users_tweets(
+            account["id"], max_results=min(max(limit, 5), 100), tweet_fields=["referenced_tweets"],
+        )
+        return [
+            {
+                "id":       str(t.id),
+                "text":     t.text,
+                "reply_to": next((str(r.id) for r in t.referenced_tweets or [] if r.type == "replied_to"), None),
+            }
+            for t in tweets.data or []
+        ]
+    except tweepy.TweepyException as e:
+        logger.error(f"Failed to get recent tweets: {e}")
+        return None
+
+
 def get_tweet_text(tweet_id: str) -> str | None:
     """Fetch the text of a specific tweet by ID (uses Bearer Token for read access)."""
+    if not ratelimit.allow(ratelimit.TWEET_GET):
+        return None
     try:
-        client = tweepy.Client(bearer_token=os.getenv("X_BEARER_TOKEN"))
-        response = client.get_tweet(tweet_id, tweet_fields=["text"])
+        response = get_read_client().get_tweet(tweet_id, tweet_fields=["text"])
         return response.data.text if response.data else None
     except tweepy.TweepyException as e:
         logger.error(f"Failed to get tweet {tweet_id}: {e}")
         return None
 
 
-def post_reply(text: str, in_reply_to_tweet_id: str) -> dict | None:
-    """Post a reply to a specific tweet and return the response."""
-    if len(text) > 280:
-        logger.warning(f"Reply exceeds 280 chars ({len(text)}) — truncating")
-        cutoff = text.rfind(" ", 0, 277)
-        text = text[:cutoff if cutoff > 0 else 277] + "..."
+def post_reply(text: str, in_reply_to_tweet_id: str, priority: str = "normal") -> dict | None:
+    """Post a reply to a specific tweet and return the response. priority as in post_tweet()."""
+    text = _fit_text(text)
+    if not ratelimit.allow(ratelimit.TWEETS_POST, priority):
+        logger.warning(f"Reply deferred — X post budget too low for {priority} priority")
+        return None
     try:
         client = get_client()
         response = client.create_tweet(
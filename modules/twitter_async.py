@@ -0,0 +1,104 @@
+"""
+0xeeTerm — Async Twitter/X Module
+asyncio access layer beside modules/twitter.py, for batches of independent
+X calls (mention likes, queued replies) that can go out in parallel.
+
+One aiohttp session (connection pool) is shared per batch, and concurrency
+is bounded by X_ASYNC_CONCURRENCY (default 4). Ordering between calls is
+not guaranteed — callers that need it (e.g. roast confirmation after the
+roast) express it through outbox "after" dependencies.
+"""
+
+import os
+import asyncio
+import logging
+import aiohttp
+import tweepy
+from yarl import URL
+from contextlib import asynccontextmanager
+from tweepy.asynchronous import AsyncClient
+from modules import ratelimit, trace
+from modules.twitter import X_API_BASE, rebase_url
+
+logger = logging.getLogger("0xeeTerm.twitter_async")
+
+X_ASYNC_CONCURRENCY = int(os.getenv("X_ASYNC_CONCURRENCY", "4"))
+
+
+class _RebasedSession:
+    """aiohttp session wrapper applying modules.twitter.rebase_url (X_API_BASE)."""
+
+    def __init__(self, session: aiohttp.ClientSession):
+        self._session = session
+
+    def request(self, method, url, **kwargs):
+        # tweepy passes an already-encoded yarl.URL (it is what OAuth signed)
+        return self._session.request(method, URL(rebase_url(str(url)), encoded=True), **kwargs)
+
+
+class TrackedAsyncClient(AsyncClient):
+    """AsyncClient that records x-rate-limit-* headers in the shared budget store,
+    mirroring modules.twitter.TrackedClient."""
+
+    async def request(self, method, route, params=None, json=None, user_auth=False):
+        endpoint = ratelimit.endpoint_key(method, route)
+        with trace.span(f"x.{endpoint}", endpoint=route, method=method, transport="async") as attrs:
+            try:
+                response = await super().request(method, route, params=params, json=json, user_auth=user_auth)
+            except tweepy.HTTPException as e:
+                attrs["status"] = e.response.status
+                ratelimit.record(endpoint, e.response.headers)
+                raise
+            attrs["status"] = response.status
+            attrs["bytes"]  = response.content_length
+            ratelimit.record(endpoint, response.headers)
+            return response
+
+
+@asynccontextmanager
+async def open_client():
+    """User-context async client bound to one aiohttp session for the whole batch."""
+    async with aiohttp.ClientSession() as http:
+        client = TrackedAsyncClient(
+            consumer_key=os.getenv("X_API_KEY"),
+            consumer_secret=os.getenv("X_API_SECRET"),
+            access_token=os.getenv("X_ACCESS_TOKEN"),
+            access_token_secret=os.getenv("X_ACCESS_SECRET"),
+        )
+        client.session = _RebasedSession(http) if X_API_BASE else http
+        yield client
+
+
+async def gather_bounded(coros: list, limit: int = X_ASYNC_CONCURRENCY) -> list:
+    """Run coroutines with at most `limit` in flight. Exceptions are returned, not raised."""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def _run(coro):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(_run(c) for c in coros), return_exceptions=True)
+
+
+async def like(client: AsyncClient, tweet_id: str) -> bool:
+    """Like a tweet. Low priority — skipped when the likes window is tight."""
+    if not ratelimit.allow(ratelimit.LIKES, "low"):
+        return False
+    try:
+        await client.like(tweet_id, user_auth=True)
+        logger.info(f"Liked mention {tweet_id}")
+        return True
+    except tweepy.TweepyException as e:
+        logger.warning(f"Could not like mention {tweet_id}: {e}")
+        return False
+
+
+async def create_tweet(client: AsyncClient, text: str, in_reply_to_tweet_id: str = None) -> dict:
+    """Post a tweet or reply. Returns {"id", "text"}; raises tweepy.TweepyException."""
+    response = await client.create_tweet(text=text, in_reply_to_tweet_id=in_reply_to_tweet_id)
+    return {"id": str(response.data["id"]), "text": text}
+
+
+def run(coro):
+    """Run a batch from synchronous code (timer commands, daemon worker threads)."""
+    return asyncio.run(coro)
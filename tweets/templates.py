@@ -140,13 +140,18 @@ def get_raydium_tweet() -> str:
 #  DAILY REPORT
 # ─────────────────────────────────────────────
 
-def get_daily_report_tweet(status: dict) -> str:
+def get_daily_report_tweet(status: dict, served: dict = None) -> str:
+    """served: ledger rollup for the previous UTC day ({"count", "sol", ...}), optional."""
     now = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+    services = ""
+    if served and served.get("count"):
+        services = f"🧾 Served yesterday: {served['count']} (+{served['sol']:.3f} SOL)\n"
     return (
         f"Daily report — {now}\n\n"
         f"💰 Treasury: ${status['balance_usd']:.2f} ({status['balance_sol']:.4f} SOL)\n"
         f"🎯 Rent goal: ${status['monthly_rent']:.0f}/mo\n"
-        f"📊 Funded: {status['survival_pct']:.0f}%\n\n"
+        f"📊 Funded: {status['survival_pct']:.0f}%\n"
+        f"{services}\n"
         f"Still here. $0xEE — ai.0xee.li"
     )
 
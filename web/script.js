@@ -1,16 +1,31 @@
 // URL du fichier public généré par le cerveau Python
-// Le cache-buster (?t=...) force ton navigateur et Lighttpd à cracher la dernière version
+// cache: 'no-cache' → le navigateur revalide avec If-None-Match (ETag) : 304 si rien n'a changé
 const PUBLIC_DATA_URL = 'public.json';
 const RENT_GOAL = 18.00;
 
+// Shards froids (historique des tweets, registre Genesis) listés dans data.manifest :
+// re-téléchargés uniquement quand leur version change
+const _shardCache = {};
+
+async function fetchShard(entry) {
+    const cached = _shardCache[entry.url];
+    if (cached && cached.version === entry.version) return cached.data;
+    const res = await fetch(entry.url, { cache: 'no-cache' });
+    if (!res.ok) throw new Error(`HTTP ${res.status}`);
+    const data = await res.json();
+    _shardCache[entry.url] = { version: entry.version, data };
+    return data;
+}
+
 async function syncWithMatrix() {
     const controller = new AbortController();
     const timeout = setTimeout(() => controller.abort(), 5000);
 
     try {
         console.log("[0xeeAI] Synchronisation avec le noyau backend...");
-        const response = await fetch(`${PUBLIC_DATA_URL}?t=${new Date().getTime()}`, {
-            signal: controller.signal
+        const response = await fetch(PUBLIC_DATA_URL, {
+            signal: controller.signal,
+            cache: 'no-cache'
         });
         clearTimeout(timeout);
 
@@ -109,13 +124,37 @@ async function syncWithMatrix() {
 
         }
 
+        // Historique de la trésorerie — shard series.json, re-téléchargé seulement si sa version change
+        const seriesShard = data.manifest && data.manifest.series;
+        if (document.getElementById('treasury-chart') && seriesShard) {
+            try {
+                _seriesData = await fetchShard(seriesShard);
+                renderTreasuryChart();
+            } catch (err) {
+                console.warn("[0xeeAI] Historique trésorerie indisponible :", err.message);
+            }
+        }
+
         // ==========================================
         // 2. MISE À JOUR DE LA TIMELINE (log.html)
         // ==========================================
         const liveFeed = document.getElementById('live-feed');
-        const thoughtsArray = data.history || data.recent_tweets;
+        const tweetsShard = data.manifest && data.manifest.tweets;
+        const feedVersion = tweetsShard ? tweetsShard.version : null;
+        let thoughtsArray = data.history || data.recent_tweets;
+        if (liveFeed && !thoughtsArray && tweetsShard) {
+            // Shard absent ou périmé → on garde la timeline déjà affichée, le reste du rendu continue
+            try {
+                thoughtsArray = (await fetchShard(tweetsShard)).recent_tweets;
+            } catch (err) {
+                console.warn("[0xeeAI] Timeline indisponible :", err.message);
+            }
+        }
 
-        if (liveFeed && thoughtsArray && thoughtsArray.length > 0) {
+        // Shard inchangé → timeline déjà à jour, pas de re-rendu
+        if (liveFeed && thoughtsArray && thoughtsArray.length > 0
+                && (!feedVersion || liveFeed.dataset.version !== feedVersion)) {
+            if (feedVersion) liveFeed.dataset.version = feedVersion;
             liveFeed.innerHTML = '';
 
             const recentThoughts = [...thoughtsArray].reverse();
@@ -172,6 +211,44 @@ async function syncWithMatrix() {
     }
 }
 
+// Courbe net worth (USD) — résolution choisie : 5min (24h), hour (7j), day (1 an)
+let _seriesData = null;
+let _chartRes = '5min';
+
+function renderTreasuryChart() {
+    const svg = document.getElementById('treasury-chart');
+    const caption = document.getElementById('treasury-chart-caption');
+    if (!svg || !_seriesData || !_seriesData.series) return;
+
+    const points = ((_seriesData.series.net_worth_usd || {})[_chartRes] || [])
+        .filter(p => Array.isArray(p) && Number.isFinite(p[0]) && Number.isFinite(p[1]));
+    while (svg.firstChild) svg.removeChild(svg.firstChild);
+    if (points.length < 2) {
+        if (caption) caption.textContent = 'Not enough samples yet.';
+        return;
+    }
+
+    const W = 600, H = 160, PAD = 10;
+    const t0 = points[0][0], t1 = points[points.length - 1][0];
+    const values = points.map(p => p[1]);
+    const lo = Math.min(...values), hi = Math.max(...values);
+    const x = t => PAD + (t - t0) / (t1 - t0) * (W - 2 * PAD);
+    const y = v => hi === lo ? H / 2 : H - PAD - (v - lo) / (hi - lo) * (H - 2 * PAD);
+
+    const line = document.createElementNS('http://www.w3.org/2000/svg', 'polyline');
+    line.setAttribute('points', points.map(p => `${x(p[0]).toFixed(1)},${y(p[1]).toFixed(1)}`).join(' '));
+    line.setAttribute('fill', 'none');
+    line.setAttribute('stroke', '#14F195');
+    line.setAttribute('stroke-width', '2');
+    line.setAttribute('vector-effect', 'non-scaling-stroke');
+    svg.appendChild(line);
+
+    if (caption) {
+        const last = values[values.length - 1];
+        caption.textContent = `Net worth $${last.toFixed(2)} · low $${lo.toFixed(2)} · high $${hi.toFixed(2)}`;
+    }
+}
+
 // Live memo preview — shows exactly what will be written on-chain
 function _updateMemoPreview() {
     const preview = document.getElementById('memo-preview');
@@ -192,6 +269,15 @@ document.addEventListener('DOMContentLoaded', () => {
     syncWithMatrix();
     setInterval(syncWithMatrix, 60000);
 
+    document.querySelectorAll('#chart-ranges .chart-range').forEach(btn => {
+        btn.addEventListener('click', () => {
+            document.querySelectorAll('#chart-ranges .chart-range').forEach(b => b.classList.remove('active'));
+            btn.classList.add('active');
+            _chartRes = btn.dataset.res;
+            renderTreasuryChart();
+        });
+    });
+
     const payBtn = document.getElementById('pay-service-btn');
     if (payBtn) payBtn.addEventListener('click', payService);
 